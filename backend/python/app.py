@@ -8,14 +8,25 @@
 
 import sys
 import os
+import json
+import time
+import queue
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from datetime import datetime
 from codeculate.codeculate_db_manager import CodeculateDBManager
 from jsonculate.jsonculate_db_manager import JSONculateDBManager
 from codeculate.code_executor import CodeExecutor
+from codeculate.build_cache import BuildCache
+from codeculate.warm_workers import get_warm_pool
 from jsonculate.json_parser import JSONParser
+from jsonculate.json_upload import UploadTooLargeError, spill_upload
+from jobs.job_manager import JobManager, QueueFullError, TERMINAL_STATUSES
+from common.host_fingerprint import host_fingerprint
+from common.single_flight import SingleFlightTimeout
+from measurement.emissions_service import get_emissions_service
 from config.logging_config import setup_logger
 
 app = Flask(__name__)
@@ -24,22 +35,75 @@ CORS(app)
 # Logger setup
 logger = setup_logger('app')
 
+################ History yardımcıları ################
+def _parse_bool_arg(name: str):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f"Invalid boolean value for {name}: {value}")
+
+def _ndjson_response(rows):
+    def generate():
+        for row in rows:
+            yield json.dumps(row, default=str) + '\n'
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+################ Execute yardımcıları ################
+def _sampling_options(data) -> dict:
+    # Hedef ve bütçe verilmezse ölçüm sınıflarının varsayılanları kullanılır
+    options = {'sampling': data.get('sampling', 'fixed')}
+    if data.get('targetRelativeError') is not None:
+        options['target_relative_error'] = float(data['targetRelativeError'])
+    if data.get('timeBudget') is not None:
+        options['time_budget'] = float(data['timeBudget'])
+    return options
+
+def _execute_options(data) -> dict:
+    # /codeculate/execute ve /codeculate/execute/stream için ortak çalıştırma seçenekleri
+    return {
+        'execution_mode': data.get('executionMode', 'subprocess'),
+        'energy_backend': data.get('energyBackend', 'codecarbon'),
+        'parallelism': data.get('parallelism', 1),
+        'pin_cpus': bool(data.get('pinCpus', False)),
+        'similarity_threshold': data.get('similarityThreshold'),
+        'output_mode': data.get('outputMode', 'truncate'),
+        **_sampling_options(data)
+    }
+
+def _workload_options(data) -> dict:
+    # /jsonculate/execute ve /jsonculate/jobs için parser iş yükü seçenekleri
+    return {
+        'operation': data.get('operation', 'roundtrip'),
+        'input_type': data.get('inputType', 'str'),
+        'indent': data.get('indent'),
+        'sort_keys': bool(data.get('sortKeys', False))
+    }
+
+def _upload_request():
+    # multipart/form-data'da belge 'file' alanındadır, seçenekler form alanlarındadır;
+    # diğer içerik tiplerinde belge istek gövdesinin kendisidir, seçenekler query string'dedir
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        if upload is None:
+            raise ValueError("Multipart upload requires a 'file' field")
+        return upload.stream, {**request.args.to_dict(), **request.form.to_dict()}
+    return request.stream, request.args.to_dict()
+
+################ SSE yardımcıları ################
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
 ################ Total Emission Route'u ################
 @app.route('/total-emission', methods=['GET'])
 def get_total_emissions():
     try:
-        # Code emisyonu
-        code_reports = codeculate_db.get_reports()
-        total_code_emissions = sum(report['total_carbon_emission'] for report in code_reports)
-
-        # JSON emisyonu
-        json_reports = jsonculate_db.get_reports()
-        total_json_emissions = sum(
-            report['json_emissions'] + 
-            report['orjson_emissions'] + 
-            report['ujson_emissions'] 
-            for report in json_reports
-        )
+        # Toplamlar her kayıtta artımlı güncellenen tablodan okunur
+        total_code_emissions = codeculate_db.get_total_emission()
+        total_json_emissions = jsonculate_db.get_total_emission()
         
         logger.info(f"Total emissions calculated - Code: {total_code_emissions}, JSON: {total_json_emissions}")
         return jsonify({
@@ -65,33 +129,109 @@ def calculate_emissions():
         language = data.get('language', 'python')
         repeat = data.get('repeat', 1)
         scale_threshold = data.get('scaleThreshold', 10000)
+        options = _execute_options(data)
         
         logger.info(f"Calculating emissions for {language} code with {repeat} repetitions")
         
         try:
-            executor = CodeExecutor()
-            result = executor.process(code, language, repeat, scale_threshold, timeout=30, db_manager=codeculate_db)
+            executor = CodeExecutor(build_cache=build_cache)
+            result = executor.process(code, language, repeat, scale_threshold, timeout=30, db_manager=codeculate_db, **options)
             logger.info(f"Emission calculation completed successfully")
             return jsonify(result)
 
         except ValueError as e:
             logger.warning(f"Invalid input for emission calculation: {str(e)}")
             return jsonify({'error': str(e)}), 400
+        except SingleFlightTimeout as e:
+            logger.warning(str(e))
+            return jsonify({'error': str(e)}), 504
         
     except Exception as e:
         logger.error(f"Error in calculate_emissions: {str(e)}")
         return jsonify({'error': f'Calculation failed: {str(e)}'}), 500
 
+@app.route('/codeculate/execute/stream', methods=['POST'])
+def stream_emissions():
+    """Execute code and stream per-iteration progress and output as Server-Sent Events"""
+    data = request.get_json()
+
+    if not data:
+        logger.warning("No data provided in request")
+        return jsonify({'error': 'No data provided'}), 400
+
+    code = data.get('code', '')
+    language = data.get('language', 'python')
+    repeat = data.get('repeat', 1)
+    scale_threshold = data.get('scaleThreshold', 10000)
+    options = _execute_options(data)
+    events: "queue.Queue" = queue.Queue()
+
+    # Çalıştırma ayrı bir thread'de yapılır; olaylar kuyruk üzerinden istemciye akıtılır.
+    # İstemci bağlantıyı kapatsa da çalıştırma tamamlanır ve sonuç kaydedilir.
+    def run():
+        try:
+            executor = CodeExecutor(build_cache=build_cache, on_event=lambda event, payload: events.put((event, payload)))
+            events.put(('result', executor.process(code, language, repeat, scale_threshold, timeout=30, db_manager=codeculate_db, **options)))
+        except Exception as e:
+            logger.error(f"Error in stream_emissions: {str(e)}")
+            events.put(('error', {'error': str(e)}))
+
+    def generate():
+        while True:
+            event, payload = events.get()
+            yield _sse(event, payload)
+            if event in ('result', 'error'):
+                break
+
+    logger.info(f"Streaming emissions for {language} code with {repeat} repetitions")
+    threading.Thread(target=run, name='codeculate-stream', daemon=True).start()
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
 @app.route('/codeculate/history', methods=['GET'])
 def get_history():
-    """Get calculation history from SQL database"""
+    """Get calculation history from SQL database (keyset paginated or NDJSON stream)"""
     try:
         logger.info("Fetching codeculate history")
-        return jsonify(codeculate_db.get_reports())
+        filters = {
+            'fields': request.args.get('fields'),
+            'language': request.args.get('language'),
+            'since': request.args.get('since'),
+            'until': request.args.get('until'),
+            'scaled': _parse_bool_arg('scaled')
+        }
+
+        if request.args.get('format') == 'ndjson':
+            rows = codeculate_db.iter_reports(cursor=request.args.get('cursor'), **filters)
+            return _ndjson_response(rows)
+
+        return jsonify(codeculate_db.get_reports_page(
+            limit=request.args.get('limit', type=int),
+            cursor=request.args.get('cursor'),
+            **filters
+        ))
+    except ValueError as e:
+        logger.warning(f"Invalid codeculate history request: {str(e)}")
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Failed to get codeculate history: {str(e)}")
         return jsonify({'error': f'Failed to get history: {str(e)}'}), 500
 
+@app.route('/codeculate/aggregates', methods=['GET'])
+def get_code_aggregates():
+    """Get emission totals and daily buckets grouped by language"""
+    try:
+        return jsonify(codeculate_db.get_aggregates(
+            group_by=request.args.get('group_by', 'language'),
+            since=request.args.get('since'),
+            until=request.args.get('until')
+        ))
+    except ValueError as e:
+        logger.warning(f"Invalid codeculate aggregates request: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Failed to get codeculate aggregates: {str(e)}")
+        return jsonify({'error': f'Failed to get aggregates: {str(e)}'}), 500
+
 ################ JSONculate Route'ları ################
 @app.route('/jsonculate/execute', methods=['POST'])
 def parse_json():
@@ -106,6 +246,10 @@ def parse_json():
         json_str = data.get('json', '')
         repeat = data.get('repeat', 1)
         scale_threshold = data.get('scaleThreshold', 10000)
+        energy_backend = data.get('energyBackend', 'codecarbon')
+        sampling = _sampling_options(data)
+        workload = _workload_options(data)
+        isolation = data.get('isolation', 'none')
         
         if not json_str:
             logger.warning("Empty JSON string provided")
@@ -115,29 +259,215 @@ def parse_json():
             
         parser = JSONParser()
         try:
-            result = parser.parse_json(json_str, repeat, scale_threshold=scale_threshold, db_manager=jsonculate_db)
+            result = parser.parse_json(json_str, repeat, scale_threshold=scale_threshold, db_manager=jsonculate_db, energy_backend=energy_backend, isolation=isolation, **sampling, **workload)
             logger.info("JSON parsing completed successfully")
             return jsonify(result)
         except ValueError as e:
             logger.warning(f"Invalid JSON input: {str(e)}")
             return jsonify({'error': str(e)}), 400
+        except SingleFlightTimeout as e:
+            logger.warning(str(e))
+            return jsonify({'error': str(e)}), 504
         
     except Exception as e:
         logger.error(f"Error in parse_json: {str(e)}")
         return jsonify({'error': f'Parsing failed: {str(e)}'}), 500
 
+@app.route('/jsonculate/upload', methods=['POST'])
+def parse_uploaded_json():
+    """Parse a large uploaded JSON document from a temp file and measure emissions and peak memory"""
+    try:
+        try:
+            stream, options = _upload_request()
+            repeat = int(options.get('repeat', 1))
+            scale_threshold = int(options.get('scaleThreshold', 10000))
+            sampling = _sampling_options(options)
+            document = spill_upload(stream)
+        except UploadTooLargeError as e:
+            logger.warning(str(e))
+            return jsonify({'error': str(e)}), 413
+        except ValueError as e:
+            logger.warning(f"Invalid upload: {str(e)}")
+            return jsonify({'error': str(e)}), 400
+
+        logger.info(f"Parsing uploaded JSON ({document.size} bytes) with {repeat} repetitions")
+
+        parser = JSONParser()
+        with document:
+            try:
+                result = parser.parse_file(
+                    document, repeat, scale_threshold=scale_threshold, db_manager=jsonculate_db,
+                    energy_backend=options.get('energyBackend', 'codecarbon'),
+                    isolation=options.get('isolation'), **sampling
+                )
+                logger.info("Uploaded JSON parsing completed successfully")
+                return jsonify(dict(result, document={'size': document.size, 'sha256': document.sha256}))
+            except ValueError as e:
+                logger.warning(f"Invalid JSON input: {str(e)}")
+                return jsonify({'error': str(e)}), 400
+            except SingleFlightTimeout as e:
+                logger.warning(str(e))
+                return jsonify({'error': str(e)}), 504
+
+    except Exception as e:
+        logger.error(f"Error in parse_uploaded_json: {str(e)}")
+        return jsonify({'error': f'Parsing failed: {str(e)}'}), 500
+
 @app.route('/jsonculate/history', methods=['GET'])
 def get_parse_history():
-    """Get JSON parsing history"""
+    """Get JSON parsing history (keyset paginated or NDJSON stream)"""
     try:
         logger.info("Fetching jsonculate history")
-        return jsonify(jsonculate_db.get_reports())
+        filters = {
+            'fields': request.args.get('fields'),
+            'since': request.args.get('since'),
+            'until': request.args.get('until'),
+            'scaled': _parse_bool_arg('scaled')
+        }
+
+        if request.args.get('format') == 'ndjson':
+            rows = jsonculate_db.iter_reports(cursor=request.args.get('cursor'), **filters)
+            return _ndjson_response(rows)
+
+        return jsonify(jsonculate_db.get_reports_page(
+            limit=request.args.get('limit', type=int),
+            cursor=request.args.get('cursor'),
+            **filters
+        ))
+    except ValueError as e:
+        logger.warning(f"Invalid jsonculate history request: {str(e)}")
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Failed to get jsonculate history: {str(e)}")
         return jsonify({'error': f'Failed to get history: {str(e)}'}), 500
 
+@app.route('/jsonculate/aggregates', methods=['GET'])
+def get_json_aggregates():
+    """Get emission totals and daily buckets grouped by parser"""
+    try:
+        return jsonify(jsonculate_db.get_aggregates(
+            group_by=request.args.get('group_by', 'parser'),
+            since=request.args.get('since'),
+            until=request.args.get('until')
+        ))
+    except ValueError as e:
+        logger.warning(f"Invalid jsonculate aggregates request: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Failed to get jsonculate aggregates: {str(e)}")
+        return jsonify({'error': f'Failed to get aggregates: {str(e)}'}), 500
+
+################ Job Route'ları ################
+JOB_STREAM_POLL_SECONDS = 0.5
+
+@app.route('/codeculate/jobs', methods=['POST'])
+def submit_codeculate_job():
+    """Queue a codeculate execution and return its job id"""
+    try:
+        data = request.get_json()
+
+        if not data:
+            logger.warning("No data provided in request")
+            return jsonify({'error': 'No data provided'}), 400
+
+        job = job_manager.submit('codeculate', {
+            'code': data.get('code', ''),
+            'language': data.get('language', 'python'),
+            'repeat': data.get('repeat', 1),
+            'scale_threshold': data.get('scaleThreshold', 10000),
+            'execution_mode': data.get('executionMode', 'subprocess'),
+            'energy_backend': data.get('energyBackend', 'codecarbon'),
+            'parallelism': data.get('parallelism', 1),
+            'pin_cpus': bool(data.get('pinCpus', False)),
+            'sampling': _sampling_options(data),
+            'similarity_threshold': data.get('similarityThreshold'),
+            'output_mode': data.get('outputMode', 'truncate'),
+            'timeout': 30
+        })
+        return jsonify(job.to_dict()), 202
+
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '5'}
+    except Exception as e:
+        logger.error(f"Error in submit_codeculate_job: {str(e)}")
+        return jsonify({'error': f'Failed to submit job: {str(e)}'}), 500
+
+@app.route('/jsonculate/jobs', methods=['POST'])
+def submit_jsonculate_job():
+    """Queue a jsonculate parsing run and return its job id"""
+    try:
+        data = request.get_json()
+
+        if not data:
+            logger.warning("No data provided in request")
+            return jsonify({'error': 'No data provided'}), 400
+
+        json_str = data.get('json', '')
+        if not json_str:
+            logger.warning("Empty JSON string provided")
+            return jsonify({'error': 'JSON string is required'}), 400
+
+        job = job_manager.submit('jsonculate', {
+            'json': json_str,
+            'repeat': data.get('repeat', 1),
+            'scale_threshold': data.get('scaleThreshold', 10000),
+            'energy_backend': data.get('energyBackend', 'codecarbon'),
+            'sampling': _sampling_options(data),
+            'workload': _workload_options(data),
+            'isolation': data.get('isolation', 'none')
+        })
+        return jsonify(job.to_dict()), 202
+
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '5'}
+    except Exception as e:
+        logger.error(f"Error in submit_jsonculate_job: {str(e)}")
+        return jsonify({'error': f'Failed to submit job: {str(e)}'}), 500
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get status and result of a queued job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """Stream status changes of a job as Server-Sent Events"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def generate():
+        last_status = None
+        while True:
+            status = job.status
+            if status != last_status:
+                yield _sse('status', {'job_id': job.id, 'status': status})
+                last_status = status
+            if status in TERMINAL_STATUSES:
+                yield _sse('result', job.to_dict())
+                break
+            time.sleep(JOB_STREAM_POLL_SECONDS)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a job that has not started yet"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if not job_manager.cancel(job_id):
+        return jsonify({'error': f'Job cannot be cancelled (status: {job.status})'}), 409
+    return jsonify(job.to_dict())
+
 ################ Main ################
 if __name__ == '__main__':
+    # Makine bilgisini başlangıçta bir kez hesapla
+    host_fingerprint.refresh()
+
     try:
         codeculate_db = CodeculateDBManager()
         jsonculate_db = JSONculateDBManager()
@@ -145,6 +475,16 @@ if __name__ == '__main__':
     except Exception as e:
         logger.error(f"❌ Error initializing databases: {str(e)}")
         sys.exit(1)
+
+    # Ölçüm servislerini istekler gelmeden önce bir kez başlat
+    get_emissions_service('machine').start()
+    get_emissions_service('process').start()
+
+    # Warm modu için dil worker'larını istekler gelmeden önce başlat
+    get_warm_pool().prewarm()
+
+    build_cache = BuildCache()
+    job_manager = JobManager()
     
     logger.info(f"🌍 Server running on: http://localhost:5000")
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
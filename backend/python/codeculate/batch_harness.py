@@ -0,0 +1,262 @@
+"""
+    BatchHarness
+    =================================================================
+    Codeculate'in "batch" çalıştırma modu için dile özel sürücü (driver)
+    programlarını üretir. Kullanıcının kodu her tekrar için ayrı bir süreç
+    başlatmak yerine tek bir süreç içinde N kez çalıştırılır ve her tekrarın
+    süresi stderr pipe'ı üzerinden işaretli satırlar olarak geri bildirilir:
+
+        __GREENCULATE_ITER__ <tekrar> <süre_ns> <çıkış_kodu>
+
+    Tekrar sayısı sürücüye GREENCULATE_ITERATIONS ortam değişkeniyle verilir.
+    Kayıtlar stderr okunurken HarnessRecordFilter ile ayıklanır; böylece çıktı
+    sınırından etkilenmez ve süreç sürerken takip edilebilir. Son kaydın zamanı
+    da tutulur; tek bir tekrar takılırsa süreç tekrar başına zaman aşımı ile
+    sonlandırılabilir.
+
+    Dillere göre sürücüler:
+    - python: Kod bir kez compile edilir, her tekrar yeni bir globals ile exec edilir.
+    - javascript: Kod bir kez CommonJS modülü olarak sarılır, her tekrar yeni bir
+      module nesnesiyle çağrılır. (Asenkron işler ölçüme dahil edilmez.)
+    - java: GreenculateHarness sınıfı aynı JVM içinde Main.main'i N kez çağırır.
+      (Statik alanlar tekrarlar arasında korunur.)
+    - c / cpp: Programa bir constructor bağlanır; bu constructor main'den önce
+      çalışıp her tekrar için fork() yapar, çocuk süreç kullanıcının main'ini
+      çalıştırır. exec ve dinamik bağlama maliyeti ortadan kalkar. Sadece POSIX.
+
+    Programın kendisi süreci sonlandırırsa (process.exit, System.exit) eksik
+    tekrarlar başarısız sayılır.
+"""
+
+import os
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HARNESS_MARKER = '__GREENCULATE_ITER__'
+ITERATIONS_ENV = 'GREENCULATE_ITERATIONS'
+
+HARNESS_RECORD = re.compile(HARNESS_MARKER.encode('ascii') + rb' (\d+) (\d+) (-?\d+)\r?\n')
+
+# Satır sonu gelmeden bekletilecek en fazla byte; daha uzun satırların yalnızca sonu
+# (bir kaydın sığacağı kadarı) bekletilir
+MAX_PENDING_BYTES = 64 * 1024
+RECORD_MAX_BYTES = 128
+
+################ Python sürücüsü ################
+PYTHON_HARNESS = '''import os
+import sys
+import time
+import traceback
+
+def _run():
+    path = os.path.abspath(sys.argv[1])
+    iterations = int(os.environ.get('GREENCULATE_ITERATIONS', '1'))
+    with open(path, 'r', encoding='utf-8') as source_file:
+        code = compile(source_file.read(), path, 'exec')
+    sys.argv = [path]
+    sys.path[0] = os.path.dirname(path)
+    for i in range(iterations):
+        user_globals = {'__name__': '__main__', '__file__': path, '__builtins__': __builtins__}
+        exit_code = 0
+        start = time.perf_counter_ns()
+        try:
+            exec(code, user_globals)
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        elapsed = time.perf_counter_ns() - start
+        sys.stdout.flush()
+        sys.stderr.write('__GREENCULATE_ITER__ %d %d %d\\n' % (i, elapsed, exit_code))
+        sys.stderr.flush()
+
+_run()
+'''
+
+################ Node.js sürücüsü ################
+JAVASCRIPT_HARNESS = '''const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+const Module = require('module');
+
+const file = path.resolve(process.argv[2]);
+const iterations = parseInt(process.env.GREENCULATE_ITERATIONS || '1', 10);
+const wrapper = vm.runInThisContext(Module.wrap(fs.readFileSync(file, 'utf8')), { filename: file });
+const userRequire = Module.createRequire(file);
+
+for (let i = 0; i < iterations; i++) {
+  const userModule = new Module(file, null);
+  userModule.filename = file;
+  userModule.paths = Module._nodeModulePaths(path.dirname(file));
+  let exitCode = 0;
+  const start = process.hrtime.bigint();
+  try {
+    wrapper.call(userModule.exports, userModule.exports, userRequire, userModule, file, path.dirname(file));
+  } catch (e) {
+    fs.writeSync(2, (e && e.stack ? e.stack : String(e)) + '\\n');
+    exitCode = 1;
+  }
+  const elapsed = process.hrtime.bigint() - start;
+  fs.writeSync(2, `__GREENCULATE_ITER__ ${i} ${elapsed} ${exitCode}\\n`);
+}
+'''
+
+################ Java sürücüsü ################
+JAVA_HARNESS = '''public class GreenculateHarness {
+    public static void main(String[] args) {
+        String value = System.getenv("GREENCULATE_ITERATIONS");
+        int iterations = value == null ? 1 : Integer.parseInt(value);
+        for (int i = 0; i < iterations; i++) {
+            int exitCode = 0;
+            long start = System.nanoTime();
+            try {
+                Main.main(new String[0]);
+            } catch (Throwable t) {
+                t.printStackTrace();
+                exitCode = 1;
+            }
+            long elapsed = System.nanoTime() - start;
+            System.out.flush();
+            System.err.println("__GREENCULATE_ITER__ " + i + " " + elapsed + " " + exitCode);
+            System.err.flush();
+        }
+    }
+}
+'''
+
+################ C / C++ sürücüsü (fork tabanlı constructor) ################
+NATIVE_HARNESS = '''#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+
+__attribute__((constructor))
+static void greenculate_harness(void) {
+    const char *value = getenv("GREENCULATE_ITERATIONS");
+    int iterations = value ? atoi(value) : 1;
+    int i;
+    for (i = 0; i < iterations; i++) {
+        struct timespec start, end;
+        int status = 0;
+        int exit_code;
+        pid_t pid;
+        fflush(stdout);
+        fflush(stderr);
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        pid = fork();
+        if (pid == 0) {
+            /* Çocuk süreç: constructor'dan dönüp kullanıcının main'ini çalıştırır */
+            return;
+        }
+        if (pid < 0) {
+            perror("fork");
+            _exit(1);
+        }
+        waitpid(pid, &status, 0);
+        clock_gettime(CLOCK_MONOTONIC, &end);
+        exit_code = WIFEXITED(status) ? WEXITSTATUS(status) : 128 + WTERMSIG(status);
+        fprintf(stderr, "__GREENCULATE_ITER__ %d %lld %d\\n", i,
+                (long long)(end.tv_sec - start.tv_sec) * 1000000000LL + (end.tv_nsec - start.tv_nsec),
+                exit_code);
+        fflush(stderr);
+    }
+    _exit(0);
+}
+'''
+
+################ Dillere göre sürücü dosyaları ################
+HARNESS_FILES = {
+    'python': ('GreenculateHarness.py', PYTHON_HARNESS),
+    'javascript': ('GreenculateHarness.js', JAVASCRIPT_HARNESS),
+    'java': ('GreenculateHarness.java', JAVA_HARNESS),
+    'cpp': ('GreenculateHarness.c', NATIVE_HARNESS),
+    'c': ('GreenculateHarness.c', NATIVE_HARNESS)
+}
+
+################ Batch modunda compile ve run komutları ################
+BATCH_COMMANDS = {
+    'python': lambda file, harness: (
+        None,
+        ['python', harness, file]
+    ),
+    'javascript': lambda file, harness: (
+        None,
+        ['node', harness, file]
+    ),
+    'java': lambda file, harness: (
+        ['javac', file, harness],
+        ['java', '-cp', os.path.dirname(file), 'GreenculateHarness']
+    ),
+    'cpp': lambda file, harness: (
+        # g++ .c dosyasını da C++ olarak derler, sürücü her iki dilde de geçerlidir
+        ['g++', file, harness, '-o', file.replace('.cpp', '')],
+        [file.replace('.cpp', '')]
+    ),
+    'c': lambda file, harness: (
+        ['gcc', file, harness, '-o', file.replace('.c', '')],
+        [file.replace('.c', '')]
+    )
+}
+
+################ Dilin bu platformda batch modunu destekleyip desteklemediğini döndürür ################
+def is_batch_supported(language: str) -> bool:
+    if language in ('c', 'cpp'):
+        return os.name == 'posix'
+    return language in BATCH_COMMANDS
+
+################ Sürücü kaynak kodunu döndürür (derleme önbelleği anahtarı için) ################
+def get_harness_source(language: str) -> str:
+    return HARNESS_FILES[language][1]
+
+################ Sürücüyü kodun yanına yazar ve compile/run komutlarını döndürür ################
+def prepare_batch_commands(file_path: str, language: str) -> Tuple[Optional[List[str]], List[str]]:
+    file_name, source = HARNESS_FILES[language]
+    harness_path = os.path.join(os.path.dirname(file_path), file_name)
+    with open(harness_path, 'w', encoding='utf-8') as harness_file:
+        harness_file.write(source)
+    return BATCH_COMMANDS[language](file_path, harness_path)
+
+################========== HarnessRecordFilter ==========################
+class HarnessRecordFilter:
+    # Sürücünün stderr akışından tekrar kayıtlarını parça parça okunurken ayıklar;
+    # kayıtlar çıktı sınırından bağımsız olarak her zaman tutulur
+    def __init__(self, on_record: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.records: List[Dict[str, Any]] = []
+        self.on_record = on_record
+        # Tekrar başına zaman aşımı son kayıttan (ilk tekrar için süreç başlangıcından) itibaren ölçülür
+        self.last_record_at = time.monotonic()
+        self._pending = b''
+
+    ################ Okunan parçadaki tam satırlardan kayıtları ayıklar, kalan çıktıyı döndürür ################
+    def feed(self, chunk: bytes) -> bytes:
+        data = self._pending + chunk
+        end = data.rfind(b'\n') + 1
+        complete, self._pending = data[:end], data[end:]
+        if len(self._pending) > MAX_PENDING_BYTES:
+            complete += self._pending[:-RECORD_MAX_BYTES]
+            self._pending = self._pending[-RECORD_MAX_BYTES:]
+        return self._extract(complete)
+
+    ################ Akış bittiğinde bekleyen kısmı döndürür ################
+    def finish(self) -> bytes:
+        data, self._pending = self._pending, b''
+        return self._extract(data)
+
+    def _extract(self, data: bytes) -> bytes:
+        for m in HARNESS_RECORD.finditer(data):
+            record = {'iteration': int(m.group(1)), 'duration_ns': int(m.group(2)), 'exit_code': int(m.group(3))}
+            self.records.append(record)
+            self.last_record_at = time.monotonic()
+            if self.on_record:
+                self.on_record(record)
+        return HARNESS_RECORD.sub(b'', data)
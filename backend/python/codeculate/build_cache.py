@@ -0,0 +1,155 @@
+"""
+    BuildCache
+    =================================================================
+    Derlenen diller (java, cpp, c) için derleme çıktılarını diskte saklayan,
+    içerik adresli (content-addressed) bir derleme önbelleğidir. Aynı kaynak
+    kod aynı derleyici sürümüyle tekrar gönderildiğinde derleme adımı atlanır
+    ve önceki çıktı kopyalanarak kullanılır.
+
+    Anahtar: dil + derleyici sürümü + kaynak kodun SHA-256 özeti.
+    Not: normalize() çıktısı anahtar olarak kullanılmaz; normalize string
+    literal'leri ve değişken isimlerini soyutladığı için farklı çıktı üreten
+    iki program aynı anahtara düşebilir.
+
+    Özellikler:
+    - Derleyici sürümünü bir kez sorgulayıp saklar.
+    - Derleme çıktılarını önbellekten geri yükler.
+    - Yeni derleme çıktılarını önbelleğe ekler.
+    - Toplam boyutu sınırlar, en eski kullanılan kayıtları siler (LRU).
+"""
+
+import os
+import glob
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+from typing import Dict, List
+from config.logging_config import setup_logger
+
+logger = setup_logger('build_cache')
+
+################ Dillere göre önbelleğe alınacak derleme çıktıları ################
+ARTIFACT_PATTERNS = {
+    'java': ['*.class'],
+    'cpp': ['Main', 'Main.exe'],
+    'c': ['Main', 'Main.exe']
+}
+
+################ Derleyici sürüm komutları ################
+COMPILER_VERSION_COMMANDS = {
+    'java': ['javac', '-version'],
+    'cpp': ['g++', '--version'],
+    'c': ['gcc', '--version']
+}
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'greenculate-build-cache')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+################========== BuildCache ==========################
+class BuildCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._compiler_versions: Dict[str, str] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        logger.info(f"Build cache initialized at {self.cache_dir} (max {self.max_bytes} bytes)")
+
+    ################ Dil, derleyici sürümü ve kaynak koddan önbellek anahtarı üretir ################
+    def make_key(self, language: str, source: str) -> str:
+        version = self._get_compiler_version(language)
+        combined = f"{language}\0{version}\0{source}"
+        return hashlib.sha256(combined.encode('utf-8')).hexdigest()
+
+    ################ Önbellekteki derleme çıktılarını hedef klasöre kopyalar ################
+    def restore(self, key: str, target_dir: str) -> bool:
+        entry_dir = os.path.join(self.cache_dir, key)
+        with self._lock:
+            if not os.path.isdir(entry_dir):
+                logger.debug(f"Build cache miss: {key[:8]}...")
+                return False
+            try:
+                for name in os.listdir(entry_dir):
+                    shutil.copy2(os.path.join(entry_dir, name), os.path.join(target_dir, name))
+                # LRU için son kullanım zamanını güncelle
+                os.utime(entry_dir)
+            except OSError as e:
+                logger.warning(f"Failed to restore build cache entry {key[:8]}...: {str(e)}")
+                return False
+
+        logger.info(f"Build cache hit: {key[:8]}...")
+        return True
+
+    ################ Derleme çıktılarını önbelleğe ekler ################
+    def store(self, key: str, language: str, build_dir: str):
+        artifacts = self._collect_artifacts(language, build_dir)
+        if not artifacts:
+            logger.warning(f"No build artifacts found to cache for {language}")
+            return
+
+        entry_dir = os.path.join(self.cache_dir, key)
+        staging_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix='.staging-')
+        try:
+            for artifact in artifacts:
+                shutil.copy2(artifact, os.path.join(staging_dir, os.path.basename(artifact)))
+
+            with self._lock:
+                if os.path.isdir(entry_dir):
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+                    return
+                os.replace(staging_dir, entry_dir)
+                logger.info(f"Stored build artifacts in cache: {key[:8]}...")
+                self._evict()
+        except OSError as e:
+            logger.warning(f"Failed to store build cache entry {key[:8]}...: {str(e)}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    ################ Derleme klasöründeki önbelleğe alınacak dosyaları bulur ################
+    def _collect_artifacts(self, language: str, build_dir: str) -> List[str]:
+        artifacts = []
+        for pattern in ARTIFACT_PATTERNS.get(language, []):
+            artifacts.extend(p for p in glob.glob(os.path.join(build_dir, pattern)) if os.path.isfile(p))
+        return artifacts
+
+    ################ Toplam boyut sınırı aşıldıysa en eski kayıtları siler ################
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            if name.startswith('.') or not os.path.isdir(entry_dir):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, f)) for f in os.listdir(entry_dir)
+            )
+            entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+            total_size += size
+
+        entries.sort()
+        while total_size > self.max_bytes and entries:
+            _, size, entry_dir = entries.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+            logger.debug(f"Evicted build cache entry: {entry_dir}")
+
+    ################ Derleyici sürümünü bir kez sorgular ve saklar ################
+    def _get_compiler_version(self, language: str) -> str:
+        if language in self._compiler_versions:
+            return self._compiler_versions[language]
+
+        version = 'unknown'
+        cmd = COMPILER_VERSION_COMMANDS.get(language)
+        if cmd:
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+                # javac eski sürümlerde sürümü stderr'e yazar
+                output = (result.stdout or result.stderr).strip()
+                version = output.splitlines()[0] if output else 'unknown'
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning(f"Could not determine compiler version for {language}: {str(e)}")
+
+        self._compiler_versions[language] = version
+        logger.debug(f"Compiler version for {language}: {version}")
+        return version
@@ -10,21 +10,60 @@
     - Kodu geçici bir dosya olarak kaydeder.
     - Kodu compile eder.
     - Kodu çalıştırır.
-    - Kodun karbon salınımını ölçer.
+    - Kodun karbon salınımını ölçer (ortak, sürekli açık ölçüm servisi ile).
+    - Her alt sürecin kaynak kullanımını (CPU süresi, bellek, bağlam değişimi,
+      sayfa hatası) toplar; emisyonu alt süreçlerin CPU süresi payına göre atar.
+    - İsteğe bağlı olarak tekrarları paralel parçalara (shard) bölüp birden fazla
+      çekirdekte çalıştırır; alt süreçler CPU'lara sabitlenebilir.
+    - İsteğe bağlı olarak sabit ölçeklendirme yerine güven aralığı hedefe inene
+      kadar örnek alır (adaptive sampling) ve sonucu ekstrapole eder.
+    - Birebir aynı kod bulunamazsa isteğe bağlı olarak benzerlik eşiğinin
+      üzerindeki yakın kopya bir kaydın sonucunu benzerlik skoruyla döndürür.
+    - Aynı anda gelen birebir aynı istekleri birleştirir; ölçüm bir kez
+      çalıştırılır ve diğer istekler sonucunu bekler (single-flight).
+    - Tekrarların çıktısını yalnızca ilk ve son kısmı tutan halka tamponda
+      toplar; istenirse her tekrar için ilerleme ve çıktı olayları yayınlar.
+    - Alt süreç çıktısını akış başına byte sınırı ile okur; sınırı aşan kısmı
+      keser, dosyaya yazar veya sadece ölçüm modunda hiç okumaz.
+    - Warm modunda kodu her seferinde yeni bir interpreter/JVM başlatmak
+      yerine havuzdaki önceden başlatılmış dil worker'larında çalıştırır.
     - Sonucu döndürür (frontend'e).
 """
 
 import os
+import glob
+import time
 import tempfile
 import subprocess
-import time
-from codecarbon import EmissionsTracker
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Callable, Tuple, List, Optional, Set
 from config.logging_config import setup_logger
+from common.single_flight import SingleFlight
+from measurement.emissions_service import EmissionsService, get_emissions_service
+from measurement.energy_backends import DEFAULT_ENERGY_BACKEND, resolve_energy_backend
+from measurement.cpu_accounting import attribute_emissions
+from measurement.adaptive_sampling import (
+    SAMPLING_MODES, CONFIDENCE_LEVEL, DEFAULT_TARGET_RELATIVE_ERROR, DEFAULT_TIME_BUDGET_SECONDS,
+    AdaptiveSampler, summarize_confidence_interval, interval
+)
+from .batch_harness import (
+    ITERATIONS_ENV, is_batch_supported, get_harness_source,
+    prepare_batch_commands, HarnessRecordFilter
+)
+from .process_runner import (
+    RUSAGE_FIELDS, run_process, merge_usage, scale_usage, usage_cpu_seconds,
+    available_cpus, is_pinning_supported, plan_shards, OUTPUT_MODES, DEFAULT_OUTPUT_MODE
+)
+from .warm_workers import is_warm_supported, warm_target, get_warm_pool
+from .similarity_index import validate_threshold
+from .output_buffer import OutputRingBuffer
 
 logger = setup_logger('code_executor')
 
+# Bu süreçte aynı anda çalışan birebir aynı ölçümler tek bir çalıştırmada birleştirilir
+_flights = SingleFlight('codeculate')
+
 ################ Desteklenen diller ve uzantıları ################
 LANG_FILE_EXTENSIONS = {
     'python': '.py',
@@ -56,26 +95,125 @@ INTERPRETERS = {
     'javascript': lambda file: ['node', file]
 }
 
+################ Çalıştırma modları ################
+# subprocess: Her tekrar için ayrı bir süreç başlatılır.
+# batch: Kod tek bir süreç içinde dile özel bir sürücü ile N kez çalıştırılır.
+# warm: Kod havuzdaki önceden başlatılmış bir dil worker'ında N kez çalıştırılır.
+EXECUTION_MODES = ('subprocess', 'batch', 'warm')
+
+# Tekrarları tek bir süreç içinde çalıştıran, süreç başlatma maliyetini ölçümden çıkaran modlar
+LOOP_EXECUTION_MODES = ('batch', 'warm')
+
+# Adaptive örneklemede batch/warm modunda bir örnekte çalıştırılan tekrar sayısı
+BATCH_SAMPLE_SIZE = 10
+
+# Batch/warm modunda tek süreçte çalışan tüm tekrarlar için üst süre sınırı (saniye);
+# her tekrar ayrıca kendi timeout'u ile sınırlıdır
+MAX_LOOP_TIMEOUT_SECONDS = 600
+
+# İlerleme olaylarında bir tekrarın çıktısından gönderilen en fazla karakter
+OUTPUT_EVENT_LIMIT = 4 * 1024
+# İlerleme olaylarındaki anlık enerji okuması en fazla bu sıklıkta yenilenir (saniye)
+ENERGY_EVENT_INTERVAL = 1.0
+
 ################========== CodeExecutor ==========################
 class CodeExecutor:
-    def __init__(self):
+    def __init__(self, build_cache=None, emissions_service: EmissionsService = None, on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        self.build_cache = build_cache
+        # Verilirse her tekrar için ilerleme ve çıktı olayları bu fonksiyona gönderilir
+        self.on_event = on_event
+        # Kod alt süreçlerde çalıştığı için tüm makineyi ölçen ortak tracker kullanılır
+        self.emissions = emissions_service or get_emissions_service('machine')
         logger.info("CodeExecutor initialized with supported languages: " + ", ".join(LANG_FILE_EXTENSIONS.keys()))
 
     ################ Kodu çalıştırır ve emisyon hesaplaması yapar ################
-    def process(self, code: str, language: str, repeat: int, scale_threshold: int, timeout: int = 30, db_manager=None) -> Dict[str, Any]:
-        logger.info(f"Processing {language} code with {repeat} repetitions (threshold: {scale_threshold})")
+    def process(self, code: str, language: str, repeat: int, scale_threshold: int, timeout: int = 30, db_manager=None, execution_mode: str = 'subprocess', normalized_code: Optional[str] = None, energy_backend: str = DEFAULT_ENERGY_BACKEND, parallelism: int = 1, pin_cpus: bool = False, sampling: str = 'fixed', target_relative_error: float = DEFAULT_TARGET_RELATIVE_ERROR, time_budget: float = DEFAULT_TIME_BUDGET_SECONDS, similarity_threshold: Optional[float] = None, output_mode: str = DEFAULT_OUTPUT_MODE) -> Dict[str, Any]:
+        logger.info(f"Processing {language} code with {repeat} repetitions (threshold: {scale_threshold}, mode: {execution_mode}, energy: {energy_backend}, parallelism: {parallelism}, sampling: {sampling})")
+
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unsupported execution mode: {execution_mode}")
+        if not isinstance(parallelism, int) or parallelism < 1:
+            raise ValueError(f"Invalid parallelism: {parallelism}. Must be a positive integer")
+        if sampling not in SAMPLING_MODES:
+            raise ValueError(f"Unsupported sampling mode: {sampling}. Supported: {', '.join(SAMPLING_MODES)}")
+        validate_threshold(similarity_threshold)
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Unsupported output mode: {output_mode}. Supported: {', '.join(OUTPUT_MODES)}")
+
+        # Adaptive örnekleme örnekleri sırayla alır; paralel parçalarla birlikte kullanılamaz
+        sampler = None
+        if sampling == 'adaptive':
+            sampler = AdaptiveSampler(target_relative_error, time_budget)
+            if parallelism > 1:
+                logger.warning("Adaptive sampling runs samples serially, ignoring parallelism")
+                parallelism = 1
+
+        # Paralellik kullanılabilir CPU sayısı ve çalıştırılacak tekrar sayısı ile sınırlıdır
+        parallelism = min(parallelism, len(available_cpus()), max(1, min(scale_threshold, repeat)))
+
+        # Batch modu bu dilde/platformda desteklenmiyorsa her tekrar için ayrı süreç kullan
+        if execution_mode == 'batch' and not is_batch_supported(language.lower()):
+            logger.warning(f"Batch mode is not supported for {language} on this platform, falling back to subprocess mode")
+            execution_mode = 'subprocess'
+
+        # Warm modu bu dilde/makinede desteklenmiyorsa her tekrar için ayrı süreç kullan
+        if execution_mode == 'warm':
+            if not is_warm_supported(language.lower()):
+                logger.warning(f"Warm mode is not supported for {language} on this machine, falling back to subprocess mode")
+                execution_mode = 'subprocess'
+            else:
+                # Worker'lar havuzdan alındığı için parçalar CPU'lara sabitlenemez
+                if pin_cpus:
+                    logger.warning("Warm workers are shared, ignoring CPU pinning")
+                    pin_cpus = False
+                # procfs yalnızca bu sürecin beklediği alt süreçleri görür; worker'ların CPU süresini göremez
+                if energy_backend == 'procfs':
+                    logger.warning("procfs backend cannot observe warm workers, falling back to codecarbon")
+                    energy_backend = DEFAULT_ENERGY_BACKEND
+
+        # Enerji backend'ini seç; bu makinede kullanılamıyorsa codecarbon kullanılır
+        energy_backend, energy = resolve_energy_backend(energy_backend, self.emissions)
         
+        # Kod istek başına en fazla bir kez normalize edilir; arama ve kayıt aynı sonucu kullanır
+        if normalized_code is None:
+            normalized_code = db_manager.normalize_code(code, language)
+
         # Benzer kod kontrolü
         has_similar, similar_record = db_manager.get_existing_report(
             code=code,
             language=language,
             execution_count=repeat,
-            scale_threshold=scale_threshold
+            scale_threshold=scale_threshold,
+            execution_mode=execution_mode,
+            normalized_code=normalized_code,
+            energy_backend=energy_backend,
+            parallelism=parallelism,
+            sampling_mode=sampling,
+            target_relative_error=target_relative_error
         )
+        similarity = 1.0 if has_similar else None
+
+        # Birebir eşleşme yoksa ve eşik verildiyse yakın kopya kayıtları ara
+        if not has_similar and similarity_threshold is not None:
+            has_similar, similar_record = db_manager.find_similar_report(
+                code=code,
+                language=language,
+                execution_count=repeat,
+                similarity_threshold=similarity_threshold,
+                scale_threshold=scale_threshold,
+                execution_mode=execution_mode,
+                normalized_code=normalized_code,
+                energy_backend=energy_backend,
+                parallelism=parallelism,
+                sampling_mode=sampling,
+                target_relative_error=target_relative_error
+            )
+            if has_similar:
+                similarity = similar_record['similarity']
 
         # Benzer kod var ise benzer kodun sonuçlarını döndür
         if has_similar:
-            logger.info("Found cached results, returning from database")
+            logger.info(f"Found cached results (similarity: {similarity:.3f}), returning from database")
             return {
                 'total_emissions': similar_record['total_carbon_emission'],
                 'avg_emissions': similar_record['carbon_per_execution'],
@@ -94,16 +232,39 @@ class CodeExecutor:
                 },
                 'is_cached': True,
                 'is_scaled': similar_record['is_scaled'],
-                'scale_threshold': scale_threshold
+                'scale_threshold': scale_threshold,
+                'execution_mode': execution_mode,
+                'energy_backend': energy_backend,
+                'resource_usage': self._cached_resource_usage(similar_record),
+                'parallelism': parallelism,
+                'sampling': sampling,
+                'confidence_interval': self._cached_confidence_interval(similar_record),
+                'similarity': similarity,
+                'similar_report_id': similar_record['id']
             }
 
+        # Aynı kimlikle şu an ölçülmekte olan bir çalıştırma varsa onu tekrar çalıştırmak yerine sonucunu bekle
+        flight_key = db_manager.cache_key(
+            normalized_code, language, repeat, scale_threshold, execution_mode,
+            energy_backend, parallelism, sampling, target_relative_error
+        )
+        result, is_shared = _flights.do(flight_key, lambda: self._execute(
+            code, language, repeat, scale_threshold, timeout, db_manager, execution_mode,
+            normalized_code, energy_backend, energy, parallelism, pin_cpus, sampling, sampler, output_mode
+        ))
+        if is_shared:
+            logger.info("Returning result of an identical in-flight execution")
+        return dict(result, is_coalesced=is_shared)
+
+    ################ Kodu compile edip çalıştırır, sonucu kaydeder ve döndürür ################
+    def _execute(self, code: str, language: str, repeat: int, scale_threshold: int, timeout: int, db_manager, execution_mode: str, normalized_code: str, energy_backend: str, energy, parallelism: int, pin_cpus: bool, sampling: str, sampler: Optional[AdaptiveSampler], output_mode: str) -> Dict[str, Any]:
         # Kodu compile et
         temp_file = None
         try:
             temp_file = self.create_temp_code_file(code, language)
             logger.debug(f"Created temporary file: {temp_file}")
             
-            cmd, error = self.get_run_command(temp_file, language)
+            cmd, error = self.get_run_command(temp_file, language, execution_mode)
 
             # Compile hatası var ise, hata mesajıyla veriyi döndür
             if error:
@@ -126,72 +287,29 @@ class CodeExecutor:
                     },
                     'is_cached': False,
                     'is_scaled': False,
-                    'scale_threshold': scale_threshold
+                    'scale_threshold': scale_threshold,
+                    'execution_mode': execution_mode,
+                    'energy_backend': energy_backend,
+                    'parallelism': parallelism,
+                    'sampling': sampling,
+                    'confidence_interval': None,
+                    'similarity': None
                 }
 
-            # Tekrar sayısı, ölçeklendirme eşiğinden büyük ise ölçeklendirme ayarla
-            actual_repeat = min(scale_threshold, repeat)
-            scale_factor = repeat / actual_repeat if repeat > scale_threshold else 1
-            
-            if repeat > scale_threshold:
-                logger.info(f"Scaling enabled: actual_repeat={actual_repeat}, scale_factor={scale_factor}")
-
-            # Çıktı sonuçları
-            combined_output = ""
-            combined_error = ""
-            all_successful = True
-
-            # Codecarbon'u başlat
-            logger.info("Starting emissions tracking")
-            tracker = EmissionsTracker()
-            tracker.start()
-            start_time = time.time()
-
-            for i in range(actual_repeat):
-                logger.debug(f"Running iteration {i+1}/{actual_repeat}")
-                try:
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-                    success = (result.returncode == 0)
-                    stdout = result.stdout
-                    stderr = result.stderr
-                    
-                    if success:
-                        logger.debug(f"Iteration {i+1} completed successfully")
-                    else:
-                        logger.warning(f"Iteration {i+1} failed with error: {stderr}")
-                        
-                except subprocess.TimeoutExpired:
-                    logger.error(f"Iteration {i+1} timed out after {timeout} seconds")
-                    success = False
-                    stdout = ""
-                    stderr = f"Execution timeout ({timeout} seconds)"
-
-                # Çıktı sonuçlarını alma
-                if not success:
-                    all_successful = False
-                combined_output += f"=== Run {i+1}/{actual_repeat} ===\n{stdout}\n"
-                if stderr:
-                    combined_error += f"=== Run {i+1}/{actual_repeat} Error ===\n{stderr}\n"
-                if "Execution timeout" in stderr:
-                    logger.warning("Stopping execution due to timeout")
-                    break
-
-            # Codecarbon'u durdur
-            execution_time = time.time() - start_time
-            emissions = tracker.stop()
-            logger.info(f"Execution completed: {execution_time:.2f}s, {emissions:.6f}g CO2")
-
-            # Gerekli ise ölçeklendirme yap
-            if repeat > scale_threshold:
-                execution_time *= scale_factor
-                emissions *= scale_factor
-                logger.info(f"Scaled results: {execution_time:.2f}s, {emissions:.6f}g CO2")
+            if sampler:
+                # Tekrar sayısı ölçeklendirme eşiğine göre değil, güven aralığına göre belirlenir
+                combined_output, combined_error, all_successful, execution_time, emissions, resource_usage, confidence = \
+                    self._run_adaptive(sampler, cmd, execution_mode, energy, language, repeat, timeout, output_mode)
+                is_scaled = confidence['iterations'] < repeat
+            else:
+                combined_output, combined_error, all_successful, execution_time, emissions, resource_usage = \
+                    self._run_fixed(cmd, execution_mode, energy, energy_backend, language, repeat, scale_threshold, timeout, parallelism, pin_cpus, output_mode)
+                is_scaled = repeat > scale_threshold
+                confidence = None
 
         # Hata yönetimi
         except Exception as e:
             logger.error(f"Error during execution: {str(e)}", exc_info=True)
-            if 'tracker' in locals() and tracker.is_tracking:
-                tracker.stop()
             return {
                 'total_emissions': 0,
                 'avg_emissions': 0,
@@ -210,7 +328,13 @@ class CodeExecutor:
                 },
                 'is_cached': False,
                 'is_scaled': False,
-                'scale_threshold': scale_threshold
+                'scale_threshold': scale_threshold,
+                'execution_mode': execution_mode,
+                'energy_backend': energy_backend,
+                'parallelism': parallelism,
+                'sampling': sampling,
+                'confidence_interval': None,
+                'similarity': None
             }
         finally:
             if temp_file:
@@ -241,8 +365,14 @@ class CodeExecutor:
                     total_carbon_emission=total_emissions,
                     execution_duration=total_execution_time,
                     code_text=code,
-                    is_scaled=(repeat > scale_threshold),
-                    scale_threshold=scale_threshold
+                    is_scaled=is_scaled,
+                    scale_threshold=scale_threshold,
+                    execution_mode=execution_mode,
+                    normalized_code=normalized_code,
+                    energy_backend=energy_backend,
+                    resource_usage=resource_usage,
+                    parallelism=parallelism,
+                    confidence_interval=confidence
                 )
             except Exception as e:
                 logger.error(f"Error saving to database: {str(e)}", exc_info=True)
@@ -260,14 +390,367 @@ class CodeExecutor:
             'language': language,
             'last_result': last_result,
             'is_cached': False,
-            'is_scaled': (repeat > scale_threshold),
-            'scale_threshold': scale_threshold
+            'is_scaled': is_scaled,
+            'scale_threshold': scale_threshold,
+            'execution_mode': execution_mode,
+            'energy_backend': energy_backend,
+            'resource_usage': resource_usage,
+            'parallelism': parallelism,
+            'sampling': sampling,
+            'confidence_interval': confidence,
+            'similarity': None
+        }
+
+    ################ Tekrarları ölçeklendirme eşiğine kadar (gerekirse paralel parçalarla) çalıştırır ###############
+    def _run_fixed(self, cmd: List[str], execution_mode: str, energy, energy_backend: str, language: str, repeat: int, scale_threshold: int, timeout: int, parallelism: int, pin_cpus: bool, output_mode: str = DEFAULT_OUTPUT_MODE) -> Tuple[str, str, bool, float, float, Optional[Dict[str, Any]]]:
+        # Tekrar sayısı, ölçeklendirme eşiğinden büyük ise ölçeklendirme ayarla
+        actual_repeat = min(scale_threshold, repeat)
+        scale_factor = repeat / actual_repeat if repeat > scale_threshold else 1
+
+        if repeat > scale_threshold:
+            logger.info(f"Scaling enabled: actual_repeat={actual_repeat}, scale_factor={scale_factor}")
+
+        # Tekrarları parçalara böl; parallelism=1 ise tek parça seri olarak çalışır
+        shards = plan_shards(actual_repeat, parallelism)
+        shard_cpus = self._assign_cpus(len(shards)) if pin_cpus else [None] * len(shards)
+
+        # Her parça seçilen enerji backend'inde kendi ölçüm aralığında çalışır
+        logger.info(f"Starting emissions tracking ({energy_backend}, {len(shards)} shard(s))")
+        shard_args = [
+            (cmd, execution_mode, energy, language, first, count, actual_repeat, timeout, cpus, output_mode)
+            for (first, count), cpus in zip(shards, shard_cpus)
+        ]
+        if len(shards) == 1:
+            shard_results = [self._run_shard(*shard_args[0])]
+        else:
+            # İş alt süreçlerde yapıldığı için parçaları thread'lerden başlatmak yeterlidir
+            with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix='codeculate-shard') as pool:
+                shard_results = list(pool.map(lambda args: self._run_shard(*args), shard_args))
+
+        # Parça sonuçlarını tek bir sonuçta birleştir (süre: parçaların süreleri toplamı)
+        combined_output = self._combine(r['output'] for r in shard_results)
+        combined_error = self._combine(r['error'] for r in shard_results)
+        all_successful = all(r['success'] for r in shard_results)
+        execution_time = sum(r['execution_time'] for r in shard_results)
+        emissions = sum(r['emissions'] for r in shard_results)
+        resource_usage = None
+        for r in shard_results:
+            resource_usage = merge_usage(resource_usage, r['resource_usage'])
+        if len(shards) > 1:
+            logger.info(f"Parallel execution completed: {len(shards)} shards, {execution_time:.2f}s, {emissions:.6f}g CO2")
+
+        # Gerekli ise ölçeklendirme yap
+        if repeat > scale_threshold:
+            execution_time *= scale_factor
+            emissions *= scale_factor
+            resource_usage = scale_usage(resource_usage, scale_factor)
+            logger.info(f"Scaled results: {execution_time:.2f}s, {emissions:.6f}g CO2")
+
+        return combined_output, combined_error, all_successful, execution_time, emissions, resource_usage
+
+    ################ Güven aralığı hedefe inene kadar örnek alır ve sonucu istenen tekrara ekstrapole eder ###############
+    def _run_adaptive(self, sampler: AdaptiveSampler, cmd: List[str], execution_mode: str, energy, language: str, repeat: int, timeout: int, output_mode: str = DEFAULT_OUTPUT_MODE) -> Tuple[str, str, bool, float, float, Optional[Dict[str, Any]], Dict[str, Any]]:
+        def run_sample(count: int, first: int) -> Dict[str, Any]:
+            result = self._run_shard(cmd, execution_mode, energy, language, first, count, repeat, timeout, None, output_mode)
+            result['duration'] = result['execution_time']
+            return result
+
+        # Batch/warm modunda süreç başlatma maliyeti örnek başına birden fazla tekrarla paylaştırılır
+        iterations_per_sample = BATCH_SAMPLE_SIZE if execution_mode in LOOP_EXECUTION_MODES else 1
+        sampling = sampler.run(run_sample, repeat, iterations_per_sample)
+        samples = sampling['results']
+
+        resource_usage = None
+        for r in samples:
+            resource_usage = merge_usage(resource_usage, r['resource_usage'])
+
+        # Tekrar başına ortalamalar istenen tekrar sayısına ekstrapole edilir
+        execution_time = sampling['duration_per_iteration'] * repeat
+        emissions = sampling['emissions_per_iteration'] * repeat
+        resource_usage = scale_usage(resource_usage, repeat / sampling['iterations'])
+        logger.info(f"Extrapolated {sampling['iterations']}/{repeat} iterations: {execution_time:.2f}s, {emissions:.6f}g CO2")
+
+        return (
+            self._combine(r['output'] for r in samples),
+            self._combine(r['error'] for r in samples),
+            all(r['success'] for r in samples),
+            execution_time,
+            emissions,
+            resource_usage,
+            summarize_confidence_interval(sampling, sampler.target_relative_error)
+        )
+
+    ################ Tekrarların bir parçasını kendi ölçüm aralığında çalıştırır ###############
+    def _run_shard(self, cmd: List[str], execution_mode: str, energy, language: str, first: int, count: int, total: int, timeout: int, cpus: Optional[Set[int]], output_mode: str = DEFAULT_OUTPUT_MODE) -> Dict[str, Any]:
+        span = energy.begin_span(f"codeculate:{language}:{first}")
+        rolling_emissions = self._rolling_emissions(energy, span) if self.on_event else None
+
+        if execution_mode == 'batch':
+            output, error, success, loop_time, resource_usage = self._run_batched(cmd, count, timeout, first, total, cpus, rolling_emissions, output_mode)
+        elif execution_mode == 'warm':
+            output, error, success, loop_time, resource_usage = self._run_warm(cmd, language, count, timeout, first, total, rolling_emissions, output_mode)
+        else:
+            output, error, success, resource_usage = self._run_iterations(cmd, count, timeout, first, total, cpus, rolling_emissions, output_mode)
+
+        # Aralığı bitir
+        measurement = energy.end_span(span)
+        execution_time = measurement['duration']
+        logger.info(f"Execution completed: {execution_time:.2f}s, {measurement['emissions']:.6f}g CO2")
+
+        # Aralıkta ölçülen emisyonun yalnızca alt süreçlerin CPU süresi payı kadarını bu işe ata;
+        # eş zamanlı istekler, diğer parçalar ve arka plan yükü kullanıcının koduna sayılmaz
+        cpu_seconds = usage_cpu_seconds(resource_usage)
+        emissions = attribute_emissions(measurement, cpu_seconds)
+        if cpu_seconds is not None:
+            logger.info(f"CPU attribution: {cpu_seconds:.3f}s of {measurement['cpu_seconds']:.3f}s, {emissions:.6f}g CO2")
+
+        # Batch/warm modunda süreç başlatma maliyetini çıkar: süre olarak tekrarların toplamını al,
+        # emisyonu da tekrarların toplam süredeki payı kadar ata
+        if execution_mode in LOOP_EXECUTION_MODES:
+            if execution_time > 0:
+                emissions *= min(1.0, loop_time / execution_time)
+            execution_time = loop_time
+            logger.info(f"{execution_mode.capitalize()} loop share: {execution_time:.2f}s, {emissions:.6f}g CO2")
+
+        return {
+            'output': output,
+            'error': error,
+            'success': success,
+            'execution_time': execution_time,
+            'emissions': emissions,
+            'resource_usage': resource_usage
         }
 
+    ################ Parçaları kullanılabilir CPU'lara sırayla dağıtır ###############
+    def _assign_cpus(self, shard_count: int) -> List[Optional[Set[int]]]:
+        if not is_pinning_supported():
+            logger.warning("CPU pinning is not supported on this platform, running shards unpinned")
+            return [None] * shard_count
+        cpus = available_cpus()
+        return [{cpus[i % len(cpus)]} for i in range(shard_count)]
+
+    ################ Her tekrar için kodu ayrı bir süreçte çalıştırır ###############
+    def _run_iterations(self, cmd: List[str], actual_repeat: int, timeout: int, first: int = 0, total: Optional[int] = None, cpus: Optional[Set[int]] = None, rolling_emissions: Optional[Callable[[], float]] = None, output_mode: str = DEFAULT_OUTPUT_MODE) -> Tuple[str, str, bool, Optional[Dict[str, Any]]]:
+        combined_output = OutputRingBuffer()
+        combined_error = OutputRingBuffer()
+        all_successful = True
+        resource_usage = None
+        # Parça çalıştırmalarında tekrarlar tüm tekrarlar içindeki sırasıyla numaralandırılır
+        total = total or actual_repeat
+
+        for i in range(first, first + actual_repeat):
+            logger.debug(f"Running iteration {i+1}/{total}")
+            started_at = time.perf_counter()
+            exit_code = None
+            try:
+                result, usage = run_process(cmd, timeout=timeout, cpus=cpus, output_mode=output_mode)
+                exit_code = result.returncode
+                success = (result.returncode == 0)
+                stdout = result.stdout
+                stderr = result.stderr
+                
+                if success:
+                    logger.debug(f"Iteration {i+1} completed successfully")
+                else:
+                    logger.warning(f"Iteration {i+1} failed with error: {stderr}")
+                    
+            except subprocess.TimeoutExpired as e:
+                logger.error(f"Iteration {i+1} timed out after {timeout} seconds")
+                success = False
+                stdout = ""
+                stderr = f"Execution timeout ({timeout} seconds)"
+                usage = getattr(e, 'resource_usage', None)
+
+            # Çıktı sonuçlarını ve kaynak kullanımını alma
+            resource_usage = merge_usage(resource_usage, usage)
+            if not success:
+                all_successful = False
+            combined_output.write(f"=== Run {i+1}/{total} ===\n{stdout}\n")
+            if stderr:
+                combined_error.write(f"=== Run {i+1}/{total} Error ===\n{stderr}\n")
+            if self.on_event:
+                self._emit_iteration(i, total, exit_code, time.perf_counter() - started_at, stdout, stderr, rolling_emissions)
+            if "Execution timeout" in stderr:
+                logger.warning("Stopping execution due to timeout")
+                break
+
+        return combined_output.getvalue(), combined_error.getvalue(), all_successful, resource_usage
+
+    ################ Kodu batch sürücüsü ile tek süreçte N kez çalıştırır ###############
+    def _run_batched(self, cmd: List[str], actual_repeat: int, timeout: int, first: int = 0, total: Optional[int] = None, cpus: Optional[Set[int]] = None, rolling_emissions: Optional[Callable[[], float]] = None, output_mode: str = DEFAULT_OUTPUT_MODE) -> Tuple[str, str, bool, float, Optional[Dict[str, Any]]]:
+        logger.debug(f"Running {actual_repeat} iterations in a single batch process")
+        env = dict(os.environ)
+        env[ITERATIONS_ENV] = str(actual_repeat)
+        batch_timeout = min(timeout * actual_repeat, MAX_LOOP_TIMEOUT_SECONDS)
+
+        # Tekrar kayıtları stderr okunurken ayıklanır; olaylar her kayıt geldiğinde gönderilir
+        on_record = None
+        if self.on_event:
+            on_record = lambda r: self._emit_iteration(first + r['iteration'], total or actual_repeat, r['exit_code'], r['duration_ns'] / 1e9, '', '', rolling_emissions)
+        record_filter = HarnessRecordFilter(on_record)
+
+        try:
+            result, resource_usage = run_process(cmd, timeout=batch_timeout, env=env, cpus=cpus, output_mode=output_mode, stderr_filter=record_filter, iteration_timeout=timeout)
+            stdout = result.stdout
+            stderr = result.stderr
+            success = (result.returncode == 0)
+        except subprocess.TimeoutExpired as e:
+            # Tek bir tekrar timeout'u aşarsa e.timeout tekrar başına süredir
+            logger.error(f"Batch run timed out after {e.timeout} seconds")
+            stdout = e.stdout or ""
+            stderr = e.stderr or ""
+            stderr += f"Execution timeout ({e.timeout} seconds)\n"
+            success = False
+            resource_usage = getattr(e, 'resource_usage', None)
+
+        return self._summarize_records('Batch', record_filter.records, actual_repeat, first, total, stdout, stderr, success, resource_usage)
+
+    ################ Kodu havuzdaki önceden başlatılmış bir dil worker'ında N kez çalıştırır ###############
+    def _run_warm(self, cmd: List[str], language: str, actual_repeat: int, timeout: int, first: int = 0, total: Optional[int] = None, rolling_emissions: Optional[Callable[[], float]] = None, output_mode: str = DEFAULT_OUTPUT_MODE) -> Tuple[str, str, bool, float, Optional[Dict[str, Any]]]:
+        logger.debug(f"Running {actual_repeat} iterations in a warm {language} worker")
+        warm_timeout = min(timeout * actual_repeat, MAX_LOOP_TIMEOUT_SECONDS)
+
+        on_record = None
+        if self.on_event:
+            on_record = lambda r: self._emit_iteration(first + r['iteration'], total or actual_repeat, r['exit_code'], r['duration_ns'] / 1e9, '', '', rolling_emissions)
+
+        records, resource_usage = [], None
+        try:
+            with get_warm_pool().worker(language.lower()) as worker:
+                job = worker.run(cmd[0], actual_repeat, warm_timeout, output_mode=output_mode, on_record=on_record, iteration_timeout=timeout)
+            records, resource_usage = job.records, job.resource_usage
+            stdout = job.captures['stdout'].text()
+            stderr = job.captures['stderr'].text()
+            success = not job.worker_exited
+            if job.worker_exited:
+                stderr += "Warm worker exited during execution\n"
+        except subprocess.TimeoutExpired as e:
+            logger.error(f"Warm run timed out after {e.timeout} seconds")
+            stdout = e.stdout or ""
+            stderr = (e.stderr or "") + f"Execution timeout ({e.timeout} seconds)\n"
+            success = False
+
+        return self._summarize_records('Warm', records, actual_repeat, first, total, stdout, stderr, success, resource_usage)
+
+    ################ Tek süreçte çalışan tekrarların kayıtlarından sonucu oluşturur ###############
+    def _summarize_records(self, kind: str, records: List[Dict[str, Any]], actual_repeat: int, first: int, total: Optional[int], stdout: str, stderr: str, success: bool, resource_usage: Optional[Dict[str, Any]]) -> Tuple[str, str, bool, float, Optional[Dict[str, Any]]]:
+        failed = [r for r in records if r['exit_code'] != 0]
+        if len(records) < actual_repeat:
+            logger.warning(f"{kind} run stopped after {len(records)}/{actual_repeat} iterations")
+            stderr += f"{kind} run stopped after {len(records)}/{actual_repeat} iterations\n"
+            success = False
+        if failed:
+            logger.warning(f"{len(failed)} {kind.lower()} iterations failed")
+            stderr += f"{len(failed)}/{actual_repeat} iterations exited with a non-zero code\n"
+            success = False
+
+        loop_time = sum(r['duration_ns'] for r in records) / 1e9
+        # Parça çalıştırmalarında başlık, parçanın tüm tekrarlar içindeki aralığını gösterir
+        label = f"{kind} run"
+        if total and total != actual_repeat:
+            label = f"{kind} shard {first+1}-{first+actual_repeat}/{total}"
+        combined_output = self._combine([f"=== {label} ({len(records)}/{actual_repeat} iterations) ===\n", stdout, "\n"])
+        combined_error = self._combine([f"=== {label} Error ===\n", stderr, "\n"]) if stderr else ""
+        if self.on_event:
+            self._emit_output(first, 'stdout', stdout)
+            self._emit_output(first, 'stderr', stderr)
+        return combined_output, combined_error, success, loop_time, resource_usage
+
+    ################ Parça veya örnek çıktılarını halka tampon üzerinden birleştirir ###############
+    @staticmethod
+    def _combine(parts) -> str:
+        buffer = OutputRingBuffer()
+        for part in parts:
+            buffer.write(part)
+        return buffer.getvalue()
+
+    ################ Ölçüm aralığının o ana kadarki emisyonunu belirli aralıklarla okuyan fonksiyonu döndürür ###############
+    def _rolling_emissions(self, energy, span) -> Callable[[], float]:
+        # end_span aralığı değiştirmediği için aralık sürerken ara okuma olarak kullanılabilir;
+        # okuma maliyetli olduğundan her tekrarda değil ENERGY_EVENT_INTERVAL'da bir yenilenir
+        state = {'read_at': 0.0, 'emissions': 0.0}
+
+        def read() -> float:
+            now = time.perf_counter()
+            if now - state['read_at'] >= ENERGY_EVENT_INTERVAL:
+                state['emissions'] = energy.end_span(span)['emissions']
+                state['read_at'] = now
+            return state['emissions']
+        return read
+
+    ################ Bir tekrarın ilerleme ve çıktı olaylarını gönderir ###############
+    def _emit_iteration(self, index: int, total: int, exit_code: Optional[int], duration: float, stdout: str, stderr: str, rolling_emissions: Optional[Callable[[], float]]):
+        self._emit('iteration', {
+            'iteration': index + 1,
+            'total': total,
+            'exit_code': exit_code,
+            'duration': duration,
+            # Parçanın ölçüm aralığında o ana kadar ölçülen (CPU payına göre atanmamış) emisyon
+            'rolling_emissions': rolling_emissions() if rolling_emissions else None
+        })
+        self._emit_output(index, 'stdout', stdout)
+        self._emit_output(index, 'stderr', stderr)
+
+    ################ Çıktının ilk OUTPUT_EVENT_LIMIT karakterini olay olarak gönderir ###############
+    def _emit_output(self, index: int, stream: str, text: str):
+        if not text:
+            return
+        self._emit('output', {
+            'iteration': index + 1,
+            'stream': stream,
+            'data': text[:OUTPUT_EVENT_LIMIT],
+            'truncated': len(text) > OUTPUT_EVENT_LIMIT
+        })
+
+    ################ Olayı dinleyiciye iletir; dinleyici hatası çalıştırmayı durdurmaz ###############
+    def _emit(self, event: str, data: Dict[str, Any]):
+        try:
+            self.on_event(event, data)
+        except Exception as e:
+            logger.warning(f"Error delivering {event} event: {str(e)}")
+
+    ################ Önbellekteki adaptive kaydın güven aralığını döndürür ################
+    @staticmethod
+    def _cached_confidence_interval(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if record.get('sampling_mode') != 'adaptive':
+            return None
+        count = record['execution_count']
+        return {
+            'level': CONFIDENCE_LEVEL,
+            'iterations': record['sample_iterations'],
+            'avg_execution_time': interval(record['execution_duration_seconds'] / count, record['avg_duration_ci']),
+            'avg_emissions': interval(record['carbon_per_execution'], record['avg_emission_ci']),
+            'relative_error': record['relative_error'],
+            'target_relative_error': record['target_relative_error']
+        }
+
+    ################ Önbellekteki kaydın kaynak kullanımı kolonlarını döndürür ################
+    @staticmethod
+    def _cached_resource_usage(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Kaynak kullanımı kolonlarından önce kaydedilmiş raporlarda bu bilgi yoktur
+        if record.get('cpu_user_seconds') is None:
+            return None
+        return {field: record[field] for field in RUSAGE_FIELDS}
+
     ################ Kodun çalıştırılabilmesi için run komutunu döndürür ###############
-    def get_run_command(self, file_path: str, language: str) -> Tuple[List[str], str]:
+    def get_run_command(self, file_path: str, language: str, execution_mode: str = 'subprocess') -> Tuple[List[str], str]:
         language = language.lower()
         logger.debug(f"Getting run command for {language} file: {file_path}")
+
+        if execution_mode == 'batch':
+            compile_cmd, run_cmd = prepare_batch_commands(file_path, language)
+            if compile_cmd:
+                return self.compile_code(file_path, language, (compile_cmd, run_cmd), get_harness_source(language))
+            logger.debug(f"Using batch harness command: {run_cmd}")
+            return run_cmd, None
+
+        # Warm modunda worker'a çalıştırılacak hedef gönderilir (java için önce derlenir)
+        if execution_mode == 'warm':
+            if language in COMPILERS:
+                _, error = self.compile_code(file_path, language)
+                if error:
+                    return None, error
+            return [warm_target(file_path, language)], None
         
         if language in COMPILERS:
             return self.compile_code(file_path, language)
@@ -279,16 +762,25 @@ class CodeExecutor:
         return None, f"Unsupported language: {language}"
 
     ################ Compile edilebilen kodu compile eder ###############
-    def compile_code(self, file_path: str, language: str) -> Tuple[List[str], str]:
+    def compile_code(self, file_path: str, language: str, commands: Tuple[List[str], List[str]] = None, extra_source: str = '') -> Tuple[List[str], str]:
         if language not in COMPILERS:
             return None, None
 
-        logger.info(f"Compiling {language} code")
-        compile_cmd, run_cmd = COMPILERS[language](file_path)
+        compile_cmd, run_cmd = commands or COMPILERS[language](file_path)
         logger.debug(f"Compile command: {compile_cmd}")
         logger.debug(f"Run command: {run_cmd}")
 
         try:
+            # Aynı kod daha önce derlendiyse derleme çıktısını önbellekten al
+            cache_key = None
+            if self.build_cache:
+                with open(file_path, 'r', encoding='utf-8') as source_file:
+                    cache_key = self.build_cache.make_key(language, extra_source + source_file.read())
+                if self.build_cache.restore(cache_key, os.path.dirname(file_path)):
+                    logger.info(f"Skipping compilation, using cached {language} build")
+                    return run_cmd, None
+
+            logger.info(f"Compiling {language} code")
             compile_result = subprocess.run(compile_cmd, capture_output=True, text=True)
 
             if compile_result.returncode != 0:
@@ -296,6 +788,8 @@ class CodeExecutor:
                 return None, f"Compilation Error:\n{compile_result.stderr}"
 
             logger.info("Compilation successful")
+            if cache_key:
+                self.build_cache.store(cache_key, language, os.path.dirname(file_path))
             return run_cmd, None
             
         except Exception as e:
@@ -325,8 +819,11 @@ class CodeExecutor:
             temp_dir = os.path.dirname(temp_file)
             logger.debug(f"Cleaning up temporary directory: {temp_dir}")
             
-            for ext in ['.class', '.exe', '']:
-                compiled_file = os.path.join(temp_dir, 'Main' + ext)
+            # İç sınıflar (Main$Inner.class) da dahil tüm derleme çıktılarını sil
+            compiled_files = glob.glob(os.path.join(temp_dir, '*.class'))
+            compiled_files += [os.path.join(temp_dir, 'Main' + ext) for ext in ['.exe', '']]
+            compiled_files += glob.glob(os.path.join(temp_dir, 'GreenculateHarness*'))
+            for compiled_file in compiled_files:
                 if os.path.exists(compiled_file):
                     os.unlink(compiled_file)
                     logger.debug(f"Removed file: {compiled_file}")
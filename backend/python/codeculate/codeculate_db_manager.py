@@ -8,61 +8,193 @@
 
     Özellikler:
     - Veritabanı ve tablo oluşturma
-    - Sistem bilgilerini alma
-    - Benzer kayıt arama
-    - Yeni kayıt ekleme
-    - Database kayıtlarını alma
+    - Sistem bilgilerini alma (süreç genelinde bir kez hesaplanan host bilgisi)
+    - Benzer kayıt arama (normalize edilmiş kodun SHA-256 özeti ve indeks ile)
+    - Yakın kopya kayıt arama (MinHash/LSH benzerlik indeksi ile, bkz. similarity_index.py)
+    - Normalize sonuçlarını arama ve kayıt arasında paylaşan önbellek
+    - Yeni kayıt ekleme (alt süreçlerin kaynak kullanımı dahil)
+    - Database kayıtlarını alma (keyset pagination, kolon seçimi, filtreler, akış)
+    - Eski kayıtlar için özet kolonunu ve benzerlik indeksini arka planda doldurma
+    - Kod metnini ve normalize edilmiş kodu içerik adresli depoda (bkz.
+      common/blob_store.py) bir kez saklama; eski kayıtlar arka planda taşınır
+    - Toplam ve dil/gün bazında emisyon toplamları (her kayıtta artımlı güncellenir)
 """
 
-import sqlite3
 import os
-import platform
-import psutil
-from typing import Dict, Any, List, Optional, Tuple
-from .normalize_and_compare import normalize
+import hashlib
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+from .normalize_and_compare import NormalizationCache, normalization_cache as shared_normalization_cache
+from .process_runner import RUSAGE_FIELDS
+from .similarity_index import (
+    SIMILARITY_TABLE, init_similarity_table, index_report, shingles, jaccard, candidate_condition
+)
+from common.sqlite_pool import SQLiteConnectionPool, ensure_columns
+from common.host_fingerprint import host_fingerprint
+from common.pagination import encode_cursor, decode_cursor, resolve_fields, clamp_page_size
+from common.emission_rollups import (
+    init_rollup_table, apply_rollup, rebuild_rollups, get_totals, get_daily, TOTAL_DIMENSION
+)
+from common.blob_store import init_blob_table, put_blob, resolve_payloads
 from config.logging_config import setup_logger
 
 logger = setup_logger('codeculate_db')
 
+BACKFILL_BATCH_SIZE = 500
+SIMILARITY_CANDIDATE_LIMIT = 50
+STREAM_BATCH_SIZE = 500
+
+# Geçmiş listelerinde varsayılan olarak döndürülmeyen büyük kolonlar
+PAYLOAD_COLUMNS = ('code_text', 'normalized_code')
+INTERNAL_COLUMNS = ('normalized_code_hash', 'code_text_hash')
+
+# Payload kolonlarının depodaki içeriğe başvuran özet kolonları
+PAYLOAD_REFERENCES = {'code_text': 'code_text_hash', 'normalized_code': 'normalized_code_hash'}
+
+AGGREGATE_DIMENSIONS = (TOTAL_DIMENSION, 'language')
+
+# Alt süreçlerin kaynak kullanımı kolonları (bkz. process_runner.py)
+RESOURCE_USAGE_COLUMNS = {
+    'cpu_user_seconds': 'REAL',
+    'cpu_system_seconds': 'REAL',
+    'max_rss_kb': 'INTEGER',
+    'voluntary_ctx_switches': 'INTEGER',
+    'involuntary_ctx_switches': 'INTEGER',
+    'minor_page_faults': 'INTEGER',
+    'major_page_faults': 'INTEGER'
+}
+
+# Adaptive örnekleme kolonları; güven aralıkları tekrar başına yarı genişlik olarak saklanır
+SAMPLING_COLUMNS = {
+    'sampling_mode': "TEXT NOT NULL DEFAULT 'fixed'",
+    'sample_iterations': 'INTEGER',
+    'target_relative_error': 'REAL',
+    'relative_error': 'REAL',
+    'avg_duration_ci': 'REAL',
+    'avg_emission_ci': 'REAL'
+}
+
+################ Normalize edilmiş kodun sabit uzunluklu özetini döndürür ################
+def hash_normalized_code(normalized_code: str) -> str:
+    return hashlib.sha256(normalized_code.encode('utf-8')).hexdigest()
+
 ################========== CodeculateDBManager ==========################
 class CodeculateDBManager:
-    def __init__(self, db_path: str = "../data/codeculate-reports.db"):
+    def __init__(self, db_path: str = "../data/codeculate-reports.db", normalization_cache: Optional[NormalizationCache] = None):
         self.db_path = db_path
+        self.pool = SQLiteConnectionPool(db_path)
+        self.normalization_cache = normalization_cache or shared_normalization_cache
         self.init_db()
+        self._load_columns()
+
+        # Eski kayıtların özetlerini ve benzerlik indeksini istekleri bloklamadan arka planda doldur
+        self._backfill_thread = threading.Thread(target=self._backfill, daemon=True)
+        self._backfill_thread.start()
 
     ################ Database'i oluşturur ################
     def init_db(self):
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS execution_reports (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                execution_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                programming_language TEXT NOT NULL,
-                execution_count INTEGER NOT NULL,
-                total_carbon_emission REAL NOT NULL,
-                carbon_per_execution REAL NOT NULL,
-                execution_duration_seconds REAL NOT NULL,
-                cpu_model TEXT,
-                cpu_count INTEGER,
-                total_ram_gb REAL,
-                os_name TEXT,
-                code_text TEXT NOT NULL,
-                normalized_code TEXT NOT NULL,
-                is_scaled BOOLEAN NOT NULL DEFAULT 0,
-                scale_threshold INTEGER NOT NULL DEFAULT 10000
-            )
-            ''')
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS execution_reports (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    execution_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    programming_language TEXT NOT NULL,
+                    execution_count INTEGER NOT NULL,
+                    total_carbon_emission REAL NOT NULL,
+                    carbon_per_execution REAL NOT NULL,
+                    execution_duration_seconds REAL NOT NULL,
+                    cpu_model TEXT,
+                    cpu_count INTEGER,
+                    total_ram_gb REAL,
+                    os_name TEXT,
+                    code_text TEXT NOT NULL,
+                    normalized_code TEXT NOT NULL,
+                    is_scaled BOOLEAN NOT NULL DEFAULT 0,
+                    scale_threshold INTEGER NOT NULL DEFAULT 10000,
+                    execution_mode TEXT NOT NULL DEFAULT 'subprocess',
+                    normalized_code_hash TEXT,
+                    host_id TEXT,
+                    energy_backend TEXT NOT NULL DEFAULT 'codecarbon',
+                    cpu_user_seconds REAL,
+                    cpu_system_seconds REAL,
+                    max_rss_kb INTEGER,
+                    voluntary_ctx_switches INTEGER,
+                    involuntary_ctx_switches INTEGER,
+                    minor_page_faults INTEGER,
+                    major_page_faults INTEGER,
+                    parallelism INTEGER NOT NULL DEFAULT 1,
+                    sampling_mode TEXT NOT NULL DEFAULT 'fixed',
+                    sample_iterations INTEGER,
+                    target_relative_error REAL,
+                    relative_error REAL,
+                    avg_duration_ci REAL,
+                    avg_emission_ci REAL,
+                    code_text_hash TEXT
+                )
+                ''')
+
+                # Eski veritabanlarına sonradan eklenen kolonları ekle
+                ensure_columns(cursor, 'execution_reports', {
+                    'execution_mode': "TEXT NOT NULL DEFAULT 'subprocess'",
+                    'normalized_code_hash': "TEXT",
+                    'host_id': "TEXT",
+                    'energy_backend': "TEXT NOT NULL DEFAULT 'codecarbon'",
+                    **RESOURCE_USAGE_COLUMNS,
+                    'parallelism': "INTEGER NOT NULL DEFAULT 1",
+                    **SAMPLING_COLUMNS,
+                    'code_text_hash': "TEXT"
+                })
+
+                # Benzer kayıt aramasını kapsayan indeks (ORDER BY execution_time dahil).
+                # Makine eşleşmesi artık cpu_model/total_ram_gb yerine host_id ile yapılır.
+                cursor.execute('DROP INDEX IF EXISTS idx_execution_reports_lookup')
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_execution_reports_host_lookup ON execution_reports (
+                    normalized_code_hash,
+                    programming_language,
+                    execution_count,
+                    execution_mode,
+                    host_id,
+                    is_scaled,
+                    execution_time
+                )
+                ''')
+
+                # Geçmiş sayfalama ve dil filtresi için indeksler
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_execution_reports_time
+                ON execution_reports (execution_time, id)
+                ''')
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_execution_reports_language_time
+                ON execution_reports (programming_language, execution_time, id)
+                ''')
 
-            conn.commit()
-            logger.info("Codeculate database initialized successfully")
+                # Yakın kopya araması için benzerlik indeksi (eski kayıtlar arka planda eklenir)
+                init_similarity_table(cursor)
+
+                # Kod metinleri için içerik adresli depo (eski kayıtlar arka planda taşınır)
+                init_blob_table(cursor)
+
+                # Emisyon toplamları tablosu; ilk oluşturulduğunda mevcut kayıtlardan doldurulur
+                if init_rollup_table(cursor):
+                    rebuild_rollups(cursor, [
+                        f'''
+                        SELECT '{dimension}' AS dimension, {key} AS dimension_key,
+                               date(execution_time) AS day,
+                               total_carbon_emission AS emission,
+                               execution_duration_seconds AS duration
+                        FROM execution_reports
+                        ''' for dimension, key in ((TOTAL_DIMENSION, "'all'"), ('language', 'programming_language'))
+                    ])
+
+                logger.info("Codeculate database initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing database: {str(e)}")
             raise
-        finally:
-            conn.close()
 
     ################ Execution raporunu veritabanına kaydeder ################
     def save_report(
@@ -73,60 +205,115 @@ class CodeculateDBManager:
         execution_duration: float,
         code_text: str,
         is_scaled: bool = False,
-        scale_threshold: int = 10000
+        scale_threshold: int = 10000,
+        execution_mode: str = 'subprocess',
+        normalized_code: Optional[str] = None,
+        energy_backend: str = 'codecarbon',
+        resource_usage: Optional[Dict[str, Any]] = None,
+        parallelism: int = 1,
+        confidence_interval: Optional[Dict[str, Any]] = None
     ) -> int:
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            sys_info = self._get_system_info()
-
-            # Çalıştırma başına emisyonu hesapla
-            carbon_per_execution = total_carbon_emission / execution_count if execution_count > 0 else 0
-
-            # Verileri database'e kaydet
-            cursor.execute('''
-            INSERT INTO execution_reports (
-                programming_language,
-                execution_count,
-                total_carbon_emission,
-                carbon_per_execution,
-                execution_duration_seconds,
-                cpu_model,
-                cpu_count,
-                total_ram_gb,
-                os_name,
-                code_text,
-                normalized_code,
-                is_scaled,
-                scale_threshold
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                programming_language,
-                execution_count,
-                total_carbon_emission,
-                carbon_per_execution,
-                execution_duration,
-                sys_info.get('cpu_model'),
-                sys_info.get('cpu_count'),
-                sys_info.get('total_ram_gb'),
-                sys_info.get('os_name'),
-                code_text,
-                normalize(code_text, programming_language),
-                is_scaled,
-                scale_threshold
-            ))
-
-            conn.commit()
-            report_id = cursor.lastrowid
-            logger.info(f"Saved execution report with ID: {report_id}")
-            return report_id
+            # Çağıran normalize edilmiş kodu verdiyse tekrar normalize etme
+            if normalized_code is None:
+                normalized_code = self.normalize_code(code_text, programming_language)
+
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+
+                sys_info = self._get_system_info()
+
+                # Çalıştırma başına emisyonu hesapla
+                carbon_per_execution = total_carbon_emission / execution_count if execution_count > 0 else 0
+
+                # Kaynak kullanımı alınamadıysa (ör. Windows) kolonlar boş kalır
+                usage = resource_usage or {}
+                sampling = self._sampling_values(confidence_interval)
+
+                # Kod metinleri depoda bir kez saklanır; rapor satırı özetleriyle başvurur
+                code_text_hash = put_blob(cursor, code_text)
+                normalized_code_hash = put_blob(cursor, normalized_code)
+
+                # Verileri database'e kaydet
+                cursor.execute('''
+                INSERT INTO execution_reports (
+                    programming_language,
+                    execution_count,
+                    total_carbon_emission,
+                    carbon_per_execution,
+                    execution_duration_seconds,
+                    cpu_model,
+                    cpu_count,
+                    total_ram_gb,
+                    os_name,
+                    code_text,
+                    normalized_code,
+                    normalized_code_hash,
+                    is_scaled,
+                    scale_threshold,
+                    execution_mode,
+                    host_id,
+                    energy_backend,
+                    cpu_user_seconds,
+                    cpu_system_seconds,
+                    max_rss_kb,
+                    voluntary_ctx_switches,
+                    involuntary_ctx_switches,
+                    minor_page_faults,
+                    major_page_faults,
+                    parallelism,
+                    sampling_mode,
+                    sample_iterations,
+                    target_relative_error,
+                    relative_error,
+                    avg_duration_ci,
+                    avg_emission_ci,
+                    code_text_hash
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    programming_language,
+                    execution_count,
+                    total_carbon_emission,
+                    carbon_per_execution,
+                    execution_duration,
+                    sys_info.get('cpu_model'),
+                    sys_info.get('cpu_count'),
+                    sys_info.get('total_ram_gb'),
+                    sys_info.get('os_name'),
+                    '',
+                    '',
+                    normalized_code_hash,
+                    is_scaled,
+                    scale_threshold,
+                    execution_mode,
+                    sys_info.get('host_id'),
+                    energy_backend,
+                    *(usage.get(field) for field in RUSAGE_FIELDS),
+                    parallelism,
+                    *(sampling[column] for column in SAMPLING_COLUMNS),
+                    code_text_hash
+                ))
+
+                report_id = cursor.lastrowid
+                index_report(cursor, report_id, normalized_code)
+
+                # Toplamları aynı transaction içinde güncelle
+                cursor.execute('SELECT date(execution_time) FROM execution_reports WHERE id = ?', (report_id,))
+                apply_rollup(cursor, cursor.fetchone()[0], {
+                    (TOTAL_DIMENSION, 'all'): (total_carbon_emission, execution_duration),
+                    ('language', programming_language): (total_carbon_emission, execution_duration)
+                })
+
+                logger.info(f"Saved execution report with ID: {report_id}")
+                return report_id
 
         except Exception as e:
             logger.error(f"Error saving execution report: {str(e)}")
             raise
-        finally:
-            conn.close()
+
+    ################ Kodu önbellek üzerinden normalize eder ################
+    def normalize_code(self, code: str, language: str) -> str:
+        return self.normalization_cache.normalize(code, language)
 
     ################ Benzer execution kaydı olup olmadığını kontrol eder ################
     def get_existing_report(
@@ -134,96 +321,433 @@ class CodeculateDBManager:
         code: str,
         language: str,
         execution_count: int,
-        scale_threshold: int = 10000
+        scale_threshold: int = 10000,
+        execution_mode: str = 'subprocess',
+        normalized_code: Optional[str] = None,
+        energy_backend: str = 'codecarbon',
+        parallelism: int = 1,
+        sampling_mode: str = 'fixed',
+        target_relative_error: Optional[float] = None
     ) -> Tuple[bool, Optional[Dict[str, Any]]]:
-        sys_info = self._get_system_info()
-
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-        
-            normalized_new_code = normalize(code, language)
+            if normalized_code is None:
+                normalized_code = self.normalize_code(code, language)
+            normalized_hash = hash_normalized_code(normalized_code)
+
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
             
-            if execution_count <= scale_threshold:
-                query = '''
+                conditions, params = self._match_conditions(
+                    language, execution_count, scale_threshold, execution_mode,
+                    energy_backend, parallelism, sampling_mode, target_relative_error
+                )
+                query = f'''
                 SELECT * FROM execution_reports 
-                WHERE programming_language = ?
-                AND execution_count = ?
-                AND cpu_model = ?
-                AND total_ram_gb = ?
-                AND normalized_code = ?
-                AND is_scaled = 0
+                WHERE normalized_code_hash = ?
+                AND {' AND '.join(conditions)}
                 ORDER BY execution_time DESC
                 LIMIT 1
                 '''
-                params = [language, execution_count, sys_info['cpu_model'], sys_info['total_ram_gb'], normalized_new_code]
-            else:
-                query = '''
-                SELECT * FROM execution_reports 
-                WHERE programming_language = ?
-                AND execution_count = ?
-                AND cpu_model = ?
-                AND total_ram_gb = ?
-                AND normalized_code = ?
-                AND is_scaled = 1
-                AND scale_threshold = ?
-                ORDER BY execution_time DESC
-                LIMIT 1
-                '''
-                params = [language, execution_count, sys_info['cpu_model'], sys_info['total_ram_gb'], normalized_new_code, scale_threshold]
+                params = [normalized_hash] + params
+
+                # Payload kolonları depodan çözülmez; önbellek sonucu için gerekmez
+                cursor.execute(query, params)
+                row = cursor.fetchone()
+
+                if row:
+                    columns = [desc[0] for desc in cursor.description]
+                    result = dict(zip(columns, row))
+                    logger.info(f"Found existing report for {language} code with {execution_count} executions")
+                    return True, result
+
+                logger.info(f"No existing report found for {language} code with {execution_count} executions")
+                return False, None
+
+        except Exception as e:
+            logger.error(f"Error checking similar execution: {str(e)}")
+            return False, None
 
-            cursor.execute(query, params)
-            row = cursor.fetchone()
+    ################ Önbellek aramasının kimliğini döndürür (eş zamanlı aynı istekleri birleştirmek için) ################
+    def cache_key(
+        self,
+        normalized_code: str,
+        language: str,
+        execution_count: int,
+        scale_threshold: int,
+        execution_mode: str,
+        energy_backend: str,
+        parallelism: int,
+        sampling_mode: str,
+        target_relative_error: Optional[float]
+    ) -> Tuple[Any, ...]:
+        conditions, params = self._match_conditions(
+            language, execution_count, scale_threshold, execution_mode,
+            energy_backend, parallelism, sampling_mode, target_relative_error
+        )
+        return (self.db_path, hash_normalized_code(normalized_code), *conditions, *params)
+
+    ################ Eşiğin üzerinde benzerliğe sahip en yakın kaydı arar ################
+    def find_similar_report(
+        self,
+        code: str,
+        language: str,
+        execution_count: int,
+        similarity_threshold: float,
+        scale_threshold: int = 10000,
+        execution_mode: str = 'subprocess',
+        normalized_code: Optional[str] = None,
+        energy_backend: str = 'codecarbon',
+        parallelism: int = 1,
+        sampling_mode: str = 'fixed',
+        target_relative_error: Optional[float] = None
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        try:
+            if normalized_code is None:
+                normalized_code = self.normalize_code(code, language)
+            query_shingles = shingles(normalized_code)
+
+            # Adaylar LSH kovalarından, eşleşme koşulları birebir aramayla aynı
+            candidates, candidate_params = candidate_condition(query_shingles)
+            conditions, params = self._match_conditions(
+                language, execution_count, scale_threshold, execution_mode,
+                energy_backend, parallelism, sampling_mode, target_relative_error
+            )
 
-            if row:
+            with self.pool.connection() as conn:
+                cursor = conn.execute(f'''
+                SELECT * FROM execution_reports
+                WHERE {candidates}
+                AND {' AND '.join(conditions)}
+                ORDER BY execution_time DESC
+                LIMIT ?
+                ''', candidate_params + params + [SIMILARITY_CANDIDATE_LIMIT])
                 columns = [desc[0] for desc in cursor.description]
-                result = dict(zip(columns, row))
-                logger.info(f"Found existing report for {language} code with {execution_count} executions")
-                return True, result
+                rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                # Aynı normalize kodu paylaşan adaylar depodan tek seferde okunur
+                resolve_payloads(conn, rows, {'normalized_code': 'normalized_code_hash'})
+
+            # Adayların kesin benzerliğini hesapla; eşitlikte en yeni kayıt seçilir
+            best, best_score = None, similarity_threshold
+            for record in rows:
+                score = jaccard(query_shingles, shingles(record['normalized_code']))
+                if score >= best_score and (best is None or score > best['similarity']):
+                    best, best_score = record, score
+                    best['similarity'] = score
 
-            logger.info(f"No existing report found for {language} code with {execution_count} executions")
+            if best:
+                logger.info(f"Found similar report {best['id']} for {language} code (similarity: {best['similarity']:.3f}, {len(rows)} candidates)")
+                return True, best
+
+            logger.info(f"No similar report above {similarity_threshold} for {language} code ({len(rows)} candidates)")
             return False, None
 
         except Exception as e:
-            logger.error(f"Error checking similar execution: {str(e)}")
+            logger.error(f"Error searching similar reports: {str(e)}")
             return False, None
-        finally:
-            conn.close()
+
+    ################ Benzer kayıt aramalarında ortak olan eşleşme koşullarını döndürür ################
+    def _match_conditions(
+        self,
+        language: str,
+        execution_count: int,
+        scale_threshold: int,
+        execution_mode: str,
+        energy_backend: str,
+        parallelism: int,
+        sampling_mode: str,
+        target_relative_error: Optional[float]
+    ) -> Tuple[List[str], List[Any]]:
+        conditions = [
+            'programming_language = ?',
+            'execution_count = ?',
+            'execution_mode = ?',
+            'host_id = ?',
+            'energy_backend = ?',
+            'parallelism = ?'
+        ]
+        params = [language, execution_count, execution_mode, self._get_system_info()['host_id'], energy_backend, parallelism]
+
+        if sampling_mode == 'adaptive':
+            # Adaptive kayıtlar ölçeklendirme eşiğinden bağımsızdır; aynı veya daha
+            # sıkı hedefle ölçülmüş bir kayıt istenen hedefi de karşılar
+            conditions += ["sampling_mode = 'adaptive'", 'target_relative_error <= ?']
+            params.append(target_relative_error)
+        elif execution_count <= scale_threshold:
+            conditions += ["sampling_mode = 'fixed'", 'is_scaled = 0']
+        else:
+            conditions += ["sampling_mode = 'fixed'", 'is_scaled = 1', 'scale_threshold = ?']
+            params.append(scale_threshold)
+        return conditions, params
 
     ################ Database Kayıtlarını Döndürür ################
     def get_reports(self) -> List[Dict[str, Any]]:
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute(f'''
-            SELECT * FROM execution_reports
-            ORDER BY execution_time DESC
-            ''')
+                cursor.execute(f'''
+                SELECT * FROM execution_reports
+                ORDER BY execution_time DESC
+                ''')
 
-            columns = [desc[0] for desc in cursor.description]
-            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                columns = [desc[0] for desc in cursor.description]
+                results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                resolve_payloads(conn, results, PAYLOAD_REFERENCES)
             
-            logger.info(f"Retrieved {len(results)} execution reports")
-            return results
+                logger.info(f"Retrieved {len(results)} execution reports")
+                return results
 
         except Exception as e:
             logger.error(f"Error getting execution reports: {str(e)}")
             return []
-        finally:
-            conn.close()
 
-    ################ Sistem bilgilerini alır ################
-    def _get_system_info(self) -> Dict[str, Any]:
-        try:
-            info = {
-                'cpu_model': platform.processor() or 'Unknown',
-                'cpu_count': psutil.cpu_count(),
-                'total_ram_gb': round(psutil.virtual_memory().total / (1024 ** 3), 2),
-                'os_name': f"{platform.system()} {platform.release()}"
+    ################ Tüm kayıtların toplam emisyonunu döndürür ################
+    def get_total_emission(self) -> float:
+        with self.pool.connection() as conn:
+            totals = get_totals(conn, TOTAL_DIMENSION)
+        return totals[0]['emission'] if totals else 0
+
+    ################ Emisyon toplamlarını ve günlük dağılımını döndürür ################
+    def get_aggregates(
+        self,
+        group_by: str = 'language',
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if group_by not in AGGREGATE_DIMENSIONS:
+            raise ValueError(f"Unsupported group_by: {group_by}. Supported: {', '.join(AGGREGATE_DIMENSIONS)}")
+
+        with self.pool.connection() as conn:
+            return {
+                'group_by': group_by,
+                'totals': get_totals(conn, group_by),
+                'daily': get_daily(conn, group_by, since, until)
             }
-            logger.debug(f"Retrieved system info: {info}")
-            return info
+
+    ################ Geçmiş kayıtlarından bir sayfa döndürür ################
+    def get_reports_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        language: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        scaled: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        page_size = clamp_page_size(limit)
+        # Sonraki sayfa olup olmadığını anlamak için bir kayıt fazla çek
+        rows = list(self.iter_reports(fields, language, since, until, scaled, cursor, page_size + 1))
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor([rows[-1]['execution_time'], rows[-1]['id']])
+
+        logger.info(f"Retrieved page of {len(rows)} execution reports")
+        return {'items': rows, 'next_cursor': next_cursor}
+
+    ################ Geçmiş kayıtlarını tek tek üreten bir iterator döndürür ################
+    def iter_reports(
+        self,
+        fields: Optional[str] = None,
+        language: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        scaled: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        # Kolon ve imleç hataları akış başlamadan ValueError olarak fırlatılır
+        columns = resolve_fields(fields, self._columns, self._summary_columns)
+        columns = list(dict.fromkeys(['id', 'execution_time'] + columns))
+
+        where, params = [], []
+        if language:
+            where.append('programming_language = ?')
+            params.append(language)
+        if since:
+            where.append('execution_time >= ?')
+            params.append(since)
+        if until:
+            where.append('execution_time < ?')
+            params.append(until)
+        if scaled is not None:
+            where.append('is_scaled = ?')
+            params.append(1 if scaled else 0)
+        if cursor:
+            last_time, last_id = decode_cursor(cursor)
+            where.append('(execution_time < ? OR (execution_time = ? AND id < ?))')
+            params.extend([last_time, last_time, last_id])
+
+        # İstenen payload kolonları depodan çözülür; bunun için özet kolonları da okunur
+        references = {column: PAYLOAD_REFERENCES[column] for column in columns if column in PAYLOAD_REFERENCES}
+        hidden = [column for column in dict.fromkeys(references.values()) if column not in columns]
+
+        return self._stream_rows(columns + hidden, where, params, limit, references, hidden)
+
+    ################ Sorgu sonuçlarını sabit bellekle parça parça okur ################
+    def _stream_rows(
+        self,
+        columns: List[str],
+        where: List[str],
+        params: List[Any],
+        limit: Optional[int] = None,
+        references: Optional[Dict[str, str]] = None,
+        hidden: List[str] = ()
+    ) -> Iterator[Dict[str, Any]]:
+        # Her parça kısa süreli bir bağlantıyla okunur ve bir sonraki parça son kaydın
+        # (execution_time, id) değerinden devam eder; uzun süren bir akış havuzdaki bağlantıyı tutmaz
+        last = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch_size = STREAM_BATCH_SIZE if remaining is None else min(STREAM_BATCH_SIZE, remaining)
+            conditions, batch_params = list(where), list(params)
+            if last is not None:
+                conditions.append('(execution_time < ? OR (execution_time = ? AND id < ?))')
+                batch_params.extend([last[0], last[0], last[1]])
+            query = f"SELECT {', '.join(columns)} FROM execution_reports"
+            if conditions:
+                query += ' WHERE ' + ' AND '.join(conditions)
+            query += ' ORDER BY execution_time DESC, id DESC LIMIT ?'
+            batch_params.append(batch_size)
+
+            with self.pool.connection() as conn:
+                db_cursor = conn.execute(query, batch_params)
+                names = [desc[0] for desc in db_cursor.description]
+                records = [dict(zip(names, row)) for row in db_cursor.fetchall()]
+                if not records:
+                    break
+                if references:
+                    resolve_payloads(conn, records, references)
+
+            last = (records[-1]['execution_time'], records[-1]['id'])
+            for record in records:
+                for column in hidden:
+                    del record[column]
+                yield record
+
+            if len(records) < batch_size:
+                break
+            if remaining is not None:
+                remaining -= len(records)
+
+    ################ Tablo kolonlarını okur ################
+    def _load_columns(self):
+        with self.pool.connection() as conn:
+            self._columns = [row[1] for row in conn.execute("PRAGMA table_info(execution_reports)")]
+        self._summary_columns = [
+            c for c in self._columns if c not in PAYLOAD_COLUMNS and c not in INTERNAL_COLUMNS
+        ]
+
+    ################ Eski kayıtlar için arka plan doldurma işlerini sırayla çalıştırır ################
+    def _backfill(self):
+        self._backfill_code_hashes()
+        self._backfill_payload_blobs()
+        self._backfill_similarity_index()
+
+    ################ Benzerlik indeksinde olmayan eski kayıtları küçük parçalar halinde indeksler ################
+    def _backfill_similarity_index(self, batch_size: int = BACKFILL_BATCH_SIZE):
+        total = 0
+        try:
+            while True:
+                with self.pool.connection() as conn:
+                    db_cursor = conn.execute(f'''
+                    SELECT id, normalized_code, normalized_code_hash FROM execution_reports
+                    WHERE NOT EXISTS (SELECT 1 FROM {SIMILARITY_TABLE} WHERE report_id = execution_reports.id)
+                    LIMIT ?
+                    ''', (batch_size,))
+                    columns = [desc[0] for desc in db_cursor.description]
+                    rows = [dict(zip(columns, row)) for row in db_cursor.fetchall()]
+                    resolve_payloads(conn, rows, {'normalized_code': 'normalized_code_hash'})
+                if not rows:
+                    break
+
+                # Yazma kilidi yalnızca kovalar eklenirken tutulur
+                with self.pool.transaction() as conn:
+                    cursor = conn.cursor()
+                    for row in rows:
+                        index_report(cursor, row['id'], row['normalized_code'])
+                total += len(rows)
+
+            if total:
+                logger.info(f"Added {total} execution reports to the similarity index")
         except Exception as e:
-            logger.error(f"Error getting system info: {str(e)}")
-            return {}
\ No newline at end of file
+            logger.error(f"Error backfilling similarity index: {str(e)}")
+
+    ################ Özeti olmayan eski kayıtları küçük parçalar halinde doldurur ################
+    def _backfill_code_hashes(self, batch_size: int = BACKFILL_BATCH_SIZE):
+        total = 0
+        try:
+            while True:
+                # Her parça kendi transaction'ında yazılır, böylece diğer istekler araya girebilir
+                with self.pool.transaction() as conn:
+                    rows = conn.execute('''
+                    SELECT id, normalized_code FROM execution_reports
+                    WHERE normalized_code_hash IS NULL
+                    LIMIT ?
+                    ''', (batch_size,)).fetchall()
+                    if not rows:
+                        break
+                    conn.executemany(
+                        'UPDATE execution_reports SET normalized_code_hash = ? WHERE id = ?',
+                        [(hash_normalized_code(normalized_code), report_id) for report_id, normalized_code in rows]
+                    )
+                total += len(rows)
+
+            if total:
+                logger.info(f"Backfilled normalized code hash for {total} execution reports")
+        except Exception as e:
+            logger.error(f"Error backfilling normalized code hashes: {str(e)}")
+
+    ################ Kod metinleri satırda saklanan eski kayıtları küçük parçalar halinde depoya taşır ################
+    def _backfill_payload_blobs(self, batch_size: int = BACKFILL_BATCH_SIZE):
+        total, last_id = 0, 0
+        try:
+            while True:
+                # Her parça kendi transaction'ında taşınır; kayıtlar id sırasıyla bir kez taranır
+                with self.pool.transaction() as conn:
+                    rows = conn.execute('''
+                    SELECT id, code_text, normalized_code FROM execution_reports
+                    WHERE id > ? AND code_text_hash IS NULL
+                    ORDER BY id
+                    LIMIT ?
+                    ''', (last_id, batch_size)).fetchall()
+                    if not rows:
+                        break
+                    cursor = conn.cursor()
+                    cursor.executemany(
+                        "UPDATE execution_reports SET code_text = '', normalized_code = '', code_text_hash = ?, normalized_code_hash = ? WHERE id = ?",
+                        [(put_blob(cursor, code_text), put_blob(cursor, normalized_code), report_id) for report_id, code_text, normalized_code in rows]
+                    )
+                last_id = rows[-1][0]
+                total += len(rows)
+
+            if total:
+                logger.info(f"Moved code payloads of {total} execution reports to the blob store (run VACUUM to reclaim disk space)")
+        except Exception as e:
+            logger.error(f"Error moving code payloads to the blob store: {str(e)}")
+
+    ################ Güven aralığı özetini örnekleme kolonlarına çevirir ################
+    def _sampling_values(self, confidence_interval: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not confidence_interval:
+            values = dict.fromkeys(SAMPLING_COLUMNS)
+            values['sampling_mode'] = 'fixed'
+            return values
+
+        def half_width(bounds):
+            return (bounds[1] - bounds[0]) / 2 if bounds else None
+
+        return {
+            'sampling_mode': 'adaptive',
+            'sample_iterations': confidence_interval['iterations'],
+            'target_relative_error': confidence_interval['target_relative_error'],
+            'relative_error': confidence_interval['relative_error'],
+            'avg_duration_ci': half_width(confidence_interval['avg_execution_time']),
+            'avg_emission_ci': half_width(confidence_interval['avg_emissions'])
+        }
+
+    ################ Sistem bilgilerini alır ################
+    def _get_system_info(self) -> Dict[str, Any]:
+        # Bilgiler süreç başına bir kez hesaplanır; host_fingerprint.refresh() ile yenilenir
+        return host_fingerprint.get()
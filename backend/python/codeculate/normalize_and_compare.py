@@ -2,6 +2,7 @@
 Bu dosyanın temel amacı: Kullanıcının yazdığı kodları normalize ederek kod kod karşılaştırma
 mekanizmasını sağlamak.
 
+- Kodu dil bazındaki lexer tablolarıyla tek geçişte token'lara ayırır.
 - Yorumları ve boşlukları atar.
 - String/char/num literal'leri soyutlar.
 - Keyword'leri korur (if, for, while, ...)
@@ -9,13 +10,19 @@ mekanizmasını sağlamak.
 - Diğer tüm tanımlayıcıları (identifier) ilk görüldüğü sıraya göre VAR1, VAR2 ... ile eşler
 - Operatör ve noktalama token'larını korur. (yapıyı yansıtsın diye)
 
+- Normalize sonuçlarını (dil, kod özeti) anahtarıyla sınırlı bir LRU önbellekte tutar.
+
 Kullanım:
     normalize(kod, dil) -> normalize edilmiş kod
+    normalization_cache.normalize(kod, dil) -> önbellekli normalize
     compare_codes(kod1, kod2, dil) -> kod1 ve kod2 aynı mı?
 """
 
 import re
-from typing import List, Dict
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple
 
 KEYWORDS = {
     "python": {
@@ -55,81 +62,153 @@ KEYWORDS = {
     }
 }
 
-def _strip_comments_and_strings(code: str, lang: str) -> str:
-    if lang in {"javascript", "java", "c", "cpp"}:
-        code = re.sub(r"/\*.*?\*/", "", code, flags=re.S)
-        code = re.sub(r"//.*?$", "", code, flags=re.M)
-        if lang == "javascript":
-            code = re.sub(r"`(?:\\.|[^`])*`", "<STR>", code, flags=re.S)
-    if lang == "python":
-        code = re.sub(r"([rubfRUBF]?[']{3})(?:.|\n)*?\1", "<STR>", code)
-        code = re.sub(r'([rubfRUBF]?["]{3})(?:.|\n)*?\1', "<STR>", code)
-        code = re.sub(r"#.*?$", "", code, flags=re.M)
-    code = re.sub(r"'(?:\\.|[^'\\])+'", "<STR>", code)
-    code = re.sub(r'"(?:\\.|[^"\\])+"', "<STR>", code)
-    if lang in {"c", "cpp", "java"}:
-        code = re.sub(r"'(?:\\.|[^'\\])'", "<CHAR>", code)
-    return code
-
-IDENT = re.compile(r"[A-Za-z_]\w*")
-NUMBER = re.compile(r"\b(?:0[xX][0-9A-Fa-f]+|\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\b")
-
-def _tokenize(code: str) -> List[str]:
-    tokens = []
-    i = 0
-    while i < len(code):
-        ch = code[i]
-        if ch.isspace():
-            i += 1
-            continue
-        m_id = IDENT.match(code, i)
-        if m_id:
-            tokens.append(m_id.group(0))
-            i = m_id.end()
-            continue
-        m_num = NUMBER.match(code, i)
-        if m_num:
-            tokens.append(m_num.group(0))
-            i = m_num.end()
-            continue
-        tokens.append(ch)
-        i += 1
-    return tokens
+################ Dil bazında lexer tabloları ################
+# Her dil için yorum ve string desenleri tek bir birleşik regex'te toplanır ve kod
+# tek geçişte token'lara ayrılır. Aynı konumda birden fazla desen eşleşebiliyorsa
+# listedeki ilk desen kazanır (ör. python'da ''' deseni ' deseninden önce gelir).
+# Token türü eşleşen metnin ilk karakterlerinden anlaşılır: yorumlar ve string'ler
+# her zaman birden uzundur, tek karakterlik token'lar ise isim, sayı veya noktalamadır.
+IDENT_PATTERN = r"[A-Za-z_]\w*"
+NUMBER_PATTERN = r"\b(?:0[xX][0-9A-Fa-f]+|\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\b"
+
+_QUOTED_STRINGS = [r"'(?:\\.|[^'\\])+'", r'"(?:\\.|[^"\\])+"']
+_C_COMMENTS = [r"(?s:/\*.*?\*/)", r"//[^\n]*"]
+
+LEXER_RULES = {
+    "python": {
+        "comment_prefixes": ("#",),
+        "quote_chars": "'\"",
+        "patterns": [r"(?s:'''.*?''')", r'(?s:""".*?""")', r"#[^\n]*"] + _QUOTED_STRINGS,
+    },
+    "javascript": {
+        "comment_prefixes": ("//", "/*"),
+        "quote_chars": "'\"`",
+        "patterns": _C_COMMENTS + [r"(?s:`(?:\\.|[^`])*`)"] + _QUOTED_STRINGS,
+    },
+}
+for _lang in ("java", "c", "cpp"):
+    LEXER_RULES[_lang] = {
+        "comment_prefixes": ("//", "/*"),
+        "quote_chars": "'\"",
+        "patterns": _C_COMMENTS + _QUOTED_STRINGS,
+    }
+
+################ Bir dilin desenlerini tek bir regex'e derler ################
+def _compile_lexer(rules: dict) -> "re.Pattern[str]":
+    # İsim ve sayı desenleri yorum/string başlangıçlarıyla çakışmadığı için en başta denenir;
+    # tek karakterlik noktalama (\S) her zaman en sonda kalmalıdır
+    alternatives = [IDENT_PATTERN, NUMBER_PATTERN] + rules["patterns"] + [r"\S"]
+    return re.compile("|".join(f"(?:{pattern})" for pattern in alternatives))
+
+LEXERS = {lang: _compile_lexer(rules) for lang, rules in LEXER_RULES.items()}
+
+STR_TOKEN = "< STR >"
+IDENT_START = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")
+# Çevresinde boşluk bırakılmayan token'lar
+TIGHT_TOKENS = frozenset("();,{}[]")
+
+################ Kodu tek geçişte token listesine çevirir (yorumlar atılır, string'ler <STR> olur) ################
+def _tokenize(code: str, lang: str) -> List[str]:
+    rules = LEXER_RULES[lang]
+    comment_prefixes = rules["comment_prefixes"]
+    quote_chars = rules["quote_chars"]
+    return [
+        STR_TOKEN if len(t) > 1 and t[0] in quote_chars else t
+        for t in LEXERS[lang].findall(code)
+        if not t.startswith(comment_prefixes)
+    ]
 
 def normalize(code: str, lang: str) -> str:
     lang = lang.lower()
     if lang not in KEYWORDS:
         raise ValueError(f"Desteklenmeyen dil: {lang}")
-    cleaned = _strip_comments_and_strings(code, lang)
-    tokens = _tokenize(cleaned)
+    tokens = _tokenize(code, lang)
     kw = KEYWORDS[lang]
     id_map: Dict[str, str] = {}
-    next_id = 1
-    norm_tokens: List[str] = []
-    for i, t in enumerate(tokens):
-        if IDENT.fullmatch(t):
-            if t in kw:
-                norm_tokens.append(t)
-            elif i + 1 < len(tokens) and tokens[i+1] == "(":
-                norm_tokens.append(t)
-            elif i > 0 and tokens[i-1] == "." and i + 1 < len(tokens) and tokens[i+1] == "(":
-                norm_tokens.append(t)
-            elif t.isupper():
-                norm_tokens.append(t)
-            else:
-                if t not in id_map:
-                    id_map[t] = f"VAR{next_id}"
-                    next_id += 1
-                norm_tokens.append(id_map[t])
-        elif NUMBER.fullmatch(t):
-            norm_tokens.append(t)
-        else:
-            norm_tokens.append(t)
-    norm_str = " ".join(norm_tokens)
-    norm_str = re.sub(r"\s+([();,{}\[\]])", r"\1", norm_str)
-    norm_str = re.sub(r"([();,{}\[\]])\s+", r"\1", norm_str)
-    norm_str = re.sub(r"\s{2,}", " ", norm_str).strip()
-    return norm_str
+    parts: List[str] = []
+    prev_tight = True
+    for t, next_t in zip(tokens, tokens[1:] + [None]):
+        # Keyword'ler, çağrılan isimler (ardından "(" gelen) ve BÜYÜK_HARF isimler korunur
+        if t[0] in IDENT_START and next_t != "(" and t not in kw and not t.isupper():
+            if t not in id_map:
+                id_map[t] = f"VAR{len(id_map) + 1}"
+            t = id_map[t]
+        # Token'lar tek boşlukla birleştirilir, parantez ve ayraçların çevresinde boşluk olmaz
+        tight = t in TIGHT_TOKENS
+        if not prev_tight and not tight:
+            parts.append(" ")
+        parts.append(t)
+        prev_tight = tight
+    return "".join(parts)
 
 def compare_codes(code1: str, code2: str, lang: str) -> bool:
-    return normalize(code1, lang) == normalize(code2, lang)
\ No newline at end of file
+    return normalize(code1, lang) == normalize(code2, lang)
+
+################ Normalize önbelleği sınırları ################
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+################========== NormalizationCache ==========################
+class NormalizationCache:
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    ################ Kodu normalize eder; aynı kod daha önce normalize edildiyse önbellekten döndürür ################
+    def normalize(self, code: str, lang: str) -> str:
+        lang = lang.lower()
+        key = (lang, hashlib.sha256(code.encode("utf-8")).hexdigest())
+
+        with self._lock:
+            normalized = self._entries.get(key)
+            if normalized is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return normalized
+            self.misses += 1
+
+        # Normalize işlemi kilit dışında yapılır, böylece diğer istekler beklemez
+        normalized = normalize(code, lang)
+        size = len(normalized)  # Karakter sayısı; normalize çıktısı çoğunlukla ASCII olduğu için byte'a eşittir
+        if size > self.max_bytes:
+            return normalized
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = normalized
+                self._bytes += size
+                self._evict()
+        return normalized
+
+    ################ Sınırlar aşıldıysa en az kullanılan kayıtları siler ################
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, normalized = self._entries.popitem(last=False)
+            self._bytes -= len(normalized)
+            self.evictions += 1
+
+    ################ Önbellek istatistiklerini döndürür ################
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    ################ Önbelleği boşaltır ################
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+# Süreç içindeki tüm database yöneticilerinin ortak kullandığı önbellek
+normalization_cache = NormalizationCache()
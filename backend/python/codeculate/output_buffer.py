@@ -0,0 +1,67 @@
+"""
+    OutputBuffer
+    =================================================================
+    Çalıştırma çıktısını sabit bellekle toplayan halka tampondur (ring
+    buffer). Çıktının yalnızca ilk head_size ve son tail_size karakteri
+    tutulur; aradaki kısım atılır ve yerine kaç karakter atıldığını
+    belirten bir işaret konur. Çok sayıda tekrarın çıktısı string
+    birleştirme ile büyütülmediği için süre doğrusal, bellek sabittir.
+"""
+
+from collections import deque
+from typing import Deque, List
+
+DEFAULT_HEAD_SIZE = 32 * 1024
+DEFAULT_TAIL_SIZE = 32 * 1024
+
+TRUNCATION_MARKER = "\n... [{count} characters truncated] ...\n"
+
+################========== OutputRingBuffer ==========################
+class OutputRingBuffer:
+    def __init__(self, head_size: int = DEFAULT_HEAD_SIZE, tail_size: int = DEFAULT_TAIL_SIZE):
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self._head: List[str] = []
+        self._head_length = 0
+        self._tail: Deque[str] = deque()
+        self._tail_length = 0
+        self.total_length = 0
+
+    ################ Metni tampona ekler ################
+    def write(self, text: str):
+        if not text:
+            return
+        self.total_length += len(text)
+
+        # Önce baş kısım doldurulur, kalan kısım kuyruğa eklenir
+        if self._head_length < self.head_size:
+            part = text[:self.head_size - self._head_length]
+            self._head.append(part)
+            self._head_length += len(part)
+            text = text[len(part):]
+            if not text:
+                return
+
+        # Kuyruktan uzun parçaların yalnızca sonu tutulur
+        if len(text) > self.tail_size:
+            text = text[len(text) - self.tail_size:]
+        self._tail.append(text)
+        self._tail_length += len(text)
+        # Kuyrukta yalnızca son tail_size karakteri tutacak kadar parça bırakılır
+        while self._tail and self._tail_length - len(self._tail[0]) >= self.tail_size:
+            self._tail_length -= len(self._tail.popleft())
+
+    ################ Atılan karakter sayısını döndürür ################
+    @property
+    def truncated(self) -> int:
+        return max(0, self.total_length - self._head_length - min(self._tail_length, self.tail_size))
+
+    ################ Tutulan çıktıyı tek bir metin olarak döndürür ################
+    def getvalue(self) -> str:
+        head = ''.join(self._head)
+        tail = ''.join(self._tail)
+        if len(tail) > self.tail_size:
+            tail = tail[len(tail) - self.tail_size:]
+        if self.truncated:
+            return head + TRUNCATION_MARKER.format(count=self.truncated) + tail
+        return head + tail
@@ -0,0 +1,351 @@
+"""
+    ProcessRunner
+    =================================================================
+    Codeculate'in kullanıcı kodunu çalıştırdığı alt süreçleri başlatan ve
+    her alt sürecin kaynak kullanımını (rusage) toplayan yardımcılardır.
+    Kaynak kullanımı, alt süreç beklenirken os.wait4 ile doğrudan o sürece
+    ait olarak alınır. resource.getrusage(RUSAGE_CHILDREN) süreç genelinde
+    birikir ve eş zamanlı çalıştırmaların değerlerini birbirine karıştırır;
+    bu yüzden kullanılmaz.
+
+    Toplanan değerler (alt sürecin beklediği torunlar dahil):
+    - cpu_user_seconds / cpu_system_seconds: Kullanıcı ve çekirdek CPU süresi
+    - max_rss_kb: En yüksek bellek kullanımı (tekrarlar arasında en büyüğü)
+    - voluntary_ctx_switches / involuntary_ctx_switches: Bağlam değişimleri
+    - minor_page_faults / major_page_faults: Sayfa hataları
+
+    os.wait4 olmayan platformlarda (Windows) kaynak kullanımı None döner.
+
+    Paralel çalıştırma için tekrarları parçalara (shard) bölen ve alt
+    süreçleri os.sched_setaffinity ile belirli CPU'lara sabitleyen
+    yardımcılar da buradadır.
+
+    Tekrar kayıtları yazan sürücülerle (batch) çalışırken toplam zaman
+    aşımına ek olarak tekrar başına zaman aşımı da verilebilir: stderr
+    filtresi iteration_timeout saniye boyunca yeni kayıt görmezse süreç
+    sonlandırılır.
+
+    POSIX'te alt süreç kendi süreç grubunda başlatılır. Zaman aşımında ya da
+    süreç bittiği halde başlattığı arka plan süreçleri pipe'ları açık
+    tuttuğunda (ör. "sleep 100 &") tüm grup sonlandırılır; okuyucular en fazla
+    kalan süre kadar beklenir.
+
+    Alt süreç çıktısı pipe'lardan parça parça okunur ve akış başına en fazla
+    output_limit byte bellekte tutulur. Sınırı aşan kısım için modlar:
+    - truncate: Atılır; çıktının sonuna kaç byte atıldığı yazılır
+    - spill: SPILL_DIR altında geçici bir dosyaya yazılır; çıktının sonuna
+      dosyanın yolu yazılır (dosyalar SPILL_RETENTION_SECONDS sonra silinir)
+    - discard: Sadece ölçüm; çıktı hiç okunmaz, pipe'lar yerine /dev/null
+      kullanılır ve pipe boşaltma maliyeti ölçüme karışmaz
+"""
+
+import os
+import sys
+import time
+import signal
+import tempfile
+import threading
+import subprocess
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+RUSAGE_FIELDS = (
+    'cpu_user_seconds',
+    'cpu_system_seconds',
+    'max_rss_kb',
+    'voluntary_ctx_switches',
+    'involuntary_ctx_switches',
+    'minor_page_faults',
+    'major_page_faults'
+)
+
+# Tekrarlar arasında toplanmayan, en büyüğü alınan alanlar
+PEAK_FIELDS = ('max_rss_kb',)
+
+# macOS ru_maxrss değerini byte, Linux kilobyte olarak verir
+MAXRSS_DIVISOR = 1024 if sys.platform == 'darwin' else 1
+
+OUTPUT_MODES = ('truncate', 'spill', 'discard')
+DEFAULT_OUTPUT_MODE = 'truncate'
+DEFAULT_OUTPUT_LIMIT_BYTES = 64 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+SPILL_DIR = os.path.join(tempfile.gettempdir(), 'greenculate-output')
+SPILL_RETENTION_SECONDS = 24 * 60 * 60
+
+# Zaman aşımında sonlandırılan sürecin pipe'larını açık tutan torunlar için okuyucu bekleme sınırı
+READER_JOIN_TIMEOUT_SECONDS = 5
+
+################ os.wait4 sonucunu sözlüğe çevirir ################
+def rusage_to_dict(rusage) -> Dict[str, Any]:
+    return {
+        'cpu_user_seconds': rusage.ru_utime,
+        'cpu_system_seconds': rusage.ru_stime,
+        'max_rss_kb': rusage.ru_maxrss // MAXRSS_DIVISOR,
+        'voluntary_ctx_switches': rusage.ru_nvcsw,
+        'involuntary_ctx_switches': rusage.ru_nivcsw,
+        'minor_page_faults': rusage.ru_minflt,
+        'major_page_faults': rusage.ru_majflt
+    }
+
+################ Bir kaynak kullanımını toplam üzerine ekler (toplam None ise kopyalar) ################
+def merge_usage(total: Optional[Dict[str, Any]], usage: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if usage is None:
+        return total
+    if total is None:
+        return dict(usage)
+    for field in RUSAGE_FIELDS:
+        if field in PEAK_FIELDS:
+            total[field] = max(total[field], usage[field])
+        else:
+            total[field] += usage[field]
+    return total
+
+################ Toplanabilir alanları verilen katsayı ile ölçeklendirir ################
+def scale_usage(usage: Optional[Dict[str, Any]], factor: float) -> Optional[Dict[str, Any]]:
+    if usage is None or factor == 1:
+        return usage
+    scaled = dict(usage)
+    for field in RUSAGE_FIELDS:
+        if field not in PEAK_FIELDS:
+            value = usage[field] * factor
+            # Sayaç alanları tam sayı olarak kalır
+            scaled[field] = value if isinstance(usage[field], float) else round(value)
+    return scaled
+
+################ Toplam (kullanıcı + çekirdek) CPU süresini döndürür ################
+def usage_cpu_seconds(usage: Optional[Dict[str, Any]]) -> Optional[float]:
+    if usage is None:
+        return None
+    return usage['cpu_user_seconds'] + usage['cpu_system_seconds']
+
+################ Bu sürecin kullanabileceği CPU'ları döndürür ################
+def available_cpus() -> List[int]:
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+################ CPU sabitlemenin bu platformda desteklenip desteklenmediğini döndürür ################
+def is_pinning_supported() -> bool:
+    return hasattr(os, 'sched_setaffinity')
+
+################ Tekrarları en fazla verilen sayıda ardışık parçaya böler: [(ilk_tekrar, tekrar_sayısı)] ################
+def plan_shards(total: int, parallelism: int) -> List[Tuple[int, int]]:
+    shard_count = max(1, min(parallelism, total))
+    base, extra = divmod(total, shard_count)
+    shards, first = [], 0
+    for index in range(shard_count):
+        count = base + (1 if index < extra else 0)
+        shards.append((first, count))
+        first += count
+    return shards
+
+################========== RusagePopen ==========################
+class RusagePopen(subprocess.Popen):
+    # Popen alt süreci beklerken os.waitpid çağırır; burada os.wait4 ile değiştirilerek
+    # çıkış durumu ile birlikte sürecin kaynak kullanımı da alınır
+    rusage: Optional[Dict[str, Any]] = None
+
+    if hasattr(os, 'wait4'):
+        def _try_wait(self, wait_flags):
+            try:
+                pid, sts, rusage = os.wait4(self.pid, wait_flags)
+            except ChildProcessError:
+                # SIGCHLD yok sayılıyorsa süreç durumu alınamaz (Popen ile aynı davranış)
+                return self.pid, 0
+            if pid == self.pid:
+                self.rusage = rusage_to_dict(rusage)
+            return pid, sts
+
+################========== ProcessTimeout ==========################
+class ProcessTimeout(subprocess.TimeoutExpired):
+    # Zaman aşımında sonlandırılan sürecin o ana kadarki kaynak kullanımını da taşır
+    def __init__(self, cmd, timeout, output=None, stderr=None, resource_usage: Optional[Dict[str, Any]] = None):
+        super().__init__(cmd, timeout, output=output, stderr=stderr)
+        self.resource_usage = resource_usage
+
+################========== OutputCapture ==========################
+class OutputCapture:
+    # Bir pipe'tan okunan çıktının ilk limit_bytes byte'ını tutar, kalanını moduna göre
+    # dosyaya yazar veya atar. stream_filter verilirse okunan her parça önce ondan geçirilir.
+    def __init__(self, limit_bytes: int = DEFAULT_OUTPUT_LIMIT_BYTES, mode: str = DEFAULT_OUTPUT_MODE, stream_filter=None):
+        self.limit_bytes = limit_bytes
+        self.mode = mode
+        self.stream_filter = stream_filter
+        self.total_bytes = 0
+        self.spill_path: Optional[str] = None
+        self._head = bytearray()
+        self._spill_file = None
+
+    ################ Okunan parçayı ekler ################
+    def feed(self, chunk: bytes):
+        if self.stream_filter is not None:
+            chunk = self.stream_filter.feed(chunk)
+        self._store(chunk)
+
+    ################ Okuma bittiğinde filtrede bekleyeni ekler ve dosyayı kapatır ################
+    def close(self):
+        if self.stream_filter is not None:
+            self._store(self.stream_filter.finish())
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    ################ Tutulan çıktıyı metin olarak döndürür ################
+    def text(self) -> str:
+        # subprocess text=True ile aynı şekilde satır sonları \n'e çevrilir
+        text = bytes(self._head).decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+        overflow = self.total_bytes - len(self._head)
+        if overflow > 0 and self.spill_path:
+            text += f"\n... [{overflow} more bytes written to {self.spill_path}] ...\n"
+        elif overflow > 0:
+            text += f"\n... [{overflow} bytes truncated] ...\n"
+        return text
+
+    def _store(self, data: bytes):
+        if not data or self.mode == 'discard':
+            return
+        self.total_bytes += len(data)
+        room = self.limit_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data and self.mode == 'spill':
+            if self._spill_file is None:
+                self._spill_file = _open_spill_file()
+                self.spill_path = self._spill_file.name
+            self._spill_file.write(data)
+
+################ Taşan çıktı için yeni bir dosya açar; süresi dolmuş eski dosyaları siler ################
+def _open_spill_file():
+    os.makedirs(SPILL_DIR, exist_ok=True)
+    expired_before = time.time() - SPILL_RETENTION_SECONDS
+    for entry in os.scandir(SPILL_DIR):
+        try:
+            if entry.stat().st_mtime < expired_before:
+                os.remove(entry.path)
+        except OSError:
+            pass
+    return tempfile.NamedTemporaryFile('wb', dir=SPILL_DIR, prefix='run-', suffix='.log', delete=False)
+
+################ Pipe'ı kapanana kadar parça parça okur ################
+def _pump(pipe, capture: OutputCapture):
+    try:
+        while True:
+            # read1 o an hazır olanı döndürür; read ise parça dolana kadar bekler ve kayıtları geciktirir
+            chunk = pipe.read1(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            capture.feed(chunk)
+    except (OSError, ValueError):
+        # Süreç hata ile sonlandırılırken pipe kapatılmış olabilir
+        pass
+    finally:
+        capture.close()
+
+################ Süreci bekler; filtre iteration_timeout boyunca yeni kayıt görmezse de zaman aşımı verir ################
+def _wait(process: subprocess.Popen, timeout: Optional[float], iteration_timeout: Optional[float], progress) -> None:
+    if not iteration_timeout or progress is None:
+        process.wait(timeout=timeout)
+        return
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        stall_at = progress.last_record_at + iteration_timeout
+        wait_until = stall_at if deadline is None else min(deadline, stall_at)
+        try:
+            process.wait(timeout=max(0.0, wait_until - time.monotonic()))
+            return
+        except subprocess.TimeoutExpired:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            # Beklerken yeni bir kayıt geldiyse süre son kayıttan itibaren yeniden başlar
+            if now >= progress.last_record_at + iteration_timeout:
+                raise subprocess.TimeoutExpired(process.args, iteration_timeout)
+
+################ Süreci (POSIX'te arka plan çocuklarıyla birlikte süreç grubunu) sonlandırır ################
+def _kill_group(process: subprocess.Popen):
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    process.kill()
+
+################ Okuyucuları ortak bir süre sınırıyla bekler; hepsi bittiyse True döndürür ################
+def _join_readers(readers: List[threading.Thread], seconds: float) -> bool:
+    deadline = time.monotonic() + seconds
+    for reader in readers:
+        reader.join(max(0.0, deadline - time.monotonic()))
+    return not any(reader.is_alive() for reader in readers)
+
+################ Okuyucuları bekler; grubun dışına çıkmış bir süreç pipe'ı hâlâ açık tutuyorsa onu bırakır ################
+def _release_pipes(process: subprocess.Popen, streams: Dict[str, threading.Thread]):
+    if _join_readers(list(streams.values()), READER_JOIN_TIMEOUT_SECONDS):
+        return
+    for name, reader in streams.items():
+        if reader.is_alive():
+            # Okuma sürerken pipe'ı kapatmak okuyucu bitene kadar bekletir; pipe EOF'ta okuyucu ile birlikte serbest kalır
+            setattr(process, name, None)
+
+################ Komutu çalıştırır; sonucu ve alt sürecin kaynak kullanımını döndürür ################
+def run_process(
+    cmd: List[str],
+    timeout: Optional[float] = None,
+    env: Optional[Dict[str, str]] = None,
+    cpus: Optional[Set[int]] = None,
+    output_mode: str = DEFAULT_OUTPUT_MODE,
+    output_limit: int = DEFAULT_OUTPUT_LIMIT_BYTES,
+    stderr_filter=None,
+    iteration_timeout: Optional[float] = None
+) -> Tuple[subprocess.CompletedProcess, Optional[Dict[str, Any]]]:
+    if output_mode not in OUTPUT_MODES:
+        raise ValueError(f"Unsupported output mode: {output_mode}. Supported: {', '.join(OUTPUT_MODES)}")
+
+    stdout_capture = OutputCapture(output_limit, output_mode)
+    stderr_capture = OutputCapture(output_limit, output_mode, stream_filter=stderr_filter)
+    # discard modunda çıktı okunmaz; stderr filtresi (ör. batch sürücüsü kayıtları) varsa stderr yine okunur
+    discard = output_mode == 'discard'
+    stdout_target = subprocess.DEVNULL if discard else subprocess.PIPE
+    stderr_target = subprocess.DEVNULL if discard and stderr_filter is None else subprocess.PIPE
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    # Ayrı süreç grubu, kodun başlattığı arka plan süreçlerinin de sonlandırılabilmesini sağlar
+    with RusagePopen(cmd, stdout=stdout_target, stderr=stderr_target, env=env, start_new_session=hasattr(os, 'killpg')) as process:
+        streams = {
+            name: threading.Thread(target=_pump, args=(pipe, capture), daemon=True)
+            for name, pipe, capture in (('stdout', process.stdout, stdout_capture), ('stderr', process.stderr, stderr_capture))
+            if pipe is not None
+        }
+        readers = list(streams.values())
+        for reader in readers:
+            reader.start()
+        try:
+            # preexec_fn thread'lerle güvenli olmadığı için sabitleme süreç başladıktan hemen sonra yapılır;
+            # sürecin bundan sonra başlattığı alt süreçler de aynı CPU'ları devralır
+            if cpus:
+                try:
+                    os.sched_setaffinity(process.pid, cpus)
+                except ProcessLookupError:
+                    pass
+            _wait(process, timeout, iteration_timeout, stderr_filter)
+        except subprocess.TimeoutExpired as e:
+            _kill_group(process)
+            process.wait()
+            _release_pipes(process, streams)
+            raise ProcessTimeout(cmd, e.timeout, output=stdout_capture.text(), stderr=stderr_capture.text(), resource_usage=process.rusage)
+        except:
+            _kill_group(process)
+            raise
+        # Pipe'lar süreç bittikten sonra da okunacak veri içerebilir; okuyucular EOF'a kadar,
+        # en fazla zaman aşımından kalan süre kadar beklenir
+        remaining = READER_JOIN_TIMEOUT_SECONDS if deadline is None else deadline - time.monotonic()
+        if not _join_readers(readers, remaining):
+            # Süreç bitti ama başlattığı arka plan süreçleri pipe'ları açık tutuyor
+            _kill_group(process)
+            _release_pipes(process, streams)
+            if deadline is not None:
+                raise ProcessTimeout(cmd, timeout, output=stdout_capture.text(), stderr=stderr_capture.text(), resource_usage=process.rusage)
+
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout_capture.text(), stderr_capture.text()), process.rusage
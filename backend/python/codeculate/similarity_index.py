@@ -0,0 +1,112 @@
+"""
+    SimilarityIndex
+    =================================================================
+    Normalize edilmiş kodlar için yakın kopya (near-duplicate) indeksidir.
+    Birebir aynı olmayan ama neredeyse aynı olan kodlar (farklı bir sabit,
+    fazladan bir print) için de önbellekteki bir raporun bulunabilmesini sağlar.
+
+    Yöntem:
+    - Shingling: Normalize edilmiş kodun token akışı SHINGLE_SIZE uzunluğunda
+      kayan pencerelere bölünür ve her pencere 32 bitlik bir özete çevrilir
+    - MinHash: Shingle kümesi NUM_PERMUTATIONS adet hash fonksiyonu ile
+      sabit uzunluklu bir imzaya indirgenir
+    - LSH: İmza LSH_BANDS banda bölünür; en az bir bandı aynı olan kayıtlar
+      aday kabul edilir (Jaccard ~0.5 ve üzeri için yüksek olasılıkla)
+    - Adayların benzerliği normalize kodlarının shingle kümeleri üzerinden
+      kesin Jaccard benzerliği ile hesaplanır
+
+    Bant kovaları execution_reports ile aynı veritabanında, ayrı bir tabloda saklanır.
+"""
+
+import re
+import random
+import hashlib
+import sqlite3
+from typing import List, Optional, Set, Tuple
+
+SIMILARITY_TABLE = 'code_similarity_bands'
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# İmzaların yeniden başlatmalar arasında aynı kalması için sabit tohumlu permütasyonlar
+_rng = random.Random(0x6772656e)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+################ Metnin 32 bitlik özetini döndürür ################
+def _hash32(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=4).digest(), 'little')
+
+################ Normalize edilmiş kodun shingle kümesini döndürür ################
+def shingles(normalized_code: str) -> Set[int]:
+    tokens = TOKEN_PATTERN.findall(normalized_code)
+    if len(tokens) <= SHINGLE_SIZE:
+        return {_hash32(' '.join(tokens))} if tokens else set()
+    return {_hash32(' '.join(tokens[i:i + SHINGLE_SIZE])) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+################ Shingle kümesinin MinHash imzasını döndürür ################
+def minhash_signature(shingle_set: Set[int]) -> List[int]:
+    if not shingle_set:
+        return [MAX_HASH] * NUM_PERMUTATIONS
+    return [min(((a * s + b) % MERSENNE_PRIME) & MAX_HASH for s in shingle_set) for a, b in PERMUTATIONS]
+
+################ İmzanın bant kovalarını [(bant, kova)] olarak döndürür ################
+def band_buckets(signature: List[int]) -> List[Tuple[int, int]]:
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(','.join(map(str, rows)).encode('ascii'), digest_size=8).digest()
+        # SQLite INTEGER işaretli 64 bit olduğundan kova işaretli olarak saklanır
+        buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return buckets
+
+################ İki shingle kümesinin Jaccard benzerliğini döndürür ################
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+################ Bant tablosunu oluşturur ################
+def init_similarity_table(cursor: sqlite3.Cursor):
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {SIMILARITY_TABLE} (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        report_id INTEGER NOT NULL,
+        PRIMARY KEY (band, bucket, report_id)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute(f'''
+    CREATE INDEX IF NOT EXISTS idx_{SIMILARITY_TABLE}_report
+    ON {SIMILARITY_TABLE} (report_id)
+    ''')
+
+################ Raporu bant kovalarına ekler ################
+def index_report(cursor: sqlite3.Cursor, report_id: int, normalized_code: str):
+    buckets = band_buckets(minhash_signature(shingles(normalized_code)))
+    cursor.executemany(
+        f'INSERT OR IGNORE INTO {SIMILARITY_TABLE} (band, bucket, report_id) VALUES (?, ?, ?)',
+        [(band, bucket, report_id) for band, bucket in buckets]
+    )
+
+################ Aday aramasında kullanılacak koşulu ve parametrelerini döndürür ################
+def candidate_condition(shingle_set: Set[int], column: str = 'id') -> Tuple[str, List[int]]:
+    buckets = band_buckets(minhash_signature(shingle_set))
+    values = ', '.join('(?, ?)' for _ in buckets)
+    condition = f'''{column} IN (
+        SELECT report_id FROM {SIMILARITY_TABLE}
+        WHERE (band, bucket) IN (VALUES {values})
+    )'''
+    return condition, [value for bucket in buckets for value in bucket]
+
+################ Eşik değerinin geçerli olup olmadığını kontrol eder ################
+def validate_threshold(threshold: Optional[float]):
+    if threshold is not None and not 0 < threshold <= 1:
+        raise ValueError(f"Invalid similarity threshold: {threshold}. Must be in (0, 1]")
@@ -0,0 +1,673 @@
+"""
+    WarmWorkers
+    =================================================================
+    Codeculate'in "warm" çalıştırma modu için önceden başlatılmış, uzun
+    ömürlü dil worker'larıdır. Her çalıştırmada interpreter/JVM'i sıfırdan
+    başlatmak yerine worker'a yalnızca çalıştırılacak hedef gönderilir;
+    kısa kodlarda soğuk başlatma maliyeti (site importları, V8 ve JVM
+    açılışı) ortadan kalkar.
+
+    Worker'lar:
+    - python: Forkserver tarzı; worker modülleri bir kez yükler ve her tekrar
+      için fork() yapar. Kullanıcı kodu çocuk süreçte çalışır, worker'ın
+      durumu değişmez. Kaynak kullanımı çocuklar os.wait4 ile beklenerek alınır.
+    - javascript: Kalıcı Node süreci; her job yeni bir V8 context'inde
+      (vm.createContext) kendi console'u ve sınırlı bir process nesnesiyle
+      çalışır. Job'ın zamanlayıcıları job bitince iptal edilir; başka bekleyen
+      asenkron iş bırakan job'dan sonra worker atılır. Kaynak kullanımı
+      process.resourceUsage() farkıdır. (Asenkron işler ölçüme dahil edilmez.)
+    - java: Kalıcı JVM; her job derlenmiş sınıfları yeni bir URLClassLoader
+      ile yükler, böylece statik alanlar job'lar arasında taşınmaz. Kaynak
+      kullanımı olarak yalnızca sürecin CPU süresi bildirilir.
+
+    Protokol: Worker stdin'den "<job_id>\\t<tekrar>\\t<hedef>" satırları okur.
+    Tekrar kayıtları batch sürücüsü ile aynı biçimde stderr'e yazılır; job
+    bitince hem stdout'a hem stderr'e (kaynak kullanımı ile) bitiş işareti
+    yazılır:
+
+        __GREENCULATE_DONE__ <job_id> [<cpu_user> <cpu_system> <max_rss_kb> <vcsw> <ivcsw> <minflt> <majflt>]
+
+    stdout'taki bitiş işaretinin ardından gelen 1 değeri, job'ın worker'da
+    bekleyen asenkron iş bıraktığını bildirir; worker job'dan sonra atılır.
+    Bir akışta bitiş işaretinden sonra gelen çıktı hiçbir job'a verilmez.
+
+    Her worker en fazla max_uses job çalıştırır, sonra kapatılıp yerine
+    yenisi arka planda başlatılır. Kod süreci sonlandırırsa (process.exit,
+    System.exit) ya da zaman aşımı olursa worker atılır. Zaman aşımı job için
+    tek bir bitiş zamanıdır; ayrıca iteration_timeout boyunca yeni tekrar
+    kaydı gelmezse de job zaman aşımına uğrar. POSIX'te worker kendi süreç
+    grubuyla birlikte, os.killpg olmayan platformlarda (Windows) yalnızca
+    worker süreci sonlandırılır.
+"""
+
+import os
+import re
+import time
+import uuid
+import shutil
+import signal
+import tempfile
+import threading
+import subprocess
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config.logging_config import setup_logger
+from .batch_harness import HarnessRecordFilter
+from .process_runner import (
+    RUSAGE_FIELDS, READ_CHUNK_BYTES, DEFAULT_OUTPUT_MODE, DEFAULT_OUTPUT_LIMIT_BYTES,
+    OutputCapture, ProcessTimeout
+)
+
+logger = setup_logger('warm_workers')
+
+DEFAULT_WORKERS_PER_LANGUAGE = 2
+DEFAULT_MAX_USES = 100
+
+WORKER_DIR = os.path.join(tempfile.gettempdir(), 'greenculate-workers')
+DONE_MARKER = '__GREENCULATE_DONE__'
+DONE_RECORD = re.compile(DONE_MARKER.encode('ascii') + rb' (\S+)((?: [-\d.e]+)*)\r?\n')
+
+################ Python worker'ı (forkserver) ################
+PYTHON_WORKER = '''import os
+import sys
+import time
+import traceback
+
+MAXRSS_DIVISOR = 1024 if sys.platform == 'darwin' else 1
+
+def _run_child(path, code):
+    # Çocuk süreç: stdin protokol kanalıdır, kullanıcı koduna verilmez
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    sys.stdin = open(os.devnull, 'r')
+    sys.argv = [path]
+    sys.path[0] = os.path.dirname(path)
+    user_globals = {'__name__': '__main__', '__file__': path, '__builtins__': __builtins__}
+    exit_code = 0
+    try:
+        exec(code, user_globals)
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException as e:
+        # Worker'ın kendi çerçevesi traceback'te gösterilmez
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        exit_code = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(exit_code)
+
+def _run_job(job_id, iterations, path):
+    usage = [0.0, 0.0, 0, 0, 0, 0, 0]
+    try:
+        with open(path, 'r', encoding='utf-8') as source_file:
+            code = compile(source_file.read(), path, 'exec')
+    except BaseException:
+        traceback.print_exc()
+        iterations = 0
+    for i in range(iterations):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        start = time.perf_counter_ns()
+        pid = os.fork()
+        if pid == 0:
+            _run_child(path, code)
+        _, status, rusage = os.wait4(pid, 0)
+        elapsed = time.perf_counter_ns() - start
+        exit_code = os.waitstatus_to_exitcode(status)
+        if exit_code < 0:
+            exit_code = 128 - exit_code
+        usage[0] += rusage.ru_utime
+        usage[1] += rusage.ru_stime
+        usage[2] = max(usage[2], rusage.ru_maxrss // MAXRSS_DIVISOR)
+        usage[3] += rusage.ru_nvcsw
+        usage[4] += rusage.ru_nivcsw
+        usage[5] += rusage.ru_minflt
+        usage[6] += rusage.ru_majflt
+        sys.stderr.write('__GREENCULATE_ITER__ %d %d %d\\n' % (i, elapsed, exit_code))
+        sys.stderr.flush()
+    sys.stdout.write('__GREENCULATE_DONE__ %s\\n' % job_id)
+    sys.stdout.flush()
+    sys.stderr.write('__GREENCULATE_DONE__ %s %s\\n' % (job_id, ' '.join(str(value) for value in usage)))
+    sys.stderr.flush()
+
+for line in sys.stdin:
+    job_id, iterations, path = line.rstrip('\\n').split('\\t', 2)
+    _run_job(job_id, int(iterations), os.path.abspath(path))
+'''
+
+################ Node.js worker'ı ################
+JAVASCRIPT_WORKER = '''const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+const readline = require('readline');
+const Module = require('module');
+const { Console } = require('console');
+const { Writable } = require('stream');
+
+// Pipe yazımları eşzamanlı yapılır; job'ın çıktısı bitiş işaretinden önce yazılmış olur
+for (const stream of [process.stdout, process.stderr]) {
+  if (stream._handle && stream._handle.setBlocking) {
+    stream._handle.setBlocking(true);
+  }
+}
+
+function activeResources() {
+  return typeof process.getActiveResourcesInfo === 'function' ? process.getActiveResourcesInfo().length : 0;
+}
+
+function syncStream(fd) {
+  return new Writable({
+    write(chunk, encoding, callback) {
+      fs.writeSync(fd, chunk);
+      callback();
+    }
+  });
+}
+
+// Job'a kendi console'u, sınırlı bir process nesnesi ve izlenen zamanlayıcılar verilir;
+// worker'ın gerçek console/process nesnelerindeki değişiklikler sonraki job'lara taşınmaz
+function jobScope(file) {
+  const timeouts = new Set();
+  const immediates = new Set();
+  const track = (handles, handle) => {
+    handles.add(handle);
+    return handle;
+  };
+  const stdout = syncStream(1);
+  const stderr = syncStream(2);
+  const jobProcess = {
+    argv: [process.argv[0], file],
+    env: { ...process.env },
+    platform: process.platform,
+    arch: process.arch,
+    pid: process.pid,
+    version: process.version,
+    versions: process.versions,
+    stdout,
+    stderr,
+    cwd: () => process.cwd(),
+    hrtime: process.hrtime,
+    memoryUsage: () => process.memoryUsage(),
+    uptime: () => process.uptime(),
+    nextTick: (callback, ...args) => queueMicrotask(() => callback(...args)),
+    // Kod süreci sonlandırırsa worker atılır
+    exit: (code) => process.exit(code)
+  };
+  const globals = {
+    console: new Console({ stdout, stderr }),
+    process: jobProcess,
+    Buffer, URL, TextEncoder, TextDecoder, queueMicrotask,
+    setTimeout: (...args) => track(timeouts, setTimeout(...args)),
+    setInterval: (...args) => track(timeouts, setInterval(...args)),
+    setImmediate: (...args) => track(immediates, setImmediate(...args)),
+    clearTimeout, clearInterval, clearImmediate
+  };
+  const clear = () => {
+    timeouts.forEach(clearTimeout);
+    immediates.forEach(clearImmediate);
+    timeouts.clear();
+    immediates.clear();
+  };
+  return { globals, clear };
+}
+
+function runJob(jobId, iterations, file) {
+  const before = process.resourceUsage();
+  const resourcesBefore = activeResources();
+  const userRequire = Module.createRequire(file);
+  // Her job yeni bir V8 context'inde çalışır; global değişiklikler sonraki job'lara taşınmaz
+  const scope = jobScope(file);
+  const context = vm.createContext(scope.globals);
+  let wrapper = null;
+  try {
+    wrapper = new vm.Script(Module.wrap(fs.readFileSync(file, 'utf8')), { filename: file }).runInContext(context);
+  } catch (e) {
+    fs.writeSync(2, (e && e.stack ? e.stack : String(e)) + '\\n');
+  }
+  for (let i = 0; wrapper && i < iterations; i++) {
+    const userModule = new Module(file, null);
+    userModule.filename = file;
+    userModule.paths = Module._nodeModulePaths(path.dirname(file));
+    let exitCode = 0;
+    const start = process.hrtime.bigint();
+    try {
+      wrapper.call(userModule.exports, userModule.exports, userRequire, userModule, file, path.dirname(file));
+    } catch (e) {
+      fs.writeSync(2, (e && e.stack ? e.stack : String(e)) + '\\n');
+      exitCode = 1;
+    }
+    const elapsed = process.hrtime.bigint() - start;
+    fs.writeSync(2, `__GREENCULATE_ITER__ ${i} ${elapsed} ${exitCode}\\n`);
+  }
+  // Job'ın kuyruğa koyduğu microtask'lar bitiş işaretinden önce çalışır, kalan zamanlayıcıları iptal edilir.
+  // Başka bekleyen asenkron iş kaldıysa (soket, dosya işlemi vb.) worker'ın atılması istenir.
+  setImmediate(() => {
+    scope.clear();
+    const leaked = activeResources() > resourcesBefore ? 1 : 0;
+    const after = process.resourceUsage();
+    const usage = [
+      (after.userCPUTime - before.userCPUTime) / 1e6,
+      (after.systemCPUTime - before.systemCPUTime) / 1e6,
+      after.maxRSS,
+      after.voluntaryContextSwitches - before.voluntaryContextSwitches,
+      after.involuntaryContextSwitches - before.involuntaryContextSwitches,
+      after.minorPageFault - before.minorPageFault,
+      after.majorPageFault - before.majorPageFault
+    ];
+    fs.writeSync(1, `__GREENCULATE_DONE__ ${jobId} ${leaked}\\n`);
+    fs.writeSync(2, `__GREENCULATE_DONE__ ${jobId} ${usage.join(' ')}\\n`);
+  });
+}
+
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  const [jobId, iterations, target] = line.split('\\t');
+  runJob(jobId, parseInt(iterations, 10), path.resolve(target));
+});
+'''
+
+################ Java worker'ı ################
+JAVA_WORKER = '''import java.io.BufferedReader;
+import java.io.File;
+import java.io.InputStreamReader;
+import java.lang.management.ManagementFactory;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.net.URL;
+import java.net.URLClassLoader;
+
+public class GreenculateWorker {
+    public static void main(String[] args) throws Exception {
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] parts = line.split("\\t", 3);
+            runJob(parts[0], Integer.parseInt(parts[1]), new File(parts[2]));
+        }
+    }
+
+    private static void runJob(String jobId, int iterations, File classDir) throws Exception {
+        long cpuBefore = processCpuTime();
+        // Her job yeni bir class loader ile yüklenir; statik alanlar job'lar arasında taşınmaz
+        try (URLClassLoader loader = new URLClassLoader(new URL[] { classDir.toURI().toURL() }, GreenculateWorker.class.getClassLoader())) {
+            Method main = null;
+            try {
+                main = loader.loadClass("Main").getMethod("main", String[].class);
+            } catch (Throwable t) {
+                t.printStackTrace();
+            }
+            for (int i = 0; main != null && i < iterations; i++) {
+                int exitCode = 0;
+                long start = System.nanoTime();
+                try {
+                    main.invoke(null, (Object) new String[0]);
+                } catch (InvocationTargetException e) {
+                    e.getCause().printStackTrace();
+                    exitCode = 1;
+                } catch (Throwable t) {
+                    t.printStackTrace();
+                    exitCode = 1;
+                }
+                long elapsed = System.nanoTime() - start;
+                System.out.flush();
+                System.err.println("__GREENCULATE_ITER__ " + i + " " + elapsed + " " + exitCode);
+                System.err.flush();
+            }
+        }
+        double cpuSeconds = (processCpuTime() - cpuBefore) / 1e9;
+        System.out.println("__GREENCULATE_DONE__ " + jobId);
+        System.out.flush();
+        System.err.println("__GREENCULATE_DONE__ " + jobId + " " + cpuSeconds + " 0 0 0 0 0 0");
+        System.err.flush();
+    }
+
+    private static long processCpuTime() {
+        java.lang.management.OperatingSystemMXBean os = ManagementFactory.getOperatingSystemMXBean();
+        if (os instanceof com.sun.management.OperatingSystemMXBean) {
+            return ((com.sun.management.OperatingSystemMXBean) os).getProcessCpuTime();
+        }
+        return 0;
+    }
+}
+'''
+
+################ Dillere göre worker dosyaları, gerekli programlar ve komutlar ################
+WORKER_FILES = {
+    'python': ('greenculate_worker.py', PYTHON_WORKER),
+    'javascript': ('greenculate_worker.js', JAVASCRIPT_WORKER),
+    'java': ('GreenculateWorker.java', JAVA_WORKER)
+}
+
+WORKER_REQUIREMENTS = {
+    'python': ('python',),
+    'javascript': ('node',),
+    'java': ('java', 'javac')
+}
+
+WORKER_COMMANDS = {
+    'python': lambda path: ['python', path],
+    'javascript': lambda path: ['node', path],
+    'java': lambda path: ['java', '-cp', os.path.dirname(path), 'GreenculateWorker']
+}
+
+################ Dilin warm modunu bu makinede destekleyip desteklemediğini döndürür ################
+def is_warm_supported(language: str) -> bool:
+    if language == 'python' and not hasattr(os, 'fork'):
+        return False
+    return language in WORKER_REQUIREMENTS and all(shutil.which(program) for program in WORKER_REQUIREMENTS[language])
+
+################ Worker'a gönderilecek hedefi döndürür (java için derlenmiş sınıfların dizini) ################
+def warm_target(file_path: str, language: str) -> str:
+    return os.path.dirname(file_path) if language == 'java' else file_path
+
+################ Worker dosyasını yazar (java için bir kez derler) ve başlatma komutunu döndürür ################
+def _prepare_worker(language: str) -> List[str]:
+    os.makedirs(WORKER_DIR, exist_ok=True)
+    file_name, source = WORKER_FILES[language]
+    path = os.path.join(WORKER_DIR, file_name)
+    current = None
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as worker_file:
+            current = worker_file.read()
+    if current != source:
+        with open(path, 'w', encoding='utf-8') as worker_file:
+            worker_file.write(source)
+    if language == 'java':
+        class_path = os.path.join(WORKER_DIR, 'GreenculateWorker.class')
+        if current != source or not os.path.exists(class_path):
+            result = subprocess.run(['javac', '-d', WORKER_DIR, path], capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"Failed to compile java worker: {result.stderr}")
+    return WORKER_COMMANDS[language](path)
+
+################ Worker çıktısını sınırlı toplayan job durumu ################
+class _WarmJob:
+    def __init__(self, output_mode: str, output_limit: int, on_record: Optional[Callable[[Dict[str, Any]], None]]):
+        self.id = uuid.uuid4().hex
+        self.captures = {
+            'stdout': OutputCapture(output_limit, output_mode),
+            'stderr': OutputCapture(output_limit, output_mode)
+        }
+        self.done = {'stdout': threading.Event(), 'stderr': threading.Event()}
+        self.on_record = on_record
+        self.records: List[Dict[str, Any]] = []
+        self.resource_usage: Optional[Dict[str, Any]] = None
+        self.worker_exited = False
+        self.recycle = False
+        self.last_record_at = time.monotonic()
+
+################========== WorkerStreamFilter ==========################
+class WorkerStreamFilter(HarnessRecordFilter):
+    # Batch sürücüsü kayıtlarına ek olarak job bitiş işaretlerini ayıklar
+    def __init__(self, parse_records: bool, on_record=None):
+        super().__init__(on_record)
+        self.parse_records = parse_records
+        self.done: List[re.Match] = []
+
+    def _extract(self, data: bytes) -> bytes:
+        if self.parse_records:
+            data = super()._extract(data)
+        matches = list(DONE_RECORD.finditer(data))
+        if not matches:
+            return data
+        self.done.extend(matches)
+        # Bitiş işaretinden sonraki çıktı biten job'a ait değildir (ör. kalan asenkron işler)
+        return data[:matches[0].start()]
+
+################========== WarmWorker ==========################
+class WarmWorker:
+    def __init__(self, language: str):
+        self.language = language
+        self.uses = 0
+        self.alive = True
+        self._job: Optional[_WarmJob] = None
+        # Ayrı bir süreç grubu, zaman aşımında worker'ın çocuklarıyla birlikte sonlandırılmasını sağlar
+        self.process = subprocess.Popen(
+            _prepare_worker(language),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            start_new_session=True
+        )
+        for name in ('stdout', 'stderr'):
+            threading.Thread(target=self._read, args=(name,), name=f'warm-{language}-{name}', daemon=True).start()
+        logger.info(f"Started warm {language} worker {self.process.pid}")
+
+    ################ Hedefi verilen tekrar sayısı kadar çalıştırır ################
+    def run(
+        self,
+        target: str,
+        iterations: int,
+        timeout: float,
+        output_mode: str = DEFAULT_OUTPUT_MODE,
+        output_limit: int = DEFAULT_OUTPUT_LIMIT_BYTES,
+        on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
+        iteration_timeout: Optional[float] = None
+    ) -> _WarmJob:
+        job = _WarmJob(output_mode, output_limit, on_record)
+        deadline = time.monotonic() + timeout
+        self._job = job
+        self.uses += 1
+        try:
+            self.process.stdin.write(f"{job.id}\t{iterations}\t{target}\n".encode('utf-8'))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self.close()
+            raise RuntimeError(f"Warm {self.language} worker is not running")
+
+        # Her iki akışta da bitiş işareti görülene (ya da worker kapanana) kadar bekle
+        expired = self._wait(job, deadline, timeout, iteration_timeout)
+        self._job = None
+        if expired is not None:
+            logger.error(f"Warm {self.language} worker {self.process.pid} timed out after {expired} seconds, terminating")
+            self.close(kill=True)
+            raise ProcessTimeout(
+                [self.language, target], expired,
+                output=job.captures['stdout'].text(), stderr=job.captures['stderr'].text()
+            )
+        if job.worker_exited:
+            logger.warning(f"Warm {self.language} worker {self.process.pid} exited during a job")
+            self.close()
+        elif job.recycle:
+            logger.info(f"Warm {self.language} worker {self.process.pid} has pending async work after a job, discarding it")
+            self.close(kill=True)
+        return job
+
+    ################ Job bitene kadar bekler; zaman aşımı olursa aşılan süreyi döndürür ################
+    @staticmethod
+    def _wait(job: _WarmJob, deadline: float, timeout: float, iteration_timeout: Optional[float]) -> Optional[float]:
+        for name in ('stdout', 'stderr'):
+            while not job.done[name].is_set():
+                now = time.monotonic()
+                if now >= deadline:
+                    return timeout
+                # Süre son tekrar kaydından (ilk tekrar için job başlangıcından) itibaren ölçülür
+                stall_at = job.last_record_at + iteration_timeout if iteration_timeout else deadline
+                if now >= stall_at:
+                    return iteration_timeout
+                job.done[name].wait(min(deadline, stall_at) - now)
+        return None
+
+    ################ Worker'ı kapatır ################
+    def close(self, kill: bool = False):
+        self.alive = False
+        try:
+            if kill:
+                self._kill()
+            else:
+                self.process.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._kill()
+            self.process.wait()
+
+    ################ Worker'ı (POSIX'te çocuklarıyla birlikte süreç grubunu) sonlandırır ################
+    def _kill(self):
+        if hasattr(os, 'killpg'):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                return
+            except ProcessLookupError:
+                pass
+        self.process.kill()
+
+    ################ Worker'ın çıktı akışını okur ve o an çalışan job'a aktarır ################
+    def _read(self, name: str):
+        stream_filter = WorkerStreamFilter(parse_records=(name == 'stderr'), on_record=self._on_record)
+        pipe = getattr(self.process, name)
+        while True:
+            try:
+                chunk = pipe.read1(READ_CHUNK_BYTES)
+            except (OSError, ValueError):
+                chunk = b''
+            if not chunk:
+                break
+            data = stream_filter.feed(chunk)
+            job = self._job
+            # Bu akışta bitiş işareti görülmüş job'a sonradan gelen çıktı verilmez
+            if job is not None and not job.done[name].is_set():
+                job.records.extend(stream_filter.records)
+                job.captures[name].feed(data)
+            stream_filter.records.clear()
+            for match in stream_filter.done:
+                if job is not None and match.group(1).decode('ascii') == job.id:
+                    if name == 'stderr':
+                        job.resource_usage = self._parse_usage(match.group(2))
+                    elif match.group(2).strip() == b'1':
+                        job.recycle = True
+                    job.done[name].set()
+            stream_filter.done.clear()
+
+        # Worker kapandı; bekleyen job varsa başarısız olarak bitir
+        self.alive = False
+        job = self._job
+        if job is not None:
+            job.worker_exited = True
+            job.done[name].set()
+
+    def _on_record(self, record: Dict[str, Any]):
+        job = self._job
+        if job is None:
+            return
+        job.last_record_at = time.monotonic()
+        if job.on_record:
+            job.on_record(record)
+
+    @staticmethod
+    def _parse_usage(values: bytes) -> Optional[Dict[str, Any]]:
+        numbers = values.split()
+        if len(numbers) != len(RUSAGE_FIELDS):
+            return None
+        usage = {}
+        for field, value in zip(RUSAGE_FIELDS, numbers):
+            usage[field] = float(value) if field.startswith('cpu_') else int(float(value))
+        return usage
+
+################========== WarmWorkerPool ==========################
+class WarmWorkerPool:
+    def __init__(self, workers_per_language: int = DEFAULT_WORKERS_PER_LANGUAGE, max_uses: int = DEFAULT_MAX_USES):
+        self.workers_per_language = workers_per_language
+        self.max_uses = max_uses
+        self._idle: Dict[str, List[WarmWorker]] = {}
+        self._live: Dict[str, int] = {}
+        self._condition = threading.Condition()
+
+    ################ Verilen diller için worker'ları önceden başlatır ################
+    def prewarm(self, languages: Optional[List[str]] = None):
+        for language in languages or list(WORKER_FILES):
+            if not is_warm_supported(language):
+                logger.info(f"Skipping warm {language} workers (runtime not available)")
+                continue
+            while self._spawn_idle(language):
+                pass
+
+    ################ Boş bir worker alır; yoksa ve sınır dolmadıysa yenisini başlatır ################
+    @contextmanager
+    def worker(self, language: str) -> Iterator[WarmWorker]:
+        worker = self._acquire(language)
+        try:
+            yield worker
+        finally:
+            self._release(worker)
+
+    ################ Tüm worker'ları kapatır ################
+    def shutdown(self):
+        with self._condition:
+            workers = [worker for idle in self._idle.values() for worker in idle]
+            self._idle.clear()
+        for worker in workers:
+            worker.close()
+
+    def _acquire(self, language: str) -> WarmWorker:
+        with self._condition:
+            while True:
+                idle = self._idle.setdefault(language, [])
+                while idle:
+                    worker = idle.pop()
+                    if worker.alive:
+                        return worker
+                    self._live[language] -= 1
+                if self._live.get(language, 0) < self.workers_per_language:
+                    self._live[language] = self._live.get(language, 0) + 1
+                    break
+                self._condition.wait()
+        try:
+            return WarmWorker(language)
+        except Exception:
+            with self._condition:
+                self._live[language] -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, worker: WarmWorker):
+        # Kullanım sınırına ulaşan worker kapatılır, yerine yenisi arka planda başlatılır
+        recycle = worker.alive and worker.uses >= self.max_uses
+        with self._condition:
+            if worker.alive and not recycle:
+                self._idle.setdefault(worker.language, []).append(worker)
+            else:
+                self._live[worker.language] -= 1
+            self._condition.notify()
+        if recycle:
+            logger.info(f"Recycling warm {worker.language} worker {worker.process.pid} after {worker.uses} jobs")
+            worker.close()
+        if not worker.alive or recycle:
+            threading.Thread(target=self._spawn_idle, args=(worker.language,), daemon=True).start()
+
+    ################ Sınır dolmadıysa yeni bir worker başlatıp boş listeye ekler ################
+    def _spawn_idle(self, language: str) -> bool:
+        with self._condition:
+            if self._live.get(language, 0) >= self.workers_per_language:
+                return False
+            self._live[language] = self._live.get(language, 0) + 1
+        try:
+            worker = WarmWorker(language)
+        except Exception as e:
+            logger.error(f"Failed to start warm {language} worker: {str(e)}")
+            with self._condition:
+                self._live[language] -= 1
+            return False
+        with self._condition:
+            self._idle.setdefault(language, []).append(worker)
+            self._condition.notify()
+        return True
+
+################ Süreç içindeki ortak worker havuzu ################
+_pool: Optional[WarmWorkerPool] = None
+_pool_lock = threading.Lock()
+
+################ Ortak worker havuzunu döndürür ################
+def get_warm_pool() -> WarmWorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmWorkerPool()
+    return _pool
@@ -0,0 +1,119 @@
+"""
+    Blob Store
+    =================================================================
+    Codeculate ve jsonculate database yöneticilerinin ortak kullandığı içerik
+    adresli (content-addressed) payload deposudur. Kod metinleri ve JSON
+    girdileri her rapor satırında tekrar saklanmak yerine UTF-8 içeriğin
+    SHA-256 özeti ile bir kez saklanır; rapor satırları payload'a özeti ile
+    başvurur. Aynı payload farklı tekrar sayılarıyla yüzlerce kez gönderilse
+    de veritabanında tek kopyası bulunur.
+
+    Özellikler:
+    - Aynı veritabanında ayrı bir tablo (payload_blobs); rapor ile aynı
+      transaction içinde yazılır
+    - zstandard kuruluysa büyük payload'lar zstd ile sıkıştırılır (yalnızca
+      yer kazandırıyorsa); kurulu değilse ham saklanır
+    - Taşınan rapor kolonları boş string olarak kalır; boş payload kolonu ve
+      dolu özet kolonu olan satırların içeriği depodan okunur. Eski
+      (taşınmamış) satırlar değiştirilmeden okunur.
+"""
+
+import sqlite3
+import hashlib
+from typing import Dict, Any, List, Iterable, Optional
+from config.logging_config import setup_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = setup_logger('blob_store')
+
+BLOB_TABLE = 'payload_blobs'
+
+# Bu boyuttan küçük payload'lar sıkıştırılmaz
+COMPRESSION_MIN_BYTES = 1024
+ZSTD_LEVEL = 3
+
+# Tek sorguda okunan en fazla özet sayısı (SQLite parametre sınırının altında)
+LOOKUP_BATCH_SIZE = 500
+
+################ Blob tablosunu oluşturur ################
+def init_blob_table(cursor: sqlite3.Cursor):
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {BLOB_TABLE} (
+        hash TEXT PRIMARY KEY,
+        encoding TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        data BLOB NOT NULL
+    )
+    ''')
+
+################ Payload'ın depo anahtarını (UTF-8 içeriğin SHA-256 özeti) döndürür ################
+def blob_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+################ Payload'ı depoya yazar (varsa tekrar yazmaz) ve anahtarını döndürür ################
+def put_blob(cursor: sqlite3.Cursor, text: str) -> str:
+    data = text.encode('utf-8')
+    key = hashlib.sha256(data).hexdigest()
+
+    cursor.execute(f'SELECT 1 FROM {BLOB_TABLE} WHERE hash = ?', (key,))
+    if cursor.fetchone():
+        return key
+
+    encoding, stored = 'raw', data
+    if zstandard is not None and len(data) >= COMPRESSION_MIN_BYTES:
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        if len(compressed) < len(data):
+            encoding, stored = 'zstd', compressed
+
+    cursor.execute(
+        f'INSERT INTO {BLOB_TABLE} (hash, encoding, size, data) VALUES (?, ?, ?, ?)',
+        (key, encoding, len(data), stored)
+    )
+    return key
+
+################ Saklanan veriyi metne çevirir ################
+def _decode(encoding: str, data: bytes) -> str:
+    if encoding == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd-compressed but zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return bytes(data).decode('utf-8')
+
+################ Verilen anahtarların payload'larını {anahtar: metin} olarak döndürür ################
+def get_blobs(conn: sqlite3.Connection, keys: Iterable[str]) -> Dict[str, str]:
+    keys = list(dict.fromkeys(key for key in keys if key))
+    blobs: Dict[str, str] = {}
+    for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        batch = keys[start:start + LOOKUP_BATCH_SIZE]
+        rows = conn.execute(f'''
+        SELECT hash, encoding, data FROM {BLOB_TABLE}
+        WHERE hash IN ({', '.join('?' * len(batch))})
+        ''', batch).fetchall()
+        for key, encoding, data in rows:
+            blobs[key] = _decode(encoding, data)
+    return blobs
+
+################ Tek bir payload'ı döndürür ################
+def get_blob(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    return get_blobs(conn, [key]).get(key)
+
+################ Satırlardaki taşınmış payload kolonlarını depodaki içerikle doldurur ################
+def resolve_payloads(conn: sqlite3.Connection, rows: List[Dict[str, Any]], references: Dict[str, str]):
+    # references: {payload kolonu: özet kolonu}; yalnızca satırlarda bulunan kolonlar çözülür
+    pending = [
+        (row, column, row.get(hash_column))
+        for row in rows
+        for column, hash_column in references.items()
+        if row.get(column) == '' and row.get(hash_column)
+    ]
+    if not pending:
+        return
+    blobs = get_blobs(conn, [key for _, _, key in pending])
+    for row, column, key in pending:
+        # Depoda olmayan özetler (ör. saklanmayan yüklemeler) boş kalır
+        if key in blobs:
+            row[column] = blobs[key]
@@ -0,0 +1,116 @@
+"""
+    Emission Rollups
+    =================================================================
+    Codeculate ve jsonculate database yöneticilerinin ortak kullandığı
+    artımlı (incremental) emisyon toplamlarıdır. Her yeni rapor kaydedilirken
+    aynı transaction içinde toplamlar güncellenir; böylece toplam emisyon ve
+    günlük dağılımlar tüm geçmişi okumadan sabit maliyetle döndürülür.
+
+    Özellikler:
+    - Boyut (dimension) bazında toplamlar: total, language, parser
+    - Tüm zamanlar (bucket = '') ve günlük (bucket = 'YYYY-MM-DD') kovalar
+    - Mevcut kayıtlardan tek seferlik yeniden oluşturma
+"""
+
+import sqlite3
+from typing import Dict, Any, List, Optional, Tuple
+
+ROLLUP_TABLE = 'emission_rollups'
+ALL_TIME_BUCKET = ''
+TOTAL_DIMENSION = 'total'
+
+# Bir rapor için {(dimension, key): (emisyon, süre)} eşlemesi
+RollupValues = Dict[Tuple[str, str], Tuple[float, float]]
+
+################ Toplam tablosunu oluşturur; yeni oluşturulduysa True döner ################
+def init_rollup_table(cursor: sqlite3.Cursor) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (ROLLUP_TABLE,))
+    existed = cursor.fetchone() is not None
+
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+        dimension TEXT NOT NULL,
+        dimension_key TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        total_emission REAL NOT NULL DEFAULT 0,
+        total_duration REAL NOT NULL DEFAULT 0,
+        report_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, dimension_key, bucket)
+    ) WITHOUT ROWID
+    ''')
+    return not existed
+
+################ Bir raporun değerlerini tüm zamanlar ve günlük kovalara ekler ################
+def apply_rollup(cursor: sqlite3.Cursor, day: str, values: RollupValues):
+    rows = []
+    for (dimension, key), (emission, duration) in values.items():
+        for bucket in (ALL_TIME_BUCKET, day):
+            rows.append((dimension, key, bucket, emission or 0, duration or 0))
+
+    cursor.executemany(f'''
+    INSERT INTO {ROLLUP_TABLE} (dimension, dimension_key, bucket, total_emission, total_duration, report_count)
+    VALUES (?, ?, ?, ?, ?, 1)
+    ON CONFLICT (dimension, dimension_key, bucket) DO UPDATE SET
+        total_emission = total_emission + excluded.total_emission,
+        total_duration = total_duration + excluded.total_duration,
+        report_count = report_count + 1
+    ''', rows)
+
+################ Toplam tablosunu verilen SELECT sorgularının sonuçlarıyla yeniden doldurur ################
+def rebuild_rollups(cursor: sqlite3.Cursor, selects: List[str]):
+    # Her SELECT (dimension, dimension_key, day, emission, duration) kolonlarını döndürmelidir
+    cursor.execute(f"DELETE FROM {ROLLUP_TABLE}")
+    for select in selects:
+        cursor.execute(f'''
+        INSERT INTO {ROLLUP_TABLE} (dimension, dimension_key, bucket, total_emission, total_duration, report_count)
+        SELECT dimension, dimension_key, ?, SUM(emission), SUM(duration), COUNT(*)
+        FROM ({select}) GROUP BY dimension, dimension_key
+        ''', (ALL_TIME_BUCKET,))
+        cursor.execute(f'''
+        INSERT INTO {ROLLUP_TABLE} (dimension, dimension_key, bucket, total_emission, total_duration, report_count)
+        SELECT dimension, dimension_key, day, SUM(emission), SUM(duration), COUNT(*)
+        FROM ({select}) GROUP BY dimension, dimension_key, day
+        ''')
+
+################ Bir boyutun tüm zamanlar toplamlarını döndürür ################
+def get_totals(conn: sqlite3.Connection, dimension: str) -> List[Dict[str, Any]]:
+    cursor = conn.execute(f'''
+    SELECT dimension_key, total_emission, total_duration, report_count
+    FROM {ROLLUP_TABLE}
+    WHERE dimension = ? AND bucket = ?
+    ORDER BY dimension_key
+    ''', (dimension, ALL_TIME_BUCKET))
+    return [_to_dict(row) for row in cursor.fetchall()]
+
+################ Bir boyutun günlük toplamlarını döndürür ################
+def get_daily(
+    conn: sqlite3.Connection,
+    dimension: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    query = f'''
+    SELECT dimension_key, total_emission, total_duration, report_count, bucket
+    FROM {ROLLUP_TABLE}
+    WHERE dimension = ? AND bucket > ?
+    '''
+    params: List[Any] = [dimension, ALL_TIME_BUCKET]
+    if since:
+        query += ' AND bucket >= ?'
+        params.append(since[:10])
+    if until:
+        query += ' AND bucket < ?'
+        params.append(until[:10])
+    query += ' ORDER BY bucket, dimension_key'
+
+    results = []
+    for row in conn.execute(query, params).fetchall():
+        item = _to_dict(row[:4])
+        item['day'] = row[4]
+        results.append(item)
+    return results
+
+################ Toplam satırını sözlüğe çevirir ################
+def _to_dict(row) -> Dict[str, Any]:
+    key, emission, duration, count = row
+    return {'key': key, 'emission': emission, 'duration': duration, 'report_count': count}
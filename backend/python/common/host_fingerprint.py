@@ -0,0 +1,95 @@
+"""
+    HostFingerprint
+    =================================================================
+    Codeculate ve jsonculate database yöneticilerinin ortak kullandığı,
+    süreç genelinde tek seferlik hesaplanan makine bilgisidir. Sistem
+    bilgileri her kayıt ve arama işleminde yeniden okunmaz; yalnızca
+    istendiğinde (refresh) yenilenir.
+
+    Özellikler:
+    - CPU modelini /proc/cpuinfo'dan okuma (platform.processor() Linux'ta
+      çoğunlukla boş döner ve farklı makineleri aynı gösterir)
+    - CPU sayısı, toplam RAM, işletim sistemi ve mimari bilgisi
+    - Bu bilgilerden türetilen sabit bir host id (SHA-256 özeti); çekirdek
+      sürümü id'ye katılmaz, böylece işletim sistemi güncellemeleri önbelleği
+      geçersiz kılmaz (tam sürüm yalnızca os_name içinde saklanır)
+"""
+
+import hashlib
+import platform
+import threading
+import psutil
+from typing import Dict, Any, Optional
+from config.logging_config import setup_logger
+
+logger = setup_logger('host_fingerprint')
+
+CPUINFO_PATH = '/proc/cpuinfo'
+HOST_ID_LENGTH = 16
+
+# /proc/cpuinfo içinde CPU modelini veren alanlar (x86, ARM, POWER, MIPS, s390)
+CPUINFO_MODEL_KEYS = ('model name', 'Hardware', 'Model', 'cpu model', 'cpu', 'machine')
+
+################ CPU modelini /proc/cpuinfo'dan okur ################
+def _read_cpuinfo_model(path: str = CPUINFO_PATH) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            fields = {}
+            for line in f:
+                key, sep, value = line.partition(':')
+                key, value = key.strip(), value.strip()
+                if sep and value and key not in fields:
+                    fields[key] = value
+    except OSError:
+        return None
+
+    for key in CPUINFO_MODEL_KEYS:
+        if fields.get(key):
+            return fields[key]
+    return None
+
+################ Makine bilgilerini toplar ################
+def _probe_host() -> Dict[str, Any]:
+    cpu_model = _read_cpuinfo_model() or platform.processor() or platform.machine() or 'Unknown'
+    info = {
+        'cpu_model': ' '.join(cpu_model.split()),
+        'cpu_count': psutil.cpu_count(),
+        'total_ram_gb': round(psutil.virtual_memory().total / (1024 ** 3), 2),
+        'os_name': f"{platform.system()} {platform.release()}",
+        'machine': platform.machine()
+    }
+    # Host id yalnızca donanım ve işletim sistemi ailesine bağlıdır; aynı donanımdaki ölçümler karşılaştırılabilir
+    identity = '|'.join(str(value) for value in (
+        info['cpu_model'], info['cpu_count'], info['total_ram_gb'], platform.system(), info['machine']
+    ))
+    info['host_id'] = hashlib.sha256(identity.encode('utf-8')).hexdigest()[:HOST_ID_LENGTH]
+    return info
+
+################========== HostFingerprint ==========################
+class HostFingerprint:
+    def __init__(self):
+        self._info: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    ################ Makine bilgilerini döndürür; ilk çağrıda hesaplar ################
+    def get(self) -> Dict[str, Any]:
+        info = self._info
+        if info is None:
+            info = self.refresh()
+        return dict(info)
+
+    ################ Makine bilgilerini yeniden hesaplar ################
+    def refresh(self) -> Dict[str, Any]:
+        with self._lock:
+            self._info = _probe_host()
+        logger.info(f"Host fingerprint: {self._info['host_id']} ({self._info['cpu_model']}, "
+                    f"{self._info['cpu_count']} CPU, {self._info['total_ram_gb']} GB)")
+        return dict(self._info)
+
+    ################ Sabit host id'yi döndürür ################
+    @property
+    def host_id(self) -> str:
+        return self.get()['host_id']
+
+# Süreç içindeki tüm bileşenlerin ortak kullandığı makine bilgisi
+host_fingerprint = HostFingerprint()
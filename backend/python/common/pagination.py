@@ -0,0 +1,50 @@
+"""
+    Pagination
+    =================================================================
+    Geçmiş (history) endpoint'lerinin ortak kullandığı keyset pagination
+    yardımcılarıdır. Sayfa imleci (cursor), son döndürülen kaydın sıralama
+    anahtarlarından oluşan opak bir base64 string'idir; OFFSET kullanılmadığı
+    için sayfa maliyeti tablo büyüdükçe artmaz.
+
+    Özellikler:
+    - İmleç oluşturma ve çözme
+    - İstenen kolonları (projection) doğrulama
+"""
+
+import json
+import base64
+from typing import Any, List, Optional, Sequence
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+################ Sıralama anahtarlarından opak bir imleç üretir ################
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+################ İmleci sıralama anahtarlarına çözer ################
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+################ İstenen kolonları doğrular, verilmediyse varsayılan kolonları döndürür ################
+def resolve_fields(fields: Optional[str], allowed: Sequence[str], default: Sequence[str]) -> List[str]:
+    if not fields:
+        return list(default)
+    requested = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+################ Sayfa boyutunu sınırlar içinde tutar ################
+def clamp_page_size(limit: Optional[int]) -> int:
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
@@ -0,0 +1,82 @@
+"""
+    SingleFlight
+    =================================================================
+    Aynı anda gelen birebir aynı çalıştırma isteklerini birleştiren
+    (request coalescing) yardımcıdır. Aynı anahtarla ilk gelen istek lider
+    olur ve işi çalıştırır; iş sürerken aynı anahtarla gelen istekler
+    (takipçiler) işi tekrar çalıştırmak yerine liderin sonucunu bekler.
+
+    Özellikler:
+    - Anahtar, database önbelleğinin kullandığı kimlik ile aynıdır; böylece
+      önbellekte henüz olmayan ama şu an ölçülmekte olan sonuçlar paylaşılır
+    - Takipçiler en fazla verilen süre kadar bekler, süre dolarsa
+      SingleFlightTimeout fırlatılır (lider çalışmaya devam eder)
+    - Liderin fırlattığı hata tüm takipçilere aynen iletilir
+    - İş bittiğinde anahtar silinir; sonraki istekler önbellekten okur
+
+    Birleştirme süreç içindedir: Flask istek thread'leri ortak bir örneği
+    paylaşır, her job worker süreci kendi örneğini kullanır.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from config.logging_config import setup_logger
+
+logger = setup_logger('single_flight')
+
+DEFAULT_WAIT_TIMEOUT_SECONDS = 300.0
+
+################ Takipçi liderin sonucunu süresi içinde alamadığında fırlatılır ################
+class SingleFlightTimeout(TimeoutError):
+    pass
+
+################========== _Call ==========################
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+################========== SingleFlight ==========################
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    ################ İşi anahtar başına bir kez çalıştırır; (sonuç, paylaşıldı_mı) döndürür ################
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = DEFAULT_WAIT_TIMEOUT_SECONDS) -> Tuple[Any, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if is_leader:
+            return self._lead(key, call, fn), False
+
+        logger.info(f"Waiting for in-flight {self.name} execution ({call.followers} follower(s))")
+        if not call.done.wait(timeout):
+            raise SingleFlightTimeout(f"Timed out after {timeout}s waiting for an identical in-flight {self.name} execution")
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    ################ Lider olarak işi çalıştırır ve sonucu takipçilere bırakır ################
+    def _lead(self, key: Hashable, call: _Call, fn: Callable[[], Any]) -> Any:
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Sonuç artık database'de olduğundan sonraki istekler önbellekten okur
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.followers:
+                logger.info(f"Shared {self.name} execution result with {call.followers} follower(s)")
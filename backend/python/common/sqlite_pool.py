@@ -0,0 +1,130 @@
+"""
+    SQLiteConnectionPool
+    =================================================================
+    Codeculate ve jsonculate database yöneticilerinin ortak kullandığı
+    SQLite bağlantı havuzudur. Her metot çağrısında yeni bağlantı açıp
+    kapatmak yerine açık bağlantılar havuzda tutulur ve yeniden kullanılır.
+
+    Özellikler:
+    - WAL journal modu (okuyucular yazıcıları, yazıcılar okuyucuları bloklamaz)
+    - synchronous=NORMAL, cache_size, temp_store ve busy_timeout ayarları
+    - Bağlantı başına hazırlanmış (prepared) statement önbelleği
+    - Sınırlı sayıda bağlantı; havuz boşsa bağlantı bekleme (busy_timeout
+      içinde bağlantı boşalmazsa sqlite3.OperationalError)
+    - Okuma ve transaction için context manager'lar
+    - Eski veritabanlarına eksik kolonları ekleyen ortak şema yardımcıları
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Set
+from config.logging_config import setup_logger
+
+logger = setup_logger('sqlite_pool')
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHE_SIZE_KB = 16 * 1024  # Bağlantı başına 16MB sayfa önbelleği
+DEFAULT_CACHED_STATEMENTS = 256
+
+################========== SQLiteConnectionPool ==========################
+class SQLiteConnectionPool:
+    def __init__(
+        self,
+        db_path: str,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cache_size_kb: int = DEFAULT_CACHE_SIZE_KB
+    ):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    ################ Ayarları yapılmış yeni bir bağlantı açar ################
+    def _create_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=DEFAULT_CACHED_STATEMENTS
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{self.cache_size_kb}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        logger.debug(f"Opened new SQLite connection to {self.db_path}")
+        return conn
+
+    ################ Havuzdan bir bağlantı alır, gerekirse yenisini açar ################
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.max_connections:
+                conn = self._create_connection()
+                self._all.append(conn)
+                return conn
+
+        # Havuz dolu, boşa çıkan bir bağlantıyı bekle
+        try:
+            return self._idle.get(timeout=self.busy_timeout_ms / 1000)
+        except queue.Empty:
+            logger.error(f"SQLite connection pool for {self.db_path} exhausted ({self.max_connections} connections in use)")
+            raise sqlite3.OperationalError("database connection pool exhausted") from None
+
+    ################ Bağlantıyı havuza geri bırakır ################
+    def _release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    ################ Okuma işlemleri için bağlantı verir ################
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    ################ Yazma işlemleri için transaction açar; hata olursa geri alır ################
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._release(conn)
+
+    ################ Havuzdaki tüm bağlantıları kapatır ################
+    def close_all(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+            self._idle = queue.LifoQueue()
+        logger.info(f"Closed all SQLite connections to {self.db_path}")
+
+################ Tablonun kolon adlarını döndürür ################
+def table_columns(cursor: sqlite3.Cursor, table: str) -> Set[str]:
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+################ Tabloda eksik olan kolonları ekler ################
+def ensure_columns(cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]):
+    existing = table_columns(cursor, table)
+    for name, definition in columns.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+            logger.info(f"Added missing column {table}.{name}")
@@ -0,0 +1,335 @@
+"""
+    JobManager
+    =================================================================
+    Codeculate ve jsonculate çalıştırmalarını Flask istek thread'i dışında,
+    ayrı worker süreçlerinde yürüten asenkron iş (job) kuyruğudur. İstek
+    hemen bir job id ile döner; sonuç daha sonra sorgulanır veya SSE ile
+    takip edilir.
+
+    Özellikler:
+    - Sınırlı kuyruk (dolu ise QueueFullError -> 429)
+    - Ayarlanabilir sayıda worker süreci
+    - Job durumu: queued, running, completed, failed, cancelled
+    - Henüz başlamamış job'ları iptal etme
+    - Süre sınırını aşan çalışan job'ların worker sürecini sonlandırma
+    - Bir worker süreci beklenmedik şekilde ölürse havuzun yeniden kurulması
+      (çalışan job'lar açık bir hata ile 'failed' olur, henüz başlamamış
+      job'lar yeni havuza bir kez yeniden eklenir)
+
+    Not: ProcessPoolExecutor tek bir worker'ın ölümünde tüm havuzu bozar. Süre
+    sınırını aşan job'ın worker'ı sonlandırıldığında aynı anda çalışan diğer
+    job'lar da WORKER_LOST_ERROR ile 'failed' olur.
+    - Biten job'ların sınırlı sayıda saklanması
+"""
+
+import os
+import time
+import uuid
+import signal
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional
+from config.logging_config import setup_logger
+
+logger = setup_logger('job_manager')
+
+DEFAULT_MAX_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+DEFAULT_MAX_PENDING = 32
+DEFAULT_MAX_FINISHED = 1000
+# Çalışan bir job'ın worker süreci sonlandırılmadan önce çalışabileceği en uzun süre
+DEFAULT_MAX_RUNTIME_SECONDS = 600
+WATCHDOG_INTERVAL_SECONDS = 1.0
+
+WORKER_LOST_ERROR = "Job worker process terminated unexpectedly; the worker pool was restarted"
+
+JOB_KINDS = ('codeculate', 'jsonculate')
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+################ Kuyruk dolu olduğunda fırlatılır ################
+class QueueFullError(Exception):
+    pass
+
+################ Worker süreçlerinde kullanılan nesneler ################
+_worker_state: Dict[str, Any] = {}
+
+################ Worker süreci başlarken database, önbellek ve ölçüm nesnelerini oluşturur ################
+def _init_worker(started_queue):
+    from codeculate.codeculate_db_manager import CodeculateDBManager
+    from jsonculate.jsonculate_db_manager import JSONculateDBManager
+    from codeculate.build_cache import BuildCache
+    from measurement.emissions_service import get_emissions_service
+
+    _worker_state['codeculate_db'] = CodeculateDBManager()
+    _worker_state['jsonculate_db'] = JSONculateDBManager()
+    _worker_state['build_cache'] = BuildCache()
+    _worker_state['started_queue'] = started_queue
+
+    # Her worker kendi ölçüm servislerini bir kez başlatır ve job'lar boyunca açık tutar
+    get_emissions_service('machine').start()
+    get_emissions_service('process').start()
+    logger.info(f"Job worker {os.getpid()} initialized")
+
+################ Worker sürecinde job'ı çalıştırır ################
+def _run_job(job_id: str, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    # Süre sınırı, job gerçekten başladığında işlemeye başlar. SimpleQueue.put
+    # eşzamanlı yazar; worker bu noktadan sonra ölse bile bildirim kaybolmaz.
+    _worker_state['started_queue'].put((job_id, os.getpid(), time.time()))
+
+    if kind == 'codeculate':
+        from codeculate.code_executor import CodeExecutor
+
+        executor = CodeExecutor(build_cache=_worker_state['build_cache'])
+        return executor.process(
+            params['code'],
+            params['language'],
+            params['repeat'],
+            params['scale_threshold'],
+            timeout=params.get('timeout', 30),
+            db_manager=_worker_state['codeculate_db'],
+            execution_mode=params.get('execution_mode', 'subprocess'),
+            energy_backend=params.get('energy_backend', 'codecarbon'),
+            parallelism=params.get('parallelism', 1),
+            pin_cpus=params.get('pin_cpus', False),
+            similarity_threshold=params.get('similarity_threshold'),
+            output_mode=params.get('output_mode', 'truncate'),
+            **params.get('sampling', {})
+        )
+
+    if kind == 'jsonculate':
+        from jsonculate.json_parser import JSONParser
+
+        parser = JSONParser()
+        return parser.parse_json(
+            params['json'],
+            params['repeat'],
+            scale_threshold=params['scale_threshold'],
+            db_manager=_worker_state['jsonculate_db'],
+            energy_backend=params.get('energy_backend', 'codecarbon'),
+            isolation=params.get('isolation', 'none'),
+            **params.get('sampling', {}),
+            **params.get('workload', {})
+        )
+
+    raise ValueError(f"Unsupported job kind: {kind}")
+
+################========== Job ==========################
+class Job:
+    def __init__(self, kind: str, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params: Optional[Dict[str, Any]] = params
+        self.requeued = False
+        self.future: Optional[Future] = None
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.worker_pid: Optional[int] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+    ################ Job'ın güncel durumunu döndürür ################
+    @property
+    def status(self) -> str:
+        if self.future.cancelled():
+            return 'cancelled'
+        # Sonuç _on_done içinde saklanana kadar job çalışıyor sayılır
+        if self.finished_at is not None:
+            return 'failed' if self.error is not None else 'completed'
+        if self.future.running() or self.future.done():
+            return 'running'
+        return 'queued'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error
+        }
+
+################========== JobManager ==========################
+class JobManager:
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_finished: int = DEFAULT_MAX_FINISHED,
+        max_runtime: float = DEFAULT_MAX_RUNTIME_SECONDS
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.max_runtime = max_runtime
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool, self._started_queue = self._new_pool()
+        self._stopped = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name='job-watchdog', daemon=True)
+        self._watchdog.start()
+        logger.info(f"JobManager initialized with {max_workers} workers (max pending: {max_pending}, max runtime: {max_runtime}s)")
+
+    ################ Yeni bir worker havuzu ve başlama bildirim kuyruğu oluşturur ################
+    def _new_pool(self):
+        context = multiprocessing.get_context('spawn')
+        started_queue = context.SimpleQueue()
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(started_queue,)
+        )
+        return pool, started_queue
+
+    ################ Bozulan havuzu yenisiyle değiştirir (çağıran kilidi tutmalıdır) ################
+    def _replace_pool(self):
+        # Eski kuyruktaki başlama bildirimleri kaybolmasın; başlamış job'lar yeniden eklenmez
+        self._drain_started()
+        broken_pool = self._pool
+        self._pool, self._started_queue = self._new_pool()
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Job worker pool was broken and has been restarted")
+
+    ################ Job'ın çalıştığı havuz hâlâ güncelse yeniler (aynı havuzdaki diğer job'lar tekrar yenilemez) ################
+    def _restart_pool(self, broken_pool: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is broken_pool:
+                self._replace_pool()
+
+    ################ Yeni bir job'ı kuyruğa ekler ################
+    def submit(self, kind: str, params: Dict[str, Any]) -> Job:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unsupported job kind: {kind}")
+
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if not job.future.done())
+            if pending >= self.max_pending:
+                logger.warning(f"Job queue is full ({pending}/{self.max_pending}), rejecting {kind} job")
+                raise QueueFullError(f"Job queue is full ({self.max_pending} pending jobs)")
+
+            job = Job(kind, params)
+            try:
+                job.future = self._pool.submit(_run_job, job.id, kind, params)
+            except BrokenProcessPool:
+                # Bir worker beklenmedik şekilde öldüyse havuz kalıcı olarak bozulur; yenisiyle tekrar dene
+                logger.warning(f"Job worker pool is broken, restarting it before submitting {kind} job")
+                self._replace_pool()
+                job.future = self._pool.submit(_run_job, job.id, kind, params)
+            job.pool = self._pool
+            self._jobs[job.id] = job
+
+        job.future.add_done_callback(lambda f: self._on_done(job))
+        logger.info(f"Submitted {kind} job {job.id} ({pending + 1}/{self.max_pending} pending)")
+        return job
+
+    ################ Havuz bozulduğunda henüz başlamamış job'ı yeni havuza bir kez yeniden ekler ################
+    def _requeue(self, job: Job) -> bool:
+        with self._lock:
+            if job.requeued or job.started_at is not None:
+                return False
+            try:
+                future = self._pool.submit(_run_job, job.id, job.kind, job.params)
+            except BrokenProcessPool:
+                return False
+            job.requeued = True
+            job.pool = self._pool
+            job.future = future
+
+        future.add_done_callback(lambda f: self._on_done(job))
+        logger.info(f"Requeued {job.kind} job {job.id} after worker pool restart")
+        return True
+
+    ################ Job'ı id ile döndürür ################
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    ################ Henüz başlamamış bir job'ı iptal eder ################
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None:
+            return False
+        cancelled = job.future.cancel()
+        logger.info(f"Cancel requested for job {job_id}: {'cancelled' if cancelled else 'already ' + job.status}")
+        return cancelled
+
+    ################ Worker'lardan gelen başlama bildirimlerini işler ve süre sınırını uygular ################
+    def _watch(self):
+        while not self._stopped.wait(WATCHDOG_INTERVAL_SECONDS):
+            try:
+                with self._lock:
+                    self._drain_started()
+            except Exception as e:
+                logger.error(f"Job watchdog failed to read start notifications: {str(e)}")
+            self._enforce_time_limit()
+
+    ################ Güncel kuyruktaki başlama bildirimlerini job'lara işler (çağıran kilidi tutmalıdır) ################
+    def _drain_started(self):
+        while not self._started_queue.empty():
+            job_id, pid, started_at = self._started_queue.get()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.worker_pid = pid
+                job.started_at = started_at
+
+    ################ Süre sınırını aşan job'ların worker sürecini sonlandırır ################
+    def _enforce_time_limit(self):
+        now = time.time()
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.started_at is not None and job.error is None and not job.future.done()
+                and now - job.started_at > self.max_runtime
+            ]
+
+        for job in expired:
+            job.error = f"Job exceeded the time limit of {self.max_runtime}s and was terminated"
+            logger.warning(f"Job {job.id} exceeded {self.max_runtime}s, terminating worker {job.worker_pid}")
+            try:
+                # Çalışan bir future iptal edilemez; worker'ı sonlandırmak havuzu bozar ve _on_done havuzu yeniler.
+                # Havuzdaki diğer çalışan job'lar da WORKER_LOST_ERROR ile sonlanır.
+                os.kill(job.worker_pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+            except (ProcessLookupError, PermissionError, OSError) as e:
+                logger.error(f"Failed to terminate worker {job.worker_pid} of job {job.id}: {str(e)}")
+
+    ################ Job bittiğinde sonucu saklar ve eski job'ları temizler ################
+    def _on_done(self, job: Job):
+        finished_at = time.time()
+        try:
+            job.result = job.future.result()
+            job.error = None
+            logger.info(f"Job {job.id} completed in {finished_at - job.submitted_at:.2f}s")
+        except CancelledError:
+            logger.info(f"Job {job.id} cancelled")
+        except BrokenProcessPool:
+            # Süre sınırı nedeniyle sonlandırılan job kendi hatasını korur
+            self._restart_pool(job.pool)
+            if job.error is None and self._requeue(job):
+                return
+            if job.error is None:
+                job.error = WORKER_LOST_ERROR
+            logger.error(f"Job {job.id} failed: {job.error}")
+        except Exception as e:
+            job.error = str(e)
+            logger.error(f"Job {job.id} failed: {str(e)}")
+        # Sonuç/hata saklandıktan sonra job'ı bitmiş olarak işaretle
+        job.finished_at = finished_at
+        job.params = None
+
+        with self._lock:
+            finished = [j for j in self._jobs.values() if j.future.done()]
+            for old_job in finished[:max(0, len(finished) - self.max_finished)]:
+                del self._jobs[old_job.id]
+
+    ################ Worker süreçlerini kapatır ################
+    def shutdown(self):
+        self._stopped.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("JobManager shut down")
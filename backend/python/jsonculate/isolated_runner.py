@@ -0,0 +1,244 @@
+"""
+    IsolatedRunner
+    =================================================================
+    Jsonculate'te her parser'ın ölçümünü kendi yeni (spawn) worker sürecinde
+    çalıştıran yardımcılardır. Aynı süreçte art arda yapılan ölçümlerde her
+    parser bir öncekinden kalan heap durumunu, GC yükünü ve CPU frekansını
+    devralır; ayrı süreçlerde bu etkiler ortadan kalkar.
+
+    Modlar:
+    - none: Tüm parser'lar bu süreçte sırayla ölçülür (önceki davranış)
+    - parallel: Parser worker'ları aynı anda, mümkünse ayrı CPU'lara
+      sabitlenmiş olarak çalışır; toplam süre en yavaş parser kadardır
+    - interleaved: Tekrarlar INTERLEAVED_ROUNDS tura bölünür; her turda
+      parser'lar rastgele sırayla, birer birer kendi worker'larında çalışır
+
+    Worker'lar başlatılıp hazır olduklarını bildirdikten sonra ölçüm aralığı
+    açılır; süreç başlatma ve import maliyeti ölçüme girmez. Worker'lar bu
+    sürecin beklenmiş alt süreçleri olmadığından ölçüm makine genelindeki
+    servisle yapılır ve aralığın emisyonu worker'ın ölçülen CPU süresi payı
+    kadar parser'a atanır (codeculate'teki gibi).
+
+    Her worker yalnızca tek bir parser çalıştırdığından sürecin en yüksek
+    RSS değeri o parser'ın bellek tepe noktasıdır; sonuçta worker hazır
+    olduğundaki değer (baseline_rss_bytes) ile birlikte peak_rss_bytes olarak
+    döner. Dosya girdisinde worker'a belge yerine dosya yolu verilir.
+
+    resource modülü olmayan platformlarda (Windows) worker'ın CPU süresi ve
+    bellek tepe noktası ölçülemez; bu platformlarda yalıtım desteklenmez ve
+    ölçüm API sürecinde yapılır (bkz. is_isolation_supported).
+"""
+
+import os
+import sys
+import time
+import random
+import multiprocessing
+from multiprocessing.connection import wait
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set
+from config.logging_config import setup_logger
+from measurement.cpu_accounting import attribute_emissions
+from codeculate.process_runner import available_cpus, is_pinning_supported, plan_shards
+from .json_workload import run_workload, run_file_workload, throughput
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = setup_logger('isolated_runner')
+
+ISOLATION_MODES = ('none', 'parallel', 'interleaved')
+INTERLEAVED_ROUNDS = 5
+WORKER_START_TIMEOUT_SECONDS = 60
+WORKER_STOP_TIMEOUT_SECONDS = 5
+
+# ru_maxrss Linux'ta KB, macOS'ta byte cinsindendir
+_MAX_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+################ Parser'ların ayrı worker süreçlerinde ölçülüp ölçülemeyeceğini döndürür ################
+def is_isolation_supported() -> bool:
+    # Emisyon worker'ın CPU süresi payına göre atandığından getrusage gerekir
+    return resource is not None
+
+################ Sürecin şimdiye kadarki en yüksek RSS değerini byte olarak döndürür (ölçülemiyorsa None) ################
+def _max_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAX_RSS_UNIT
+
+################ Sürecin kullanıcı + sistem CPU süresini döndürür ################
+def _cpu_seconds() -> float:
+    if resource is None:
+        return time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+################ Worker süreci: hazır olduğunu bildirir, istenen tekrar sayısı kadar iş yükünü çalıştırır ################
+def _worker_main(conn, parser: str, json_str: str, workload: Dict[str, Any], cpus: Optional[Set[int]]):
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+    # Dosya girdisinde json_str belgenin dosya yoludur
+    run = run_file_workload if workload['input_type'] == 'file' else run_workload
+    baseline_rss = _max_rss()
+    conn.send(('ready', None))
+    while True:
+        count = conn.recv()
+        if count is None:
+            break
+        try:
+            before = _cpu_seconds()
+            stats = run(parser, json_str, count, workload)
+            stats['cpu_seconds'] = _cpu_seconds() - before
+            stats['baseline_rss_bytes'] = baseline_rss
+            stats['peak_rss_bytes'] = _max_rss()
+            conn.send(('result', stats))
+        except Exception as e:
+            conn.send(('error', e))
+    conn.close()
+
+################========== ParserWorker ==========################
+class ParserWorker:
+    def __init__(self, context, parser: str, json_str: str, workload: Dict[str, Any], cpus: Optional[Set[int]] = None):
+        self.parser = parser
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, parser, json_str, workload, cpus),
+            name=f'jsonculate-{parser}',
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    ################ Worker'ın hazır olmasını bekler ################
+    def wait_ready(self):
+        if not self.conn.poll(WORKER_START_TIMEOUT_SECONDS):
+            raise TimeoutError(f"{self.parser} worker did not start within {WORKER_START_TIMEOUT_SECONDS}s")
+        self.receive()
+
+    ################ Worker'a verilen tekrar sayısını çalıştırmasını söyler ################
+    def start(self, count: int):
+        self.conn.send(count)
+
+    ################ Worker'ın cevabını alır; worker'daki hata burada fırlatılır ################
+    def receive(self) -> Any:
+        try:
+            kind, payload = self.conn.recv()
+        except EOFError:
+            raise RuntimeError(f"{self.parser} worker exited unexpectedly (exit code: {self.process.exitcode})")
+        if kind == 'error':
+            raise payload
+        return payload
+
+    ################ Worker'ı kapatır ################
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(WORKER_STOP_TIMEOUT_SECONDS)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+################ Her parser için bir worker başlatır ve hazır olmalarını bekler ################
+@contextmanager
+def parser_workers(parsers: List[str], json_str: str, workload: Dict[str, Any], pin_cpus: bool = False) -> Iterator[Dict[str, ParserWorker]]:
+    context = multiprocessing.get_context('spawn')
+    cpus: List[Optional[Set[int]]] = [None] * len(parsers)
+    if pin_cpus:
+        if is_pinning_supported():
+            machine_cpus = available_cpus()
+            if len(machine_cpus) < len(parsers):
+                logger.warning(f"Only {len(machine_cpus)} CPU(s) for {len(parsers)} parsers, some workers share a CPU")
+            cpus = [{machine_cpus[i % len(machine_cpus)]} for i in range(len(parsers))]
+        else:
+            logger.warning("CPU pinning is not supported on this platform, running parser workers unpinned")
+
+    workers: Dict[str, ParserWorker] = {}
+    try:
+        for parser, parser_cpus in zip(parsers, cpus):
+            workers[parser] = ParserWorker(context, parser, json_str, workload, parser_cpus)
+        for worker in workers.values():
+            worker.wait_ready()
+        yield workers
+    finally:
+        for worker in workers.values():
+            worker.close()
+
+################ Worker'da verilen tekrar sayısını kendi ölçüm aralığında çalıştırır ################
+def measure_once(worker: ParserWorker, energy, count: int) -> Dict[str, Any]:
+    span = energy.begin_span(f"jsonculate:{worker.parser}")
+    worker.start(count)
+    try:
+        stats = worker.receive()
+    finally:
+        measurement = energy.end_span(span)
+    return _sample_result(worker.parser, count, stats, measurement)
+
+################ Parser worker'larını aynı anda çalıştırır ################
+def run_parallel(workers: Dict[str, ParserWorker], repeat: int, energy) -> Dict[str, Dict[str, Any]]:
+    spans = {}
+    for parser, worker in workers.items():
+        spans[parser] = energy.begin_span(f"jsonculate:{parser}")
+        worker.start(repeat)
+
+    # Her parser'ın aralığı kendi sonucu geldiğinde kapatılır
+    samples: Dict[str, List[Dict[str, Any]]] = {}
+    pending = {worker.conn: parser for parser, worker in workers.items()}
+    while pending:
+        for conn in wait(list(pending)):
+            parser = pending.pop(conn)
+            try:
+                stats = workers[parser].receive()
+            finally:
+                measurement = energy.end_span(spans[parser])
+            samples[parser] = [_sample_result(parser, repeat, stats, measurement)]
+    return {parser: _combine_samples(parser, repeat, samples[parser]) for parser in workers}
+
+################ Tekrarları turlara bölüp her turda parser'ları rastgele sırayla çalıştırır ################
+def run_interleaved(workers: Dict[str, ParserWorker], repeat: int, energy, rounds: int = INTERLEAVED_ROUNDS) -> Dict[str, Dict[str, Any]]:
+    samples: Dict[str, List[Dict[str, Any]]] = {parser: [] for parser in workers}
+    for _, count in plan_shards(repeat, rounds):
+        order = random.sample(list(workers), len(workers))
+        logger.debug(f"Interleaved round order: {', '.join(order)}")
+        for parser in order:
+            samples[parser].append(measure_once(workers[parser], energy, count))
+    return {parser: _combine_samples(parser, repeat, samples[parser]) for parser in workers}
+
+################ Worker istatistiklerini ve ölçümü bir örnek sonucuna çevirir ################
+def _sample_result(parser: str, count: int, stats: Dict[str, Any], measurement: Dict[str, Any]) -> Dict[str, Any]:
+    emissions = attribute_emissions(measurement, stats['cpu_seconds'])
+    return {
+        "parser": parser,
+        "duration": measurement['duration'],
+        "emissions": emissions or 0,
+        "repeat": count,
+        **stats,
+        **throughput(stats["operation_ns"], stats["operations"], stats["bytes"])
+    }
+
+################ Örneklerin en yüksek RSS değerini döndürür (ölçülemediyse None) ################
+def peak_rss(samples: List[Dict[str, Any]]) -> Optional[int]:
+    values = [sample["peak_rss_bytes"] for sample in samples if sample.get("peak_rss_bytes") is not None]
+    return max(values) if values else None
+
+################ Bir parser'ın örneklerini tek bir sonuçta birleştirir ################
+def _combine_samples(parser: str, repeat: int, samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    totals = {
+        key: sum(sample[key] for sample in samples)
+        for key in ('duration', 'emissions', 'operation_ns', 'operations', 'bytes', 'cpu_seconds')
+    }
+    result = {
+        "parser": parser,
+        "repeat": repeat,
+        **totals,
+        **throughput(totals["operation_ns"], totals["operations"], totals["bytes"]),
+        "baseline_rss_bytes": samples[0]["baseline_rss_bytes"],
+        "peak_rss_bytes": peak_rss(samples)
+    }
+    logger.info(f"{parser} isolated result: {result['duration']:.2f}s, {result['emissions']:.6f}g CO2 over {len(samples)} run(s)")
+    return result
@@ -7,57 +7,123 @@
     ölçülür.
 
     Özellikler:
-    - JSON Parse eder.
-    - Kodun karbon salınımını ölçer.
+    - Kayıt defterindeki kurulu parser'ları (json, orjson, ujson ve varsa
+      msgspec, rapidjson, simdjson) ölçer; iş yükünü desteklemeyenleri atlar.
+    - JSON Parse eder; her parser'da aynı iş yükünü (loads, dumps veya
+      roundtrip; str/bytes girdi, indent ve sort_keys seçenekleri) çalıştırır.
+    - Her işlemi perf_counter_ns ile ölçer; parser başına MB/s ve işlem/s
+      verimini döndürür.
+    - İsteğe bağlı olarak her parser'ı kendi yeni worker sürecinde, aynı anda
+      (ayrı CPU'larda) ya da rastgele sıralı turlarla ölçer (isolation).
+    - Yüklenen büyük belgeleri (parse_file) dosyadan, bellek içi,
+      memory-mapped ve akışlı parser'larla ölçer; her parser kendi worker'ında
+      çalıştığından parser başına bellek tepe noktası (peak RSS) döner.
+    - Kodun karbon salınımını ölçer (ortak, sürekli açık ölçüm servisi ile).
+    - İsteğe bağlı olarak her parser için güven aralığı hedefe inene kadar
+      örnek alır (adaptive sampling) ve sonucu ekstrapole eder.
+    - Aynı anda gelen birebir aynı istekleri birleştirir; ölçüm bir kez
+      çalıştırılır ve diğer istekler sonucunu bekler (single-flight).
     - Sonucu döndürür (frontend'e).
 """
 
-import json
-import orjson
-import ujson
-import time
-from codecarbon import EmissionsTracker
-from typing import Dict, Any, Union
+import random
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, Union
+from measurement.emissions_service import EmissionsService, get_emissions_service
+from measurement.energy_backends import DEFAULT_ENERGY_BACKEND, resolve_energy_backend
+from measurement.adaptive_sampling import (
+    SAMPLING_MODES, CONFIDENCE_LEVEL, DEFAULT_TARGET_RELATIVE_ERROR, DEFAULT_TIME_BUDGET_SECONDS,
+    AdaptiveSampler, summarize_confidence_interval, interval
+)
+from common.single_flight import SingleFlight
+from .json_workload import DEFAULT_WORKLOAD, build_workload, run_workload, run_file_workload, throughput
+from .parser_registry import get_parsers, parsers_for
+from .isolated_runner import (
+    ISOLATION_MODES, is_isolation_supported, parser_workers, measure_once, run_parallel, run_interleaved, peak_rss
+)
+from .json_upload import UploadedDocument
 from config.logging_config import setup_logger
 
 logger = setup_logger('json_parser')
 
+# Bu süreçte aynı anda çalışan birebir aynı ölçümler tek bir çalıştırmada birleştirilir
+_flights = SingleFlight('jsonculate')
+
+# Adaptive örneklemede bir örnekte çalıştırılan tekrar sayısı
+SAMPLE_SIZE = 10
+
+################ İş yüküne verilecek girdiyi döndürür (yüklenen belgelerde dosya yolu) ################
+def _document_source(document: Union[str, UploadedDocument]) -> str:
+    return document.path if isinstance(document, UploadedDocument) else document
+
 ################========== JSONParser ==========################
 class JSONParser:
-    def __init__(self):
-        self.parsers = {
-            'json': self._parse_with_json,
-            'orjson': self._parse_with_orjson,
-            'ujson': self._parse_with_ujson
-        }
-        logger.info("JSONParser initialized with standard, orjson, and ujson parsers")
+    def __init__(self, emissions_service: EmissionsService = None):
+        # Ölçümler yalnızca bu sürecin tüketimini ölçen ortak tracker üzerinde alınır
+        self.emissions = emissions_service or get_emissions_service('process')
+        self.parsers = list(get_parsers())
+        logger.info(f"JSONParser initialized with parsers: {', '.join(self.parsers)}")
+
+    def parse_json(self, json_str: Union[str, UploadedDocument], repeat: int, scale_threshold: int = 10000, db_manager=None, energy_backend: str = DEFAULT_ENERGY_BACKEND, sampling: str = 'fixed', target_relative_error: float = DEFAULT_TARGET_RELATIVE_ERROR, time_budget: float = DEFAULT_TIME_BUDGET_SECONDS, operation: str = DEFAULT_WORKLOAD['operation'], input_type: str = DEFAULT_WORKLOAD['input_type'], indent: Optional[int] = DEFAULT_WORKLOAD['indent'], sort_keys: bool = DEFAULT_WORKLOAD['sort_keys'], isolation: str = 'none') -> Dict[str, Any]:
+        if sampling not in SAMPLING_MODES:
+            raise ValueError(f"Unsupported sampling mode: {sampling}. Supported: {', '.join(SAMPLING_MODES)}")
+        if isolation not in ISOLATION_MODES:
+            raise ValueError(f"Unsupported isolation mode: {isolation}. Supported: {', '.join(ISOLATION_MODES)}")
+        if isolation != 'none' and not is_isolation_supported():
+            logger.warning(f"Isolated parser workers are not supported on this platform, ignoring isolation '{isolation}'")
+            isolation = 'none'
+        workload = build_workload(operation, input_type, indent, sort_keys)
+        if workload['input_type'] == 'file' and not isinstance(json_str, UploadedDocument):
+            raise ValueError("File input is only available for uploaded documents")
+        parsers = parsers_for(workload)
+        sampler = AdaptiveSampler(target_relative_error, time_budget) if sampling == 'adaptive' else None
 
-    def parse_json(self, json_str: str, repeat: int, scale_threshold: int = 10000, db_manager=None) -> Dict[str, Any]:
         try:
-            logger.info(f"Starting JSON parsing with {repeat} repetitions (threshold: {scale_threshold})")
-            logger.debug(f"Input JSON size: {len(json_str)} bytes")
+            logger.info(f"Starting JSON parsing with {repeat} repetitions (threshold: {scale_threshold}, energy: {energy_backend}, sampling: {sampling}, workload: {workload}, isolation: {isolation})")
+            logger.debug(f"Input JSON size: {json_str.size if isinstance(json_str, UploadedDocument) else len(json_str)} bytes")
+
+            # Ayrı worker süreçleri bu sürecin ölçümüne girmez; makine genelinde ölçülüp CPU payına göre atanır
+            emissions_service = self.emissions
+            if isolation != 'none':
+                emissions_service = get_emissions_service('machine')
+                # procfs yalnızca bu sürecin beklediği alt süreçleri görür
+                if energy_backend == 'procfs':
+                    logger.warning("procfs backend cannot observe parser worker processes, falling back to codecarbon")
+                    energy_backend = DEFAULT_ENERGY_BACKEND
+
+            # Enerji backend'ini seç; bu makinede kullanılamıyorsa codecarbon kullanılır
+            energy_backend, energy = resolve_energy_backend(energy_backend, emissions_service)
 
             # Database'de benzer JSON var ise benzer JSON'un sonuçlarını döndür
-            existing_report = db_manager.get_existing_report(json_str, repeat, scale_threshold)
+            existing_report = db_manager.get_existing_report(json_str, repeat, scale_threshold, energy_backend, sampling, target_relative_error, workload, parsers, isolation)
             if existing_report:
                 logger.info("Found cached results, returning from database")
+                parser_results = existing_report["parser_results"]
                 return {
                     "repeat": existing_report["repeat"],
-                    "json": {
-                        "emissions": existing_report["json_emissions"],
-                        "duration": existing_report["json_duration"]
-                    },
-                    "orjson": {
-                        "emissions": existing_report["orjson_emissions"],
-                        "duration": existing_report["orjson_duration"]
-                    },
-                    "ujson": {
-                        "emissions": existing_report["ujson_emissions"],
-                        "duration": existing_report["ujson_duration"]
+                    **{
+                        parser: {
+                            "emissions": parser_results[parser]["emissions"],
+                            "duration": parser_results[parser]["duration"],
+                            "throughput_mb_s": parser_results[parser]["throughput_mb_s"],
+                            "ops_per_second": parser_results[parser]["ops_per_second"],
+                            "confidence_interval": self._cached_confidence_interval(existing_report, parser_results[parser]),
+                            # Bellek tepe noktası yalnızca worker'da ölçülen sonuçlarda vardır
+                            **{
+                                key: value for key, value in parser_results[parser].items()
+                                if key.endswith('_rss_bytes') and value is not None
+                            }
+                        }
+                        for parser in parsers
                     },
+                    "parsers": parsers,
+                    "workload": workload,
+                    "isolation": isolation,
                     "from_cache": True,
                     "scaled": existing_report["is_scaled"],
                     "scale_threshold": existing_report["scale_threshold"],
+                    "energy_backend": energy_backend,
+                    "sampling": sampling,
                     "system_info": {
                         "cpu_model": existing_report["cpu_model"],
                         "cpu_count": existing_report["cpu_count"],
@@ -66,153 +132,176 @@ class JSONParser:
                     }
                 }
             
-            # Ölçeklendirme eşiğinden büyük tekrarlar için ayar
-            actual_repeat = min(scale_threshold, repeat)
-            scale_factor = repeat / actual_repeat if repeat > scale_threshold else 1
-            
-            if repeat > scale_threshold:
-                logger.info(f"Scaling enabled: actual_repeat={actual_repeat}, scale_factor={scale_factor}")
-            
-            # Tüm parser'lar için ölçüm yap
-            logger.info("Starting measurements for all parsers")
-            results = {
-                "repeat": repeat,
-                "json": self._parse_with_json(json_str, actual_repeat),
-                "orjson": self._parse_with_orjson(json_str, actual_repeat),
-                "ujson": self._parse_with_ujson(json_str, actual_repeat)
-            }
-            
-            # Ölçeklendirme eşiğinden büyük tekrarlar için sonuçları ölçekle
-            if repeat > scale_threshold:
-                logger.info("Applying scaling to results")
-                for parser in ["json", "orjson", "ujson"]:
-                    results[parser]["emissions"] *= scale_factor
-                    results[parser]["duration"] *= scale_factor
-                results["scaled"] = True
-                results["scale_threshold"] = scale_threshold
-            
-            # Sonuçları kaydet
-            if db_manager:
-                logger.info("Saving results to database")
-                db_manager.save_report(results, json_str, scale_threshold)
-            
-            logger.info("JSON parsing completed successfully")
-            return results
+            # Aynı JSON şu an ölçülüyorsa tekrar ölçmek yerine sonucunu bekle
+            flight_key = db_manager.cache_key(json_str, repeat, scale_threshold, energy_backend, sampling, target_relative_error, workload, parsers, isolation)
+            results, is_shared = _flights.do(flight_key, lambda: self._measure(
+                json_str, repeat, scale_threshold, db_manager, energy_backend, energy, sampler, workload, parsers, isolation
+            ))
+            if is_shared:
+                logger.info("Returning result of an identical in-flight parsing run")
+            return dict(results, is_coalesced=is_shared)
 
         except Exception as e:
             logger.error(f"Error in parse_json: {str(e)}")
             raise
 
-    ################ json ile parse işlemi yapar ################
-    def _parse_with_json(self, json_str: str, repeat: int) -> Dict[str, Any]:
-        logger.info(f"Starting standard json parser measurement ({repeat} repetitions)")
-        tracker = EmissionsTracker(project_name="json_parsing", tracking_mode="process")
-        start_time = time.time()
+    ################ Yüklenen belgeyi dosyadan okuyan parser'larla ölçer ################
+    def parse_file(self, document: UploadedDocument, repeat: int, scale_threshold: int = 10000, db_manager=None, energy_backend: str = DEFAULT_ENERGY_BACKEND, sampling: str = 'fixed', target_relative_error: float = DEFAULT_TARGET_RELATIVE_ERROR, time_budget: float = DEFAULT_TIME_BUDGET_SECONDS, isolation: Optional[str] = None) -> Dict[str, Any]:
+        # Parser başına bellek tepe noktası yalnızca her parser kendi worker'ında çalışınca ölçülebilir;
+        # mod verilmezse destekleniyorsa interleaved kullanılır
+        if isolation is None:
+            isolation = 'interleaved' if is_isolation_supported() else 'none'
+        return self.parse_json(
+            document, repeat, scale_threshold=scale_threshold, db_manager=db_manager, energy_backend=energy_backend,
+            sampling=sampling, target_relative_error=target_relative_error, time_budget=time_budget,
+            operation='loads', input_type='file', isolation=isolation
+        )
+
+    ################ Tüm parser'ları ölçer, sonucu kaydeder ve döndürür ################
+    def _measure(self, json_str: Union[str, UploadedDocument], repeat: int, scale_threshold: int, db_manager, energy_backend: str, energy, sampler: Optional[AdaptiveSampler], workload: Dict[str, Any], parsers: List[str], isolation: str = 'none') -> Dict[str, Any]:
+        if sampler:
+            # Tekrar sayısı ölçeklendirme eşiğine göre değil, güven aralığına göre belirlenir
+            results = self._parse_adaptive(sampler, json_str, repeat, energy, workload, parsers, isolation)
+            results["energy_backend"] = energy_backend
+            results["workload"] = workload
+            results["parsers"] = parsers
+            results["isolation"] = isolation
+            if db_manager:
+                logger.info("Saving results to database")
+                db_manager.save_report(results, json_str, scale_threshold, energy_backend)
+            logger.info("JSON parsing completed successfully")
+            return results
+
+        # Ölçeklendirme eşiğinden büyük tekrarlar için ayar
+        actual_repeat = min(scale_threshold, repeat)
+        scale_factor = repeat / actual_repeat if repeat > scale_threshold else 1
         
-        try:
-            # Codecarbon'u başlat
-            tracker.start()
-            
-            # JSON işlemleri
-            data = json.loads(json_str)
-            for _ in range(repeat):
-                serialized = json.dumps(data)
-                json.loads(serialized)
-                # CPU kullanımını artırmak için
-                for i in range(1000):
-                    _ = str(data)
-
-            emissions = tracker.stop()
-            duration = time.time() - start_time
-            
-            logger.info(f"Standard json parser completed: {duration:.2f}s, {emissions:.6f}g CO2")
-            return {
-                "parser": "json",
-                "duration": duration,
-                "emissions": emissions or 0,
-                "repeat": repeat
-            }
-        except Exception as e:
-            logger.error(f"Error in standard json parser: {str(e)}")
-            raise
-        finally:
-            try:
-                tracker.stop()
-            except:
-                pass
-
-    ################ orjson ile parse işlemi yapar ################
-    def _parse_with_orjson(self, json_str: str, repeat: int) -> Dict[str, Any]:
-        logger.info(f"Starting orjson parser measurement ({repeat} repetitions)")
-        tracker = EmissionsTracker(project_name="json_parsing", tracking_mode="process")
-        start_time = time.time()
+        if repeat > scale_threshold:
+            logger.info(f"Scaling enabled: actual_repeat={actual_repeat}, scale_factor={scale_factor}")
         
-        try:
-            # Emisyon ölçümünü başlat
-            tracker.start()
-            
-            # JSON işlemleri
-            data = orjson.loads(json_str.encode())
-            for _ in range(repeat):
-                serialized = orjson.dumps(data)
-                orjson.loads(serialized)
-                # CPU kullanımını artırmak için
-                for i in range(1000):
-                    _ = str(data)
-
-            emissions = tracker.stop()
-            duration = time.time() - start_time
-            
-            logger.info(f"Orjson parser completed: {duration:.2f}s, {emissions:.6f}g CO2")
-            return {
-                "parser": "orjson",
-                "duration": duration,
-                "emissions": emissions or 0,
-                "repeat": repeat
-            }
-        except Exception as e:
-            logger.error(f"Error in orjson parser: {str(e)}")
-            raise
-        finally:
-            try:
-                tracker.stop()
-            except:
-                pass
-
-    ################ ujson ile parse işlemi yapar ################
-    def _parse_with_ujson(self, json_str: str, repeat: int) -> Dict[str, Any]:
-        logger.info(f"Starting ujson parser measurement ({repeat} repetitions)")
-        tracker = EmissionsTracker(project_name="json_parsing", tracking_mode="process")
-        start_time = time.time()
+        # Tüm parser'lar için ölçüm yap
+        logger.info(f"Starting measurements for all parsers (isolation: {isolation})")
+        if isolation == 'none':
+            measured = {parser: self._run_parser(parser, json_str, actual_repeat, workload, energy) for parser in parsers}
+        else:
+            with parser_workers(parsers, _document_source(json_str), workload, pin_cpus=(isolation == 'parallel')) as workers:
+                run = run_parallel if isolation == 'parallel' else run_interleaved
+                measured = run(workers, actual_repeat, energy)
+        results = {
+            "repeat": repeat,
+            **{parser: measured[parser] for parser in parsers},
+            "energy_backend": energy_backend,
+            "sampling": "fixed",
+            "workload": workload,
+            "parsers": parsers,
+            "isolation": isolation
+        }
         
+        # Ölçeklendirme eşiğinden büyük tekrarlar için sonuçları ölçekle (verim değerleri orandır, değişmez)
+        if repeat > scale_threshold:
+            logger.info("Applying scaling to results")
+            for parser in parsers:
+                results[parser]["emissions"] *= scale_factor
+                results[parser]["duration"] *= scale_factor
+                results[parser]["operation_time"] *= scale_factor
+            results["scaled"] = True
+            results["scale_threshold"] = scale_threshold
+        
+        # Sonuçları kaydet
+        if db_manager:
+            logger.info("Saving results to database")
+            db_manager.save_report(results, json_str, scale_threshold, energy_backend)
+        
+        logger.info("JSON parsing completed successfully")
+        return results
+
+    ################ Her parser için güven aralığı hedefe inene kadar örnek alır ve sonucu ekstrapole eder ################
+    def _parse_adaptive(self, sampler: AdaptiveSampler, json_str: Union[str, UploadedDocument], repeat: int, energy, workload: Dict[str, Any], parsers: List[str], isolation: str = 'none') -> Dict[str, Any]:
+        results = {"repeat": repeat, "sampling": "adaptive", "scaled": False}
+        # Yalıtımlı modlarda örnekler parser'ın kendi worker'ında, parser'lar rastgele sırayla alınır;
+        # örnekler sırayla alındığından parallel modu da aynı şekilde çalışır
+        order = random.sample(parsers, len(parsers)) if isolation != 'none' else parsers
+        workers_context = parser_workers(parsers, _document_source(json_str), workload) if isolation != 'none' else nullcontext({})
+        with workers_context as workers:
+            for name in order:
+                results[name] = self._sample_adaptive(sampler, name, json_str, repeat, energy, workload, workers.get(name))
+                # Ölçülen tekrar sayısı istenenden azsa sonuç ekstrapole edilmiştir
+                if results[name]["confidence_interval"]["iterations"] < repeat:
+                    results["scaled"] = True
+        return results
+
+    ################ Bir parser için adaptive örnekleme yapar (worker verilirse örnekler worker'da alınır) ################
+    def _sample_adaptive(self, sampler: AdaptiveSampler, name: str, json_str: str, repeat: int, energy, workload: Dict[str, Any], worker=None) -> Dict[str, Any]:
+        if worker is not None:
+            sample = lambda count, first: measure_once(worker, energy, count)
+        else:
+            sample = lambda count, first: self._run_parser(name, json_str, count, workload, energy)
+        sampling = sampler.run(sample, repeat, SAMPLE_SIZE)
+        # Verim, ölçülen tüm örneklerin işlem süresi ve byte toplamından hesaplanır
+        samples = sampling["results"]
+        rates = throughput(
+            sum(r["operation_ns"] for r in samples),
+            sum(r["operations"] for r in samples),
+            sum(r["bytes"] for r in samples)
+        )
+        logger.info(f"{name} adaptive result: {sampling['iterations']}/{repeat} iterations measured")
+        result = {
+            "parser": name,
+            "duration": sampling["duration_per_iteration"] * repeat,
+            "emissions": sampling["emissions_per_iteration"] * repeat,
+            "repeat": repeat,
+            "throughput_mb_s": rates["throughput_mb_s"],
+            "ops_per_second": rates["ops_per_second"],
+            "confidence_interval": summarize_confidence_interval(sampling, sampler.target_relative_error)
+        }
+        if worker is not None:
+            # Örneklerin hepsi aynı worker'da alındığından bellek tepe noktası parser'ındır
+            result["baseline_rss_bytes"] = samples[0]["baseline_rss_bytes"]
+            result["peak_rss_bytes"] = peak_rss(samples)
+        return result
+
+    ################ Önbellekteki adaptive kaydın bir parser sonucu için güven aralığını döndürür ################
+    @staticmethod
+    def _cached_confidence_interval(report: Dict[str, Any], result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if report.get("sampling_mode") != "adaptive":
+            return None
+        repeat = report["repeat"]
+        return {
+            "level": CONFIDENCE_LEVEL,
+            "iterations": result["sample_iterations"],
+            "avg_execution_time": interval(result["duration"] / repeat, result["duration_ci"]),
+            "avg_emissions": interval(result["emissions"] / repeat, result["emission_ci"]),
+            "relative_error": result["relative_error"],
+            "target_relative_error": report["target_relative_error"]
+        }
+
+    ################ İş yükünü verilen parser ile kendi ölçüm aralığında çalıştırır ################
+    def _run_parser(self, parser: str, json_str: Union[str, UploadedDocument], repeat: int, workload: Dict[str, Any], energy=None) -> Dict[str, Any]:
+        logger.info(f"Starting {parser} parser measurement ({repeat} repetitions, {workload['operation']})")
+        is_file = workload['input_type'] == 'file'
+        run = run_file_workload if is_file else run_workload
+
         try:
-            # Emisyon ölçümünü başlat
-            tracker.start()
-            
-            # JSON işlemleri
-            data = ujson.loads(json_str)
-            for _ in range(repeat):
-                serialized = ujson.dumps(data)
-                ujson.loads(serialized)
-                # CPU kullanımını artırmak için
-                for i in range(1000):
-                    _ = str(data)
-
-            emissions = tracker.stop()
-            duration = time.time() - start_time
-            
-            logger.info(f"Ujson parser completed: {duration:.2f}s, {emissions:.6f}g CO2")
-            return {
-                "parser": "ujson",
+            # Seçilen enerji backend'inde bir ölçüm aralığı başlat
+            with (energy or self.emissions).span(parser) as measurement:
+                stats = run(parser, _document_source(json_str), repeat, workload)
+
+            duration = measurement['duration']
+            emissions = measurement['emissions']
+
+            result = {
+                "parser": parser,
                 "duration": duration,
                 "emissions": emissions or 0,
-                "repeat": repeat
+                "repeat": repeat,
+                **stats,
+                **throughput(stats["operation_ns"], stats["operations"], stats["bytes"])
             }
+            if is_file:
+                # Parser'lar aynı süreçte ölçüldüğünde parser başına bellek tepe noktası ölçülemez
+                result["baseline_rss_bytes"] = result["peak_rss_bytes"] = None
+            logger.info(f"{parser} parser completed: {duration:.2f}s, {emissions:.6f}g CO2, {result['ops_per_second'] or 0:.0f} ops/s")
+            return result
         except Exception as e:
-            logger.error(f"Error in ujson parser: {str(e)}")
+            logger.error(f"Error in {parser} parser: {str(e)}")
             raise
-        finally:
-            try:
-                tracker.stop()
-            except:
-                pass
\ No newline at end of file
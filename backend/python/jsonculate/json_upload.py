@@ -0,0 +1,73 @@
+"""
+    JSONUpload
+    =================================================================
+    Jsonculate'e yüklenen büyük JSON belgelerini (yüzlerce MB) bellekte
+    tutmadan işleyen yardımcılardır. İstek gövdesi parça parça geçici bir
+    dosyaya yazılır; yazarken SHA-256 içerik hash'i ve boyut hesaplanır.
+
+    Belge ölçüm sırasında yalnızca parser worker'larında dosyadan okunur;
+    API sürecinde string olarak hiç tutulmaz. Veritabanına içerik yerine
+    yalnızca içerik hash'i ve boyutu kaydedilir. Geçici dosya istek
+    bittiğinde silinir.
+"""
+
+import os
+import hashlib
+import tempfile
+from typing import BinaryIO, Optional
+from config.logging_config import setup_logger
+
+logger = setup_logger('json_upload')
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+MAX_UPLOAD_BYTES = 2 * 1024 * 1024 * 1024
+
+################ Yüklenen belge boyut sınırını aştığında fırlatılır ################
+class UploadTooLargeError(ValueError):
+    pass
+
+################========== UploadedDocument ==========################
+class UploadedDocument:
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    ################ Geçici dosyayı siler ################
+    def remove(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'UploadedDocument':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.remove()
+
+################ Akıştaki belgeyi geçici dosyaya yazar, boyutunu ve SHA-256 hash'ini hesaplar ################
+def spill_upload(stream: BinaryIO, max_bytes: int = MAX_UPLOAD_BYTES, directory: Optional[str] = None) -> UploadedDocument:
+    fd, path = tempfile.mkstemp(prefix='jsonculate-', suffix='.json', dir=directory)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Uploaded document exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                f.write(chunk)
+        if size == 0:
+            raise ValueError("Uploaded document is empty")
+    except BaseException:
+        os.unlink(path)
+        raise
+
+    document = UploadedDocument(path, size, digest.hexdigest())
+    logger.info(f"Spilled uploaded document to {path} ({size} bytes, sha256 {document.sha256[:8]}...)")
+    return document
@@ -0,0 +1,142 @@
+"""
+    JSONWorkload
+    =================================================================
+    Jsonculate'in parser'ları karşılaştırırken çalıştırdığı iş yükünü
+    tanımlayan ve çalıştıran yardımcılardır. Her parser aynı işlemleri aynı
+    seçeneklerle yapar; parser'dan bağımsız ek iş (dolgu) yoktur, böylece
+    ölçülen fark yalnızca kütüphanelerin farkıdır.
+
+    İş yükü seçenekleri:
+    - operation: loads (yalnızca parse), dumps (yalnızca serialize) veya
+      roundtrip (her tekrarda parse + serialize)
+    - input_type: loads'a verilen girdinin tipi; str, UTF-8 bytes ya da file
+      (yüklenen büyük belge; her tekrarda diskteki dosyadan okunur, yalnızca
+      loads ile ölçülür)
+    - indent: None (tek satır) veya 2; orjson yalnızca 2 boşluk girinti
+      desteklediğinden tüm parser'larda aynı iş için bu iki değer kabul edilir
+    - sort_keys: dumps çıktısında anahtarları sıralar
+
+    Parser'lar parser_registry'den alınır; iş yükünü desteklemeyen parser'lar
+    ölçülmez.
+
+    Girdi dönüşümü ve dumps için gereken ilk parse ölçüm dışında bir kez
+    yapılır. Her işlem perf_counter_ns ile ayrı ayrı ölçülür; sonuçta işlem
+    süresi, işlenen byte ve işlem sayısı döner. İşlenen byte loads için
+    girdinin, dumps için çıktının UTF-8 boyutudur.
+
+    Dosya girdisinde belge bu süreçte hiç tutulmaz; hazırlık parse'ı da
+    yapılmaz (belge yüzlerce MB olabilir), geçersiz JSON ilk ölçülen parse'ta
+    ValueError fırlatır. Dosya yeni yazıldığından sayfa önbelleğindedir.
+"""
+
+import os
+import json
+import time
+from typing import Any, Dict, Optional, Union
+from .parser_registry import get_parser
+
+OPERATIONS = ('loads', 'dumps', 'roundtrip')
+INPUT_TYPES = ('str', 'bytes', 'file')
+INDENTS = (None, 2)
+
+DEFAULT_WORKLOAD = {
+    'operation': 'roundtrip',
+    'input_type': 'str',
+    'indent': None,
+    'sort_keys': False
+}
+
+################ İş yükü seçeneklerini doğrular ve iş yükünü döndürür ################
+def build_workload(
+    operation: str = DEFAULT_WORKLOAD['operation'],
+    input_type: str = DEFAULT_WORKLOAD['input_type'],
+    indent: Optional[int] = DEFAULT_WORKLOAD['indent'],
+    sort_keys: bool = DEFAULT_WORKLOAD['sort_keys']
+) -> Dict[str, Any]:
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unsupported operation: {operation}. Supported: {', '.join(OPERATIONS)}")
+    if input_type not in INPUT_TYPES:
+        raise ValueError(f"Unsupported input type: {input_type}. Supported: {', '.join(INPUT_TYPES)}")
+    if input_type == 'file' and operation != 'loads':
+        raise ValueError("File input supports only the loads operation")
+    if indent not in INDENTS:
+        raise ValueError(f"Unsupported indent: {indent}. Supported: none or 2")
+    return {'operation': operation, 'input_type': input_type, 'indent': indent, 'sort_keys': bool(sort_keys)}
+
+################ İş yükünün önbellek ve kayıt için sabit metin gösterimini döndürür ################
+def workload_key(workload: Dict[str, Any]) -> str:
+    return json.dumps(workload, sort_keys=True, separators=(',', ':'))
+
+################ Metin ya da bytes değerin UTF-8 boyutunu döndürür ################
+def _size(value: Union[str, bytes]) -> int:
+    return len(value) if isinstance(value, bytes) else len(value.encode('utf-8'))
+
+################ İş yükünü verilen parser ile repeat kez çalıştırır ################
+def run_workload(parser: str, json_str: str, repeat: int, workload: Dict[str, Any]) -> Dict[str, Any]:
+    definition = get_parser(parser)
+    loads, dumps = definition['loads'], definition['dumps']
+    operation = workload['operation']
+    indent, sort_keys = workload['indent'], workload['sort_keys']
+    do_loads = operation in ('loads', 'roundtrip')
+    do_dumps = operation in ('dumps', 'roundtrip')
+
+    # Hazırlık ölçüm dışında bir kez yapılır; geçersiz JSON burada ValueError fırlatır
+    document = json_str.encode('utf-8') if workload['input_type'] == 'bytes' else json_str
+    input_size = _size(document)
+    data = loads(document)
+    output_size = _size(dumps(data, indent, sort_keys)) if do_dumps else 0
+    if not do_dumps:
+        # Tembel parser'larda (simdjson) belge bir sonraki parse'tan önce bırakılmalıdır
+        data = None
+
+    clock = time.perf_counter_ns
+    elapsed_ns = 0
+    for _ in range(repeat):
+        if do_loads:
+            started = clock()
+            # Sonuç tutulmaz; dumps hazırlıkta parse edilen aynı veriyi kullanır
+            loads(document)
+            elapsed_ns += clock() - started
+        if do_dumps:
+            started = clock()
+            dumps(data, indent, sort_keys)
+            elapsed_ns += clock() - started
+
+    return {
+        'operation_ns': elapsed_ns,
+        'operations': repeat * (do_loads + do_dumps),
+        'bytes': repeat * ((input_size if do_loads else 0) + output_size)
+    }
+
+################ Dosyadaki belgeyi verilen parser ile repeat kez parse eder ################
+def run_file_workload(parser: str, path: str, repeat: int, workload: Dict[str, Any]) -> Dict[str, Any]:
+    definition = get_parser(parser)
+    load_file = definition['load_file']
+    if load_file is None:
+        loads = definition['loads']
+
+        # Bellek içi parser'lar dosyayı her tekrarda bytes olarak okuyup parse eder
+        def load_file(document_path):
+            with open(document_path, 'rb') as f:
+                return loads(f.read())
+    size = os.path.getsize(path)
+
+    clock = time.perf_counter_ns
+    elapsed_ns = 0
+    for _ in range(repeat):
+        started = clock()
+        load_file(path)
+        elapsed_ns += clock() - started
+
+    return {'operation_ns': elapsed_ns, 'operations': repeat, 'bytes': repeat * size}
+
+################ İşlem süresinden MB/s ve işlem/s değerlerini hesaplar ################
+def throughput(operation_ns: int, operations: int, processed_bytes: int) -> Dict[str, Optional[float]]:
+    if operation_ns <= 0:
+        return {'operation_time': 0.0, 'throughput_mb_s': None, 'ops_per_second': None}
+    seconds = operation_ns / 1e9
+    return {
+        'operation_time': seconds,
+        'throughput_mb_s': processed_bytes / 1e6 / seconds,
+        'ops_per_second': operations / seconds
+    }
@@ -8,157 +8,391 @@
 
     Özellikler:
     - Veritabanı ve tablo oluşturma
-    - Sistem bilgilerini alma
+    - Sistem bilgilerini alma (süreç genelinde bir kez hesaplanan host bilgisi)
     - Benzer kayıt arama
     - Yeni kayıt ekleme
-    - Database kayıtlarını alma
+    - Database kayıtlarını alma (keyset pagination, kolon seçimi, filtreler, akış)
+    - Toplam ve parser/gün bazında emisyon toplamları (her kayıtta artımlı güncellenir)
+    - Parser sonuçlarını parser başına bir satır olarak ayrı bir tabloda saklama
+      (json_parser_results); kayıt defterindeki her parser için sabit kolon
+      gerekmez. Temel parser'ların (json, orjson, ujson) emisyon ve süreleri
+      eski şemadaki zorunlu kolonlar için rapor tablosuna da yazılır; örnekleme
+      ve verim değerleri yalnızca sonuç tablosundadır.
+    - Yüklenen büyük belgelerin içeriğini saklamaz; yalnızca içerik hash'i
+      (content_hash) ve boyutu kaydedilir (json_source = 'upload').
+    - İstekte gönderilen JSON girdisini içerik adresli depoda (bkz.
+      common/blob_store.py) bir kez saklama; eski kayıtlar arka planda taşınır
 """
 
-import sqlite3
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, Tuple, Union
 import json
+import sqlite3
 import hashlib
-import psutil
-import platform
+import threading
+from common.sqlite_pool import SQLiteConnectionPool, ensure_columns, table_columns
+from common.host_fingerprint import host_fingerprint
+from common.pagination import encode_cursor, decode_cursor, resolve_fields, clamp_page_size
+from common.emission_rollups import (
+    init_rollup_table, apply_rollup, rebuild_rollups, get_totals, get_daily, TOTAL_DIMENSION
+)
+from common.blob_store import init_blob_table, put_blob, resolve_payloads
 from config.logging_config import setup_logger
+from .json_workload import DEFAULT_WORKLOAD, workload_key
+from .parser_registry import REQUIRED_PARSERS
+from .json_upload import UploadedDocument
 
 logger = setup_logger('jsonculate_db')
 
+STREAM_BATCH_SIZE = 500
+BACKFILL_BATCH_SIZE = 500
+
+# Geçmiş listelerinde varsayılan olarak döndürülmeyen büyük kolonlar
+PAYLOAD_COLUMNS = ('json_input',)
+
+# Payload kolonlarının depodaki içeriğe başvuran özet kolonları
+PAYLOAD_REFERENCES = {'json_input': 'content_hash'}
+
+# Rapor tablosunda sabit kolonları olan parser'lar; tüm parser'ların sonuçları RESULTS_TABLE'dadır
+PARSERS = REQUIRED_PARSERS
+AGGREGATE_DIMENSIONS = (TOTAL_DIMENSION, 'parser')
+
+# Rapor düzeyindeki adaptive örnekleme kolonları; parser başına güven aralıkları RESULTS_TABLE'dadır
+SAMPLING_COLUMNS = {
+    'sampling_mode': "TEXT NOT NULL DEFAULT 'fixed'",
+    'target_relative_error': 'REAL'
+}
+
+# İş yükünün sabit metin gösterimi; parser başına verim değerleri RESULTS_TABLE'dadır
+WORKLOAD_COLUMNS = {
+    'workload': 'TEXT'
+}
+
+RESULTS_TABLE = 'json_parser_results'
+
+# Parser worker'ında ölçülen bellek değerleri (byte); parser'lar API sürecinde ölçüldüyse boştur
+MEMORY_COLUMNS = {
+    'baseline_rss_bytes': 'INTEGER',
+    'peak_rss_bytes': 'INTEGER'
+}
+
+# Parser başına sonuç kolonları (güven aralıkları tekrar başına yarı genişlik)
+RESULT_COLUMNS = {
+    'emissions': 'REAL NOT NULL',
+    'duration': 'REAL NOT NULL',
+    'throughput_mb_s': 'REAL',
+    'ops_per_second': 'REAL',
+    'sample_iterations': 'INTEGER',
+    'relative_error': 'REAL',
+    'duration_ci': 'REAL',
+    'emission_ci': 'REAL',
+    **MEMORY_COLUMNS
+}
+
+# Eski veritabanlarında rapor tablosunda kalan parser başına örnekleme/verim kolonları;
+# artık yazılmaz ve okunmaz (zorunlu emissions/duration kolonları hariç)
+LEGACY_RESULT_COLUMNS = {
+    f'{parser}_{column}'
+    for parser in PARSERS
+    for column in RESULT_COLUMNS
+    if column not in ('emissions', 'duration')
+}
+
 ################========== JSONculateDBManager ==========################
 class JSONculateDBManager:
     def __init__(self, db_path: str = "../data/jsonculate-reports.db"):
         self.db_path = db_path
+        self.pool = SQLiteConnectionPool(db_path)
         self.init_db()
+        self._load_columns()
+
+        # Eski kayıtların JSON girdilerini istekleri bloklamadan arka planda depoya taşı
+        self._backfill_thread = threading.Thread(target=self._backfill_payload_blobs, daemon=True)
+        self._backfill_thread.start()
 
     ################ Database'i oluşturur ################
     def init_db(self):
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS json_parsing_reports (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                repeat INTEGER NOT NULL,
-                json_input TEXT NOT NULL,
-                json_hash TEXT NOT NULL,
-                json_size INTEGER NOT NULL,
-                json_emissions REAL NOT NULL,
-                json_duration REAL NOT NULL,
-                orjson_emissions REAL NOT NULL,
-                orjson_duration REAL NOT NULL,
-                ujson_emissions REAL NOT NULL,
-                ujson_duration REAL NOT NULL,
-                is_scaled BOOLEAN NOT NULL DEFAULT 0,
-                scale_threshold INTEGER NOT NULL DEFAULT 10000,
-                cpu_model TEXT NOT NULL,
-                cpu_count INTEGER NOT NULL,
-                total_memory REAL NOT NULL,
-                os_info TEXT NOT NULL
-            )
-            ''')
-            
-            conn.commit()
-            logger.info("JSONculate database initialized successfully")
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS json_parsing_reports (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    repeat INTEGER NOT NULL,
+                    json_input TEXT NOT NULL,
+                    json_hash TEXT NOT NULL,
+                    json_size INTEGER NOT NULL,
+                    json_emissions REAL NOT NULL,
+                    json_duration REAL NOT NULL,
+                    orjson_emissions REAL NOT NULL,
+                    orjson_duration REAL NOT NULL,
+                    ujson_emissions REAL NOT NULL,
+                    ujson_duration REAL NOT NULL,
+                    is_scaled BOOLEAN NOT NULL DEFAULT 0,
+                    scale_threshold INTEGER NOT NULL DEFAULT 10000,
+                    cpu_model TEXT NOT NULL,
+                    cpu_count INTEGER NOT NULL,
+                    total_memory REAL NOT NULL,
+                    os_info TEXT NOT NULL,
+                    host_id TEXT,
+                    energy_backend TEXT NOT NULL DEFAULT 'codecarbon',
+                    isolation_mode TEXT NOT NULL DEFAULT 'none',
+                    json_source TEXT NOT NULL DEFAULT 'inline',
+                    content_hash TEXT,
+                    {', '.join(f'{name} {definition}' for name, definition in SAMPLING_COLUMNS.items())},
+                    {', '.join(f'{name} {definition}' for name, definition in WORKLOAD_COLUMNS.items())}
+                )
+                ''')
+
+                # Eski veritabanlarına sonradan eklenen kolonları ekle
+                ensure_columns(cursor, 'json_parsing_reports', {
+                    'host_id': "TEXT",
+                    'energy_backend': "TEXT NOT NULL DEFAULT 'codecarbon'",
+                    'isolation_mode': "TEXT NOT NULL DEFAULT 'none'",
+                    'json_source': "TEXT NOT NULL DEFAULT 'inline'",
+                    'content_hash': "TEXT",
+                    **SAMPLING_COLUMNS,
+                    **WORKLOAD_COLUMNS
+                })
+
+                # Benzer kayıt aramasını kapsayan indeks
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_json_parsing_reports_lookup
+                ON json_parsing_reports (json_hash, repeat, is_scaled, host_id, timestamp)
+                ''')
+
+                # Geçmiş sayfalama için indeks
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_json_parsing_reports_time
+                ON json_parsing_reports (timestamp, id)
+                ''')
+
+                # Parser başına sonuç tablosu; ilk oluşturulduğunda sabit kolonlardan doldurulur
+                self._init_results_table(cursor)
+
+                # JSON girdileri için içerik adresli depo (eski kayıtlar arka planda taşınır)
+                init_blob_table(cursor)
+
+                # Emisyon toplamları tablosu; ilk oluşturulduğunda mevcut kayıtlardan doldurulur
+                if init_rollup_table(cursor):
+                    results_select = f'''
+                        SELECT results.report_id AS report_id, date(reports.timestamp) AS day, results.parser AS parser,
+                               results.emissions AS emission, results.duration AS duration
+                        FROM {RESULTS_TABLE} results
+                        JOIN json_parsing_reports reports ON reports.id = results.report_id
+                    '''
+                    rebuild_rollups(cursor, [
+                        f'''
+                        SELECT '{TOTAL_DIMENSION}' AS dimension, 'all' AS dimension_key, day, SUM(emission) AS emission, SUM(duration) AS duration
+                        FROM ({results_select}) GROUP BY report_id
+                        ''',
+                        f'''
+                        SELECT 'parser' AS dimension, parser AS dimension_key, day, emission, duration
+                        FROM ({results_select})
+                        '''
+                    ])
+            
+                logger.info("JSONculate database initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing database: {str(e)}")
             raise
-        finally:
-            conn.close()
 
     ################ Execution raporunu veritabanına kaydeder ################
-    def save_report(self, results: Dict[str, Any], json_input: str, scale_threshold: int = 10000):
+    def save_report(self, results: Dict[str, Any], json_input: Union[str, UploadedDocument], scale_threshold: int = 10000, energy_backend: str = 'codecarbon'):
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            sys_info = self._get_system_info()
-            json_hash = self._calculate_json_hash(json_input, results['repeat'], scale_threshold)
-            
-            cursor.execute('''
-            INSERT INTO json_parsing_reports 
-            (repeat, json_input, json_hash, json_size, 
-             json_emissions, json_duration,
-             orjson_emissions, orjson_duration,
-             ujson_emissions, ujson_duration,
-             is_scaled, scale_threshold,
-             cpu_model, cpu_count, total_memory, os_info)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                results['repeat'],
-                json_input,
-                json_hash,
-                len(json_input),
-                results['json']['emissions'],
-                results['json']['duration'],
-                results['orjson']['emissions'],
-                results['orjson']['duration'],
-                results['ujson']['emissions'],
-                results['ujson']['duration'],
-                results.get('scaled', False),
-                scale_threshold,
-                sys_info['cpu_model'],
-                sys_info['cpu_count'],
-                sys_info['total_memory'],
-                sys_info['os_info']
-            ))
-            
-            conn.commit()
-            report_id = cursor.lastrowid
-            logger.info(f"Saved JSON parsing report with ID: {report_id}")
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+            
+                sys_info = self._get_system_info()
+                sampling_mode = results.get('sampling', 'fixed')
+                json_hash = self._calculate_json_hash(json_input, results['repeat'], scale_threshold, sampling_mode, results.get('workload'))
+                sampling = self._sampling_values(results)
+                parsers = results.get('parsers') or list(PARSERS)
+                json_size, content_hash, json_source = self._store_document(cursor, json_input)
+                legacy_columns = [f'{parser}_{column}' for parser in PARSERS for column in ('emissions', 'duration')]
+            
+                cursor.execute(f'''
+                INSERT INTO json_parsing_reports 
+                (repeat, json_input, json_hash, json_size, json_source, content_hash,
+                 {', '.join(legacy_columns)},
+                 is_scaled, scale_threshold,
+                 cpu_model, cpu_count, total_memory, os_info, host_id, energy_backend, isolation_mode,
+                 {', '.join(SAMPLING_COLUMNS)}, {', '.join(WORKLOAD_COLUMNS)})
+                VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' * len(legacy_columns))}, ?, ?, ?, ?, ?, ?, ?, ?, ?, {', '.join('?' * (len(SAMPLING_COLUMNS) + len(WORKLOAD_COLUMNS)))})
+                ''', (
+                    results['repeat'],
+                    '',
+                    json_hash,
+                    json_size,
+                    json_source,
+                    content_hash,
+                    *(results[parser][column] for parser in PARSERS for column in ('emissions', 'duration')),
+                    results.get('scaled', False),
+                    scale_threshold,
+                    sys_info['cpu_model'],
+                    sys_info['cpu_count'],
+                    sys_info['total_memory'],
+                    sys_info['os_info'],
+                    sys_info['host_id'],
+                    energy_backend,
+                    results.get('isolation', 'none'),
+                    *(sampling[column] for column in SAMPLING_COLUMNS),
+                    workload_key(results.get('workload') or DEFAULT_WORKLOAD)
+                ))
+            
+                report_id = cursor.lastrowid
+
+                # Tüm parser'ların sonuçları parser başına bir satır olarak kaydedilir
+                cursor.executemany(f'''
+                INSERT INTO {RESULTS_TABLE} (report_id, parser, {', '.join(RESULT_COLUMNS)})
+                VALUES (?, ?, {', '.join('?' * len(RESULT_COLUMNS))})
+                ''', [
+                    (report_id, parser, *self._result_values(results[parser]).values())
+                    for parser in parsers
+                ])
+
+                # Toplamları aynı transaction içinde güncelle
+                values = {('parser', p): (results[p]['emissions'], results[p]['duration']) for p in parsers}
+                values[(TOTAL_DIMENSION, 'all')] = (
+                    sum(emission for emission, _ in values.values()),
+                    sum(duration for _, duration in values.values())
+                )
+                cursor.execute('SELECT date(timestamp) FROM json_parsing_reports WHERE id = ?', (report_id,))
+                apply_rollup(cursor, cursor.fetchone()[0], values)
+
+                logger.info(f"Saved JSON parsing report with ID: {report_id}")
             
         except Exception as e:
             logger.error(f"Error saving JSON parsing report: {str(e)}")
             raise
-        finally:
-            conn.close()
 
     ################ Database'de aynı hash'e sahip kayıt arar ################
-    def get_existing_report(self, json_input: str, repeat: int, scale_threshold: int) -> Optional[Dict[str, Any]]:
+    def get_existing_report(
+        self,
+        json_input: Union[str, UploadedDocument],
+        repeat: int,
+        scale_threshold: int,
+        energy_backend: str = 'codecarbon',
+        sampling_mode: str = 'fixed',
+        target_relative_error: Optional[float] = None,
+        workload: Optional[Dict[str, Any]] = None,
+        parsers: Optional[List[str]] = None,
+        isolation: str = 'none'
+    ) -> Optional[Dict[str, Any]]:
         try:
-            json_hash = self._calculate_json_hash(json_input, repeat, scale_threshold)
+            json_hash = self._calculate_json_hash(json_input, repeat, scale_threshold, sampling_mode, workload)
+            host_id = host_fingerprint.host_id
+            parsers = list(parsers or PARSERS)
+
+            # Kayıt yalnızca istenen tüm parser'ların sonuçlarını içeriyorsa kullanılır
+            parsers_condition = f'''(
+                SELECT COUNT(*) FROM {RESULTS_TABLE}
+                WHERE report_id = json_parsing_reports.id AND parser IN ({', '.join('?' * len(parsers))})
+            ) = ?'''
+            parsers_params = (*parsers, len(parsers))
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
             
-            if repeat <= scale_threshold:
-                cursor.execute('''
-                SELECT * FROM json_parsing_reports 
-                WHERE json_hash = ? AND repeat = ? AND is_scaled = 0
-                ORDER BY timestamp DESC LIMIT 1
-                ''', (json_hash, repeat))
-            else:
-                cursor.execute('''
-                SELECT * FROM json_parsing_reports 
-                WHERE json_hash = ? AND repeat = ? AND scale_threshold = ? AND is_scaled = 1
-                ORDER BY timestamp DESC LIMIT 1
-                ''', (json_hash, repeat, scale_threshold))
+                if sampling_mode == 'adaptive':
+                    # Aynı veya daha sıkı hedefle ölçülmüş bir kayıt istenen hedefi de karşılar
+                    cursor.execute(f'''
+                    SELECT {', '.join(self._columns)} FROM json_parsing_reports 
+                    WHERE json_hash = ? AND repeat = ? AND sampling_mode = 'adaptive' AND target_relative_error <= ? AND host_id = ? AND energy_backend = ? AND isolation_mode = ? AND {parsers_condition}
+                    ORDER BY timestamp DESC LIMIT 1
+                    ''', (json_hash, repeat, target_relative_error, host_id, energy_backend, isolation, *parsers_params))
+                elif repeat <= scale_threshold:
+                    cursor.execute(f'''
+                    SELECT {', '.join(self._columns)} FROM json_parsing_reports 
+                    WHERE json_hash = ? AND repeat = ? AND is_scaled = 0 AND sampling_mode = 'fixed' AND host_id = ? AND energy_backend = ? AND isolation_mode = ? AND {parsers_condition}
+                    ORDER BY timestamp DESC LIMIT 1
+                    ''', (json_hash, repeat, host_id, energy_backend, isolation, *parsers_params))
+                else:
+                    cursor.execute(f'''
+                    SELECT {', '.join(self._columns)} FROM json_parsing_reports 
+                    WHERE json_hash = ? AND repeat = ? AND scale_threshold = ? AND is_scaled = 1 AND sampling_mode = 'fixed' AND host_id = ? AND energy_backend = ? AND isolation_mode = ? AND {parsers_condition}
+                    ORDER BY timestamp DESC LIMIT 1
+                    ''', (json_hash, repeat, scale_threshold, host_id, energy_backend, isolation, *parsers_params))
             
-            row = cursor.fetchone()
+                row = cursor.fetchone()
 
-            if row:
-                columns = [description[0] for description in cursor.description]
-                result = dict(zip(columns, row))
-                logger.info(f"Found existing report for JSON with {repeat} repetitions")
-                return result
+                if row:
+                    columns = [description[0] for description in cursor.description]
+                    result = dict(zip(columns, row))
+                    result['parser_results'] = self._load_parser_results(conn, [result['id']]).get(result['id'], {})
+                    logger.info(f"Found existing report for JSON with {repeat} repetitions")
+                    return result
 
-            logger.info(f"No existing report found for JSON with {repeat} repetitions")
-            return None
+                logger.info(f"No existing report found for JSON with {repeat} repetitions")
+                return None
             
         except Exception as e:
             logger.error(f"Error checking for existing report: {str(e)}")
             return None
-        finally:
-            conn.close()
 
-    ################ JSON içeriği ve tekrar sayısından benzersiz bir hash oluşturur ################
-    def _calculate_json_hash(self, json_input: str, repeat: int, scale_threshold: int) -> str:
+    ################ Önbellek aramasının kimliğini döndürür (eş zamanlı aynı istekleri birleştirmek için) ################
+    def cache_key(
+        self,
+        json_input: Union[str, UploadedDocument],
+        repeat: int,
+        scale_threshold: int,
+        energy_backend: str = 'codecarbon',
+        sampling_mode: str = 'fixed',
+        target_relative_error: Optional[float] = None,
+        workload: Optional[Dict[str, Any]] = None,
+        parsers: Optional[List[str]] = None,
+        isolation: str = 'none'
+    ) -> Tuple[Any, ...]:
+        json_hash = self._calculate_json_hash(json_input, repeat, scale_threshold, sampling_mode, workload)
+        target = target_relative_error if sampling_mode == 'adaptive' else None
+        return (self.db_path, json_hash, repeat, energy_backend, sampling_mode, target, tuple(parsers or PARSERS), isolation)
+
+    ################ Bir parser sonucunu sonuç tablosu kolonlarına çevirir ################
+    def _result_values(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        values = dict.fromkeys(RESULT_COLUMNS)
+        for column in ('emissions', 'duration', 'throughput_mb_s', 'ops_per_second', *MEMORY_COLUMNS):
+            values[column] = result.get(column)
+        confidence = result.get('confidence_interval')
+        if confidence:
+            values['sample_iterations'] = confidence['iterations']
+            values['relative_error'] = confidence['relative_error']
+            for column, key in (('duration_ci', 'avg_execution_time'), ('emission_ci', 'avg_emissions')):
+                bounds = confidence[key]
+                values[column] = (bounds[1] - bounds[0]) / 2 if bounds else None
+        return values
+
+    ################ Rapor düzeyindeki örnekleme kolonlarını döndürür ################
+    def _sampling_values(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        values = dict.fromkeys(SAMPLING_COLUMNS)
+        values['sampling_mode'] = results.get('sampling', 'fixed')
+        for parser in results.get('parsers') or PARSERS:
+            confidence = results[parser].get('confidence_interval')
+            if confidence:
+                values['target_relative_error'] = confidence['target_relative_error']
+                break
+        return values
+
+    ################ Belgeyi saklar; boyutunu, içerik hash'ini ve kaynağını döndürür ################
+    def _store_document(self, cursor: sqlite3.Cursor, json_input: Union[str, UploadedDocument]) -> Tuple[int, str, str]:
+        # Yüklenen belgelerin içeriği saklanmaz; içerik hash'i yükleme sırasında hesaplanmıştır
+        if isinstance(json_input, UploadedDocument):
+            return json_input.size, json_input.sha256, 'upload'
+        # İstekte gönderilen JSON depoda bir kez saklanır; rapor satırı içerik hash'iyle başvurur
+        return len(json_input), put_blob(cursor, json_input), 'inline'
+
+    ################ JSON içeriği, tekrar sayısı ve iş yükünden benzersiz bir hash oluşturur ################
+    def _calculate_json_hash(self, json_input: Union[str, UploadedDocument], repeat: int, scale_threshold: int, sampling_mode: str = 'fixed', workload: Optional[Dict[str, Any]] = None) -> str:
         try:
-            if repeat <= scale_threshold:
-                combined = f"{json_input}{repeat}"
+            # Yüklenen belgeler içerikleri yerine içerik hash'leri ile temsil edilir
+            content = f"sha256:{json_input.sha256}" if isinstance(json_input, UploadedDocument) else json_input
+            # Adaptive kayıtlar ölçeklendirme eşiğinden bağımsızdır
+            if repeat <= scale_threshold or sampling_mode == 'adaptive':
+                combined = f"{content}{repeat}"
             else:
-                combined = f"{json_input}{repeat}{scale_threshold}"
+                combined = f"{content}{repeat}{scale_threshold}"
+            # İş yükü hash'e dahildir; farklı iş yükleriyle (ve eski dolgulu iş yüküyle) ölçülmüş kayıtlar eşleşmez
+            combined += workload_key(workload or DEFAULT_WORKLOAD)
             
             hash_value = hashlib.sha256(combined.encode()).hexdigest()
             logger.debug(f"Calculated hash for JSON input: {hash_value[:8]}...")
@@ -171,40 +405,242 @@ class JSONculateDBManager:
     ################ Database Kayıtlarını Döndürür ################
     def get_reports(self) -> List[Dict[str, Any]]:
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-            SELECT * FROM json_parsing_reports 
-            ORDER BY timestamp DESC
-            ''')
+                cursor.execute(f'''
+                SELECT {', '.join(self._columns)} FROM json_parsing_reports 
+                ORDER BY timestamp DESC
+                ''')
             
-            columns = [description[0] for description in cursor.description]
-            results = []
+                columns = [description[0] for description in cursor.description]
+                results = []
             
-            for row in cursor.fetchall():
-                results.append(dict(zip(columns, row)))
+                for row in cursor.fetchall():
+                    results.append(dict(zip(columns, row)))
+                resolve_payloads(conn, results, PAYLOAD_REFERENCES)
             
-            logger.info(f"Retrieved {len(results)} JSON parsing reports")
-            return results
+                logger.info(f"Retrieved {len(results)} JSON parsing reports")
+                return results
             
         except Exception as e:
             logger.error(f"Error getting JSON parsing reports: {str(e)}")
             return []
-        finally:
-            conn.close()
 
-    ################ Sistem bilgilerini alır ################
-    def _get_system_info(self) -> Dict[str, Any]:
-        try:
-            info = {
-                'cpu_model': platform.processor() or 'Unknown',
-                'cpu_count': psutil.cpu_count(),
-                'total_memory': round(psutil.virtual_memory().total / (1024 ** 3), 2),  # GB cinsinden
-                'os_info': f"{platform.system()} {platform.release()}"
+    ################ Tüm kayıtların toplam emisyonunu döndürür ################
+    def get_total_emission(self) -> float:
+        with self.pool.connection() as conn:
+            totals = get_totals(conn, TOTAL_DIMENSION)
+        return totals[0]['emission'] if totals else 0
+
+    ################ Emisyon toplamlarını ve günlük dağılımını döndürür ################
+    def get_aggregates(
+        self,
+        group_by: str = 'parser',
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if group_by not in AGGREGATE_DIMENSIONS:
+            raise ValueError(f"Unsupported group_by: {group_by}. Supported: {', '.join(AGGREGATE_DIMENSIONS)}")
+
+        with self.pool.connection() as conn:
+            return {
+                'group_by': group_by,
+                'totals': get_totals(conn, group_by),
+                'daily': get_daily(conn, group_by, since, until)
             }
-            logger.debug(f"Retrieved system info: {info}")
-            return info
+
+    ################ Geçmiş kayıtlarından bir sayfa döndürür ################
+    def get_reports_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        scaled: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        page_size = clamp_page_size(limit)
+        # Sonraki sayfa olup olmadığını anlamak için bir kayıt fazla çek
+        rows = list(self.iter_reports(fields, since, until, scaled, cursor, page_size + 1))
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor([rows[-1]['timestamp'], rows[-1]['id']])
+
+        logger.info(f"Retrieved page of {len(rows)} JSON parsing reports")
+        return {'items': rows, 'next_cursor': next_cursor}
+
+    ################ Geçmiş kayıtlarını tek tek üreten bir iterator döndürür ################
+    def iter_reports(
+        self,
+        fields: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        scaled: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        # Kolon ve imleç hataları akış başlamadan ValueError olarak fırlatılır
+        columns = resolve_fields(fields, self._columns, self._summary_columns)
+        columns = list(dict.fromkeys(['id', 'timestamp'] + columns))
+
+        where, params = [], []
+        if since:
+            where.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            where.append('timestamp < ?')
+            params.append(until)
+        if scaled is not None:
+            where.append('is_scaled = ?')
+            params.append(1 if scaled else 0)
+        if cursor:
+            last_time, last_id = decode_cursor(cursor)
+            where.append('(timestamp < ? OR (timestamp = ? AND id < ?))')
+            params.extend([last_time, last_time, last_id])
+
+        # İstenen payload kolonları depodan çözülür; bunun için özet kolonları da okunur
+        references = {column: PAYLOAD_REFERENCES[column] for column in columns if column in PAYLOAD_REFERENCES}
+        hidden = [column for column in dict.fromkeys(references.values()) if column not in columns]
+
+        return self._stream_rows(columns + hidden, where, params, limit, references, hidden)
+
+    ################ Sorgu sonuçlarını sabit bellekle parça parça okur; parser sonuçlarını ekler ################
+    def _stream_rows(
+        self,
+        columns: List[str],
+        where: List[str],
+        params: List[Any],
+        limit: Optional[int] = None,
+        references: Optional[Dict[str, str]] = None,
+        hidden: List[str] = ()
+    ) -> Iterator[Dict[str, Any]]:
+        # Her parça kısa süreli bir bağlantıyla okunur ve bir sonraki parça son kaydın
+        # (timestamp, id) değerinden devam eder; uzun süren bir akış havuzdaki bağlantıyı tutmaz
+        last = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch_size = STREAM_BATCH_SIZE if remaining is None else min(STREAM_BATCH_SIZE, remaining)
+            conditions, batch_params = list(where), list(params)
+            if last is not None:
+                conditions.append('(timestamp < ? OR (timestamp = ? AND id < ?))')
+                batch_params.extend([last[0], last[0], last[1]])
+            query = f"SELECT {', '.join(columns)} FROM json_parsing_reports"
+            if conditions:
+                query += ' WHERE ' + ' AND '.join(conditions)
+            query += ' ORDER BY timestamp DESC, id DESC LIMIT ?'
+            batch_params.append(batch_size)
+
+            with self.pool.connection() as conn:
+                db_cursor = conn.execute(query, batch_params)
+                names = [desc[0] for desc in db_cursor.description]
+                records = [dict(zip(names, row)) for row in db_cursor.fetchall()]
+                if not records:
+                    break
+                if references:
+                    resolve_payloads(conn, records, references)
+                # Parser sonuçları parça başına tek sorgu ile okunur
+                parser_results = self._load_parser_results(conn, [record['id'] for record in records])
+
+            last = (records[-1]['timestamp'], records[-1]['id'])
+            for record in records:
+                for column in hidden:
+                    del record[column]
+                record['parser_results'] = parser_results.get(record['id'], {})
+                yield record
+
+            if len(records) < batch_size:
+                break
+            if remaining is not None:
+                remaining -= len(records)
+
+    ################ Parser sonuç tablosunu oluşturur; yeni oluşturulduysa sabit kolonlardan doldurur ################
+    def _init_results_table(self, cursor: sqlite3.Cursor):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RESULTS_TABLE,))
+        existed = cursor.fetchone() is not None
+
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {RESULTS_TABLE} (
+            report_id INTEGER NOT NULL REFERENCES json_parsing_reports (id),
+            parser TEXT NOT NULL,
+            {', '.join(f'{name} {definition}' for name, definition in RESULT_COLUMNS.items())},
+            PRIMARY KEY (report_id, parser)
+        ) WITHOUT ROWID
+        ''')
+        if existed:
+            ensure_columns(cursor, RESULTS_TABLE, MEMORY_COLUMNS)
+            return
+
+        # Eski kayıtlarda rapor tablosunda kolonu olmayan değerler (ör. bellek ölçümü) boş kalır
+        report_columns = table_columns(cursor, 'json_parsing_reports')
+        for parser in PARSERS:
+            cursor.execute(f'''
+            INSERT INTO {RESULTS_TABLE} (report_id, parser, {', '.join(RESULT_COLUMNS)})
+            SELECT id, ?, {', '.join(f'{parser}_{column}' if f'{parser}_{column}' in report_columns else 'NULL' for column in RESULT_COLUMNS)}
+            FROM json_parsing_reports
+            ''', (parser,))
+        logger.info(f"Backfilled {RESULTS_TABLE} from existing reports")
+
+    ################ Verilen raporların parser sonuçlarını {rapor_id: {parser: sonuç}} olarak döndürür ################
+    def _load_parser_results(self, conn: sqlite3.Connection, report_ids: List[int]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        if not report_ids:
+            return {}
+        db_cursor = conn.execute(f'''
+        SELECT report_id, parser, {', '.join(RESULT_COLUMNS)} FROM {RESULTS_TABLE}
+        WHERE report_id IN ({', '.join('?' * len(report_ids))})
+        ''', report_ids)
+        results: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for row in db_cursor.fetchall():
+            results.setdefault(row[0], {})[row[1]] = dict(zip(RESULT_COLUMNS, row[2:]))
+        return results
+
+    ################ JSON girdisi satırda saklanan eski kayıtları küçük parçalar halinde depoya taşır ################
+    def _backfill_payload_blobs(self, batch_size: int = BACKFILL_BATCH_SIZE):
+        total, last_id = 0, 0
+        try:
+            while True:
+                # Her parça kendi transaction'ında taşınır; kayıtlar id sırasıyla bir kez taranır
+                with self.pool.transaction() as conn:
+                    rows = conn.execute('''
+                    SELECT id, json_input FROM json_parsing_reports
+                    WHERE id > ? AND json_source = 'inline' AND json_input != ''
+                    ORDER BY id
+                    LIMIT ?
+                    ''', (last_id, batch_size)).fetchall()
+                    if not rows:
+                        break
+                    cursor = conn.cursor()
+                    cursor.executemany(
+                        "UPDATE json_parsing_reports SET json_input = '', content_hash = ? WHERE id = ?",
+                        [(put_blob(cursor, json_input), report_id) for report_id, json_input in rows]
+                    )
+                last_id = rows[-1][0]
+                total += len(rows)
+
+            if total:
+                logger.info(f"Moved JSON inputs of {total} reports to the blob store (run VACUUM to reclaim disk space)")
         except Exception as e:
-            logger.error(f"Error getting system info: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error(f"Error moving JSON inputs to the blob store: {str(e)}")
+
+    ################ Tablo kolonlarını okur ################
+    def _load_columns(self):
+        with self.pool.connection() as conn:
+            self._columns = [
+                row[1] for row in conn.execute("PRAGMA table_info(json_parsing_reports)")
+                if row[1] not in LEGACY_RESULT_COLUMNS
+            ]
+        self._summary_columns = [c for c in self._columns if c not in PAYLOAD_COLUMNS]
+
+    ################ Sistem bilgilerini alır ################
+    def _get_system_info(self) -> Dict[str, Any]:
+        # Bilgiler süreç başına bir kez hesaplanır; host_fingerprint.refresh() ile yenilenir
+        host = host_fingerprint.get()
+        return {
+            'cpu_model': host['cpu_model'],
+            'cpu_count': host['cpu_count'],
+            'total_memory': host['total_ram_gb'],  # GB cinsinden
+            'os_info': host['os_name'],
+            'host_id': host['host_id']
+        }
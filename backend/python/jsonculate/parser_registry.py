@@ -0,0 +1,213 @@
+"""
+    ParserRegistry
+    =================================================================
+    Jsonculate'in karşılaştırdığı JSON parser'larının kayıt defteridir.
+    Her parser bir fabrika fonksiyonu ile kaydolur; fabrika kütüphaneyi import
+    edip parser tanımını döndürür. Kurulu olmayan (ImportError) isteğe bağlı
+    parser'lar atlanır, zorunlu parser'lar (json, orjson, ujson) kurulu
+    olmalıdır.
+
+    Parser tanımı:
+    - loads(girdi): Girdiyi parse eder
+    - dumps(veri, indent, sort_keys): Veriyi serialize eder (yoksa None)
+    - input_types: loads'un kabul ettiği girdi tipleri ('str', 'bytes')
+    - indent / sort_keys: dumps'ın bu seçenekleri destekleyip desteklemediği
+    - lazy: loads'un alanları erişildikçe çözen tembel bir belge döndürüp
+      döndürmediği (simdjson); bu parser'larda loads tüm belgeyi Python
+      nesnelerine çevirmez
+    - load_file(yol): Dosyadaki belgeyi kendi yöntemiyle okuyup parse eder
+      (isteğe bağlı). Vermeyen parser'lar dosya girdisinde dosyayı bytes
+      olarak okuyup loads'a verir. Yalnızca dosyadan okuyan parser'lar
+      (memory-mapped: orjson_mmap, msgspec_mmap; akışlı: ijson) loads
+      vermez ve yalnızca dosya girdisinde ölçülür.
+
+    Bir iş yükünü desteklemeyen parser o ölçümde atlanır.
+"""
+
+import json
+import mmap
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+from config.logging_config import setup_logger
+
+logger = setup_logger('parser_registry')
+
+# requirements.txt ile kurulan, her iş yükünü destekleyen temel parser'lar
+REQUIRED_PARSERS = ('json', 'orjson', 'ujson')
+
+_factories: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_parsers: Optional[Dict[str, Dict[str, Any]]] = None
+_lock = threading.Lock()
+
+################ Parser'ı kayıt defterine ekler ################
+def register_parser(name: str, factory: Callable[[], Dict[str, Any]]):
+    global _parsers
+    with _lock:
+        _factories[name] = factory
+        # Yeni kayıt bir sonraki erişimde yüklenir
+        _parsers = None
+
+################ Kurulu parser'ları kayıt sırasıyla döndürür ################
+def get_parsers() -> Dict[str, Dict[str, Any]]:
+    global _parsers
+    with _lock:
+        if _parsers is None:
+            _parsers = {}
+            for name, factory in _factories.items():
+                try:
+                    _parsers[name] = {'load_file': None, **factory(), 'name': name}
+                except ImportError as e:
+                    if name in REQUIRED_PARSERS:
+                        raise
+                    logger.info(f"Skipping {name} parser (not installed: {str(e)})")
+            logger.info(f"Available JSON parsers: {', '.join(_parsers)}")
+        return _parsers
+
+################ Parser tanımını döndürür ################
+def get_parser(name: str) -> Dict[str, Any]:
+    parsers = get_parsers()
+    if name not in parsers:
+        raise ValueError(f"Unknown or unavailable parser: {name}. Available: {', '.join(parsers)}")
+    return parsers[name]
+
+################ Parser iş yükünü desteklemiyorsa nedenini döndürür ################
+def unsupported_reason(parser: Dict[str, Any], workload: Dict[str, Any]) -> Optional[str]:
+    if workload['input_type'] == 'file':
+        # Kendi dosya okuyucusu olmayan parser'lara dosya bytes olarak verilir
+        if parser['load_file'] is None and 'bytes' not in parser['input_types']:
+            return "file input is not supported"
+    elif workload['input_type'] not in parser['input_types']:
+        return f"{workload['input_type']} input is not supported"
+    if workload['operation'] in ('dumps', 'roundtrip'):
+        if parser['dumps'] is None:
+            return "serialization is not supported"
+        if workload['indent'] and not parser['indent']:
+            return "indent is not supported"
+        if workload['sort_keys'] and not parser['sort_keys']:
+            return "sort_keys is not supported"
+    return None
+
+################ İş yükünü destekleyen kurulu parser'ları döndürür ################
+def parsers_for(workload: Dict[str, Any]) -> List[str]:
+    names = []
+    for name, parser in get_parsers().items():
+        reason = unsupported_reason(parser, workload)
+        if reason:
+            logger.info(f"Skipping {name} parser for this workload: {reason}")
+        else:
+            names.append(name)
+    return names
+
+################ Yerleşik parser fabrikaları ################
+def _json() -> Dict[str, Any]:
+    return {
+        'loads': json.loads,
+        'dumps': lambda data, indent, sort_keys: json.dumps(data, indent=indent, sort_keys=sort_keys),
+        'input_types': ('str', 'bytes'), 'indent': True, 'sort_keys': True, 'lazy': False
+    }
+
+def _orjson() -> Dict[str, Any]:
+    import orjson
+
+    def dumps(data, indent, sort_keys):
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, option=option)
+    return {'loads': orjson.loads, 'dumps': dumps, 'input_types': ('str', 'bytes'), 'indent': True, 'sort_keys': True, 'lazy': False}
+
+def _ujson() -> Dict[str, Any]:
+    import ujson
+    return {
+        'loads': ujson.loads,
+        'dumps': lambda data, indent, sort_keys: ujson.dumps(data, indent=indent or 0, sort_keys=sort_keys),
+        'input_types': ('str', 'bytes'), 'indent': True, 'sort_keys': True, 'lazy': False
+    }
+
+def _msgspec() -> Dict[str, Any]:
+    import msgspec
+
+    # msgspec girinti ile serialize etmez; indent isteyen iş yüklerinde atlanır
+    encoders = {False: msgspec.json.Encoder(), True: msgspec.json.Encoder(order='sorted')}
+    return {
+        'loads': msgspec.json.decode,
+        'dumps': lambda data, indent, sort_keys: encoders[sort_keys].encode(data),
+        'input_types': ('str', 'bytes'), 'indent': False, 'sort_keys': True, 'lazy': False
+    }
+
+def _rapidjson() -> Dict[str, Any]:
+    import rapidjson
+    return {
+        'loads': rapidjson.loads,
+        'dumps': lambda data, indent, sort_keys: rapidjson.dumps(data, indent=indent, sort_keys=sort_keys),
+        'input_types': ('str', 'bytes'), 'indent': True, 'sort_keys': True, 'lazy': False
+    }
+
+def _simdjson() -> Dict[str, Any]:
+    import simdjson
+
+    # pysimdjson Parser'ı thread'ler arasında paylaşılamaz; her thread kendi parser'ını kullanır.
+    # parse() tembel bir belge döndürür; alanlar erişildikçe çözülür, tüm belge Python nesnelerine çevrilmez.
+    local = threading.local()
+
+    def loads(document):
+        parser = getattr(local, 'parser', None)
+        if parser is None:
+            parser = local.parser = simdjson.Parser()
+        return parser.parse(document)
+
+    def load_file(path):
+        parser = getattr(local, 'parser', None)
+        if parser is None:
+            parser = local.parser = simdjson.Parser()
+        # simdjson dosyayı kendi okur ve gereken dolguyu kendisi ekler
+        return parser.load(path)
+    return {'loads': loads, 'dumps': None, 'load_file': load_file, 'input_types': ('bytes',), 'indent': False, 'sort_keys': False, 'lazy': True}
+
+################ Dosyayı memory-map edip parse fonksiyonuna kopyasız verir ################
+def _load_mapped(path: str, loads: Callable[[Any], Any]) -> Any:
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # memoryview mmap kapanmadan bırakılmalıdır
+        with memoryview(mapped) as view:
+            return loads(view)
+
+################ Yalnızca dosyadan okuyan parser fabrikaları ################
+def _orjson_mmap() -> Dict[str, Any]:
+    import orjson
+    return {
+        'loads': None, 'dumps': None, 'load_file': lambda path: _load_mapped(path, orjson.loads),
+        'input_types': (), 'indent': False, 'sort_keys': False, 'lazy': False
+    }
+
+def _msgspec_mmap() -> Dict[str, Any]:
+    import msgspec
+    decoder = msgspec.json.Decoder()
+    return {
+        'loads': None, 'dumps': None, 'load_file': lambda path: _load_mapped(path, decoder.decode),
+        'input_types': (), 'indent': False, 'sort_keys': False, 'lazy': False
+    }
+
+def _ijson() -> Dict[str, Any]:
+    import ijson
+
+    # Belge Python nesnelerine çevrilmeden olay olay okunur; bellek kullanımı belge boyutundan bağımsızdır
+    def load_file(path):
+        with open(path, 'rb') as f:
+            deque(ijson.basic_parse(f), maxlen=0)
+    logger.info(f"ijson backend: {ijson.backend}")
+    return {
+        'loads': None, 'dumps': None, 'load_file': load_file,
+        'input_types': (), 'indent': False, 'sort_keys': False, 'lazy': False
+    }
+
+for _name, _factory in (
+    ('json', _json),
+    ('orjson', _orjson),
+    ('ujson', _ujson),
+    ('msgspec', _msgspec),
+    ('rapidjson', _rapidjson),
+    ('simdjson', _simdjson),
+    ('orjson_mmap', _orjson_mmap),
+    ('msgspec_mmap', _msgspec_mmap),
+    ('ijson', _ijson)
+):
+    register_parser(_name, _factory)
@@ -0,0 +1,176 @@
+"""
+    Adaptive Sampling
+    =================================================================
+    Sabit sayıda (min(scale_threshold, repeat)) tekrar çalıştırıp doğrusal
+    ölçeklendirmek yerine, tekrar başına süre ve emisyonun güven aralığı
+    yeterince daralana kadar örnek alan ölçüm motorudur. Kararlı işler birkaç
+    örnekte, gürültülü işler ise daha fazla örnekle sonuçlanır; sonuç istenen
+    tekrar sayısına ekstrapole edilir.
+
+    Akış:
+    - Isınma (warmup) örnekleri çalıştırılır ve sonuca katılmaz
+    - En az min_samples örnek alınır
+    - Süre ve emisyonun %95 güven aralığı yarı genişliği / ortalama oranı
+      (göreli hata) hedefin altına inene, zaman bütçesi dolana ya da istenen
+      tekrar sayısına ulaşılana kadar örnek alınmaya devam edilir
+
+    Örnek fonksiyonu sample(tekrar_sayısı, ilk_tekrar) verilen sayıda tekrarı
+    çalıştırıp en az {'duration', 'emissions'} döndürmelidir; ilk_tekrar ölçülen
+    tekrarlar içindeki sıradır (ısınma örneklerinde 0). 'success' False ise
+    örnekleme durur.
+"""
+
+import math
+import time
+import statistics
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from config.logging_config import setup_logger
+
+logger = setup_logger('adaptive_sampling')
+
+SAMPLING_MODES = ('fixed', 'adaptive')
+
+CONFIDENCE_LEVEL = 0.95
+DEFAULT_TARGET_RELATIVE_ERROR = 0.05
+DEFAULT_TIME_BUDGET_SECONDS = 10.0
+DEFAULT_WARMUP_SAMPLES = 2
+DEFAULT_MIN_SAMPLES = 5
+
+# İki yönlü %95 güven düzeyi için Student t kritik değerleri (serbestlik derecesi: 1..30)
+T_CRITICAL_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+)
+Z_CRITICAL_95 = 1.960
+
+################ Serbestlik derecesine göre kritik değeri döndürür ################
+def t_critical(degrees_of_freedom: int) -> float:
+    if degrees_of_freedom < 1:
+        return math.inf
+    if degrees_of_freedom <= len(T_CRITICAL_95):
+        return T_CRITICAL_95[degrees_of_freedom - 1]
+    return Z_CRITICAL_95
+
+################ Değerlerin ortalamasını ve güven aralığı yarı genişliğini döndürür ################
+def confidence_interval(values: List[float]) -> Tuple[float, float]:
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, math.inf
+    return mean, t_critical(len(values) - 1) * statistics.stdev(values) / math.sqrt(len(values))
+
+################ Yarı genişliğin ortalamaya oranını döndürür ################
+def relative_error(mean: float, half_width: float) -> float:
+    if half_width == 0:
+        return 0.0
+    if mean <= 0:
+        return math.inf
+    return half_width / mean
+
+################========== AdaptiveSampler ==========################
+class AdaptiveSampler:
+    def __init__(
+        self,
+        target_relative_error: float = DEFAULT_TARGET_RELATIVE_ERROR,
+        time_budget: float = DEFAULT_TIME_BUDGET_SECONDS,
+        warmup_samples: int = DEFAULT_WARMUP_SAMPLES,
+        min_samples: int = DEFAULT_MIN_SAMPLES
+    ):
+        if not 0 < target_relative_error < 1:
+            raise ValueError(f"Invalid target relative error: {target_relative_error}. Must be between 0 and 1")
+        if time_budget <= 0:
+            raise ValueError(f"Invalid time budget: {time_budget}. Must be positive")
+        self.target_relative_error = target_relative_error
+        self.time_budget = time_budget
+        self.warmup_samples = warmup_samples
+        self.min_samples = max(2, min_samples)
+
+    ################ Örnekleri alır ve tekrar başına ortalamaları ve güven aralıklarını döndürür ################
+    def run(
+        self,
+        sample: Callable[[int, int], Dict[str, Any]],
+        max_iterations: int,
+        iterations_per_sample: int = 1
+    ) -> Dict[str, Any]:
+        started_at = time.perf_counter()
+
+        # Tüm tekrarlar zaten en az örnek sayısı kadarsa ısınma yapılmaz; hepsi ölçülür
+        warmup = self.warmup_samples if max_iterations > self.min_samples * iterations_per_sample else 0
+        for _ in range(warmup):
+            sample(iterations_per_sample, 0)
+
+        results: List[Dict[str, Any]] = []
+        durations: List[float] = []
+        emissions: List[float] = []
+        iterations = 0
+        stop_reason = 'max_iterations'
+
+        while iterations < max_iterations:
+            count = min(iterations_per_sample, max_iterations - iterations)
+            result = sample(count, iterations)
+            results.append(result)
+            iterations += count
+            durations.append(result['duration'] / count)
+            emissions.append(result['emissions'] / count)
+
+            if result.get('success') is False:
+                stop_reason = 'failed'
+                break
+            if len(results) < self.min_samples:
+                continue
+
+            error = self._relative_error(durations, emissions)
+            if error <= self.target_relative_error:
+                stop_reason = 'converged'
+                break
+            if time.perf_counter() - started_at >= self.time_budget:
+                stop_reason = 'time_budget'
+                break
+
+        duration_mean, duration_ci = confidence_interval(durations)
+        emission_mean, emission_ci = confidence_interval(emissions)
+        error = self._relative_error(durations, emissions)
+        logger.info(f"Adaptive sampling finished ({stop_reason}): {len(results)} samples, {iterations} iterations, "
+                    f"relative error {error:.4f} (target {self.target_relative_error})")
+
+        return {
+            'results': results,
+            'samples': len(results),
+            'iterations': iterations,
+            'warmup': warmup,
+            'duration_per_iteration': duration_mean,
+            'duration_ci': duration_ci,
+            'emissions_per_iteration': emission_mean,
+            'emissions_ci': emission_ci,
+            'relative_error': error,
+            'stop_reason': stop_reason
+        }
+
+    ################ Süre ve emisyonun göreli hatalarından büyük olanı döndürür ################
+    @staticmethod
+    def _relative_error(durations: List[float], emissions: List[float]) -> float:
+        return max(relative_error(*confidence_interval(durations)), relative_error(*confidence_interval(emissions)))
+
+################ Sonlu olmayan değerleri (tek örnekte güven aralığı yoktur) None olarak döndürür ################
+def finite_or_none(value: float) -> Optional[float]:
+    return value if value is not None and math.isfinite(value) else None
+
+################ Ortalama ve yarı genişlikten [alt, üst] aralığını döndürür ################
+def interval(mean: float, half_width: Optional[float]) -> Optional[List[float]]:
+    if finite_or_none(half_width) is None:
+        return None
+    return [mean - half_width, mean + half_width]
+
+################ Örnekleme sonucunu frontend'e gönderilecek güven aralığı özetine çevirir ################
+def summarize_confidence_interval(sampling: Dict[str, Any], target_relative_error: float) -> Dict[str, Any]:
+    return {
+        'level': CONFIDENCE_LEVEL,
+        'samples': sampling['samples'],
+        'iterations': sampling['iterations'],
+        'warmup': sampling['warmup'],
+        'avg_execution_time': interval(sampling['duration_per_iteration'], sampling['duration_ci']),
+        'avg_emissions': interval(sampling['emissions_per_iteration'], sampling['emissions_ci']),
+        'relative_error': finite_or_none(sampling['relative_error']),
+        'target_relative_error': target_relative_error,
+        'stop_reason': sampling['stop_reason']
+    }
@@ -0,0 +1,38 @@
+"""
+    CPU Accounting
+    =================================================================
+    Ölçüm aralıklarında harcanan CPU süresini okuyan ve aralığın enerjisini
+    CPU süresi payına göre tek bir işe atayan yardımcılardır. Makine veya
+    süreç genelinde ölçen backend'ler (codecarbon, rapl, procfs) aynı anda
+    çalışan diğer işlerin enerjisini de ölçer; bir işin payı, kendi alt
+    süreçlerinin CPU süresinin aralıkta ölçülen kapsamın toplam CPU
+    süresine oranıdır.
+
+    Kapsamlar:
+    - machine: Tüm makinenin meşgul CPU süresi (boşta ve I/O beklemesi hariç)
+    - process: Bu sürecin ve beklenmiş alt süreçlerinin CPU süresi
+"""
+
+import os
+import psutil
+from typing import Dict, Any, Optional
+
+################ Verilen kapsamın o ana kadarki toplam CPU süresini saniye olarak döndürür ################
+def read_cpu_seconds(scope: str) -> float:
+    if scope == 'process':
+        times = os.times()
+        return times.user + times.system + times.children_user + times.children_system
+
+    times = psutil.cpu_times()
+    # guest süreleri user/nice içinde zaten sayılır; steal sanal makineye verilmeyen süredir
+    idle = sum(getattr(times, field, 0) for field in ('idle', 'iowait', 'steal', 'guest', 'guest_nice'))
+    return sum(times) - idle
+
+################ Aralığın emisyonunu verilen CPU süresinin payı kadar atar ################
+def attribute_emissions(measurement: Dict[str, Any], cpu_seconds: Optional[float]) -> float:
+    emissions = measurement['emissions']
+    scope_cpu_seconds = measurement.get('cpu_seconds')
+    # CPU süresi bilinmiyorsa aralığın tamamı işe atanır (önceki davranış)
+    if cpu_seconds is None or not scope_cpu_seconds:
+        return emissions
+    return emissions * min(1.0, cpu_seconds / scope_cpu_seconds)
@@ -0,0 +1,170 @@
+"""
+    EmissionsService
+    =================================================================
+    Codeculate ve jsonculate ölçümlerinin ortak kullandığı, uygulama
+    başlarken bir kez başlatılan ve sürekli açık kalan codecarbon ölçüm
+    servisidir. Her ölçüm için yeni bir EmissionsTracker oluşturup
+    başlatmak (donanım tespiti, zamanlayıcı thread'i, CSV çıktısı) ölçülen
+    işten daha pahalı olabildiği için ölçümler açık tracker üzerinde
+    zaman aralıkları (span) olarak alınır.
+
+    Özellikler:
+    - Tracking modu (machine/process) başına tek bir sıcak tracker
+    - begin_span/end_span: Aralıktaki enerji (kWh), emisyon (kg) ve ölçülen
+      kapsamın CPU süresi farkı (bkz. cpu_accounting.py)
+    - Eş zamanlı ve iç içe geçen aralıklar (her aralık kendi başlangıç
+      okumasını tutar; çakışan aralıklar aynı enerjiyi paylaşır)
+    - Okumalar yalnızca codecarbon'un public API'si ile yapılır (flush ve
+      toplamları alan bir çıktı yöntemi); eş zamanlı okumalar kendi
+      aralarında sıralanır
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, Tuple
+from codecarbon import EmissionsTracker
+from codecarbon.output import BaseOutput, EmissionsData
+from config.logging_config import setup_logger
+from .cpu_accounting import read_cpu_seconds
+
+logger = setup_logger('emissions_service')
+
+TRACKING_MODES = ('machine', 'process')
+DEFAULT_MEASURE_POWER_SECS = 15
+
+################========== TotalsOutput ==========################
+class TotalsOutput(BaseOutput):
+    # codecarbon'un flush/stop sırasında çıktı yöntemlerine verdiği toplam değerleri tutar;
+    # tracker'ın iç metotlarına dokunmadan güncel enerji ve emisyon okunur
+    def __init__(self):
+        self.total: Optional[EmissionsData] = None
+
+    def out(self, total: EmissionsData, delta: EmissionsData):
+        self.total = total
+
+    def live_out(self, total: EmissionsData, delta: EmissionsData):
+        pass
+
+################========== SharedEmissionsTracker ==========################
+class SharedEmissionsTracker:
+    # Açık bir EmissionsTracker'ı public API'si (flush) ile okur; okumalar kendi aralarında sıralanır
+    def __init__(self, **kwargs):
+        self._reading_lock = threading.Lock()
+        self._totals = TotalsOutput()
+        self._last_totals: Tuple[float, float] = (0.0, 0.0)
+        self.tracker = EmissionsTracker(output_handlers=[self._totals], **kwargs)
+
+    def start(self):
+        self.tracker.start()
+
+    def stop(self):
+        self.tracker.stop()
+
+    ################ Güncel ölçüm alıp toplam enerji ve emisyonu döndürür ################
+    def read_totals(self) -> Tuple[float, float]:
+        with self._reading_lock:
+            self._totals.total = None
+            # flush son ölçümden bu yana geçen enerjiyi ölçer ve toplamları çıktı yöntemlerine verir
+            self.tracker.flush()
+            data = self._totals.total
+            if data is None:
+                # codecarbon flush hatalarını yutar; bu durumda son bilinen toplam kullanılır
+                logger.warning("codecarbon flush did not report totals, reusing the last reading")
+            else:
+                self._last_totals = (data.energy_consumed, data.emissions)
+            return self._last_totals
+
+################========== EmissionsSpan ==========################
+class EmissionsSpan:
+    def __init__(self, name: str, started_at: float, energy_kwh: float, emissions: float, cpu_seconds: float):
+        self.name = name
+        self.started_at = started_at
+        self.start_energy_kwh = energy_kwh
+        self.start_emissions = emissions
+        self.start_cpu_seconds = cpu_seconds
+
+################========== EmissionsService ==========################
+class EmissionsService:
+    def __init__(self, tracking_mode: str = 'machine', measure_power_secs: float = DEFAULT_MEASURE_POWER_SECS):
+        if tracking_mode not in TRACKING_MODES:
+            raise ValueError(f"Unsupported tracking mode: {tracking_mode}")
+        self.tracking_mode = tracking_mode
+        self.measure_power_secs = measure_power_secs
+        self._tracker: Optional[SharedEmissionsTracker] = None
+        self._lock = threading.Lock()
+
+    ################ Tracker'ı başlatır (zaten açıksa bir şey yapmaz) ################
+    def start(self):
+        with self._lock:
+            if self._tracker is not None:
+                return
+            tracker = SharedEmissionsTracker(
+                project_name=f"greenculate_{self.tracking_mode}",
+                tracking_mode=self.tracking_mode,
+                measure_power_secs=self.measure_power_secs,
+                save_to_file=False,
+                allow_multiple_runs=True,
+                log_level='error'
+            )
+            tracker.start()
+            self._tracker = tracker
+        logger.info(f"Emissions service started (tracking mode: {self.tracking_mode})")
+
+    ################ Tracker'ı durdurur ################
+    def stop(self):
+        with self._lock:
+            tracker, self._tracker = self._tracker, None
+        if tracker is not None:
+            tracker.stop()
+            logger.info(f"Emissions service stopped (tracking mode: {self.tracking_mode})")
+
+    ################ Yeni bir ölçüm aralığı başlatır ################
+    def begin_span(self, name: str = '') -> EmissionsSpan:
+        if self._tracker is None:
+            self.start()
+        energy_kwh, emissions = self._tracker.read_totals()
+        return EmissionsSpan(name, time.perf_counter(), energy_kwh, emissions, read_cpu_seconds(self.tracking_mode))
+
+    ################ Ölçüm aralığını bitirir ve aralıktaki farkları döndürür ################
+    def end_span(self, span: EmissionsSpan) -> Dict[str, Any]:
+        energy_kwh, emissions = self._tracker.read_totals()
+        duration = time.perf_counter() - span.started_at
+        result = {
+            'duration': duration,
+            'energy_kwh': max(0.0, energy_kwh - span.start_energy_kwh),
+            'emissions': max(0.0, emissions - span.start_emissions),
+            'cpu_seconds': max(0.0, read_cpu_seconds(self.tracking_mode) - span.start_cpu_seconds)
+        }
+        logger.debug(f"Span '{span.name}' finished: {duration:.3f}s, {result['energy_kwh']:.9f} kWh, {result['emissions']:.9f} kg CO2")
+        return result
+
+    ################ with bloğu boyunca ölçüm yapar; sonuç sözlüğü blok bitince doldurulur ################
+    @contextmanager
+    def span(self, name: str = '') -> Iterator[Dict[str, Any]]:
+        result: Dict[str, Any] = {}
+        handle = self.begin_span(name)
+        try:
+            yield result
+        finally:
+            result.update(self.end_span(handle))
+
+################ Süreç içindeki servisler (tracking modu başına bir tane) ################
+_services: Dict[str, EmissionsService] = {}
+_services_lock = threading.Lock()
+
+################ Verilen tracking modu için ortak servisi döndürür ################
+def get_emissions_service(tracking_mode: str = 'machine') -> EmissionsService:
+    with _services_lock:
+        service = _services.get(tracking_mode)
+        if service is None:
+            service = EmissionsService(tracking_mode)
+            _services[tracking_mode] = service
+    return service
+
+################ Tüm servisleri durdurur ################
+def stop_all_services():
+    with _services_lock:
+        services = list(_services.values())
+    for service in services:
+        service.stop()
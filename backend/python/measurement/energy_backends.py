@@ -0,0 +1,207 @@
+"""
+    Energy Backends
+    =================================================================
+    Ölçümlerde kullanılabilecek enerji kaynaklarıdır. codecarbon örnekleme
+    aralığı saniyenin altındaki çalıştırmalar için fazla kaba kaldığından,
+    Linux'ta sayaçları doğrudan okuyan düşük maliyetli backend'ler sunulur.
+    Tüm backend'ler aynı arayüzü sağlar: begin_span/end_span ve span();
+    sonuç {'duration', 'energy_kwh', 'emissions', 'cpu_seconds'} sözlüğüdür.
+    cpu_seconds, backend'in ölçtüğü kapsamın (machine/process) aralıktaki
+    CPU süresidir.
+
+    Backend'ler:
+    - codecarbon: Ortak EmissionsService (bkz. emissions_service.py)
+    - rapl: /sys/class/powercap altındaki RAPL enerji sayaçları (paket bazında)
+    - procfs: /proc/self/stat CPU süresi (süreç + beklenmiş alt süreçler) x çekirdek başına TDP
+
+    Not: rapl ve procfs backend'lerinde emisyon, enerji ile sabit bir karbon
+    yoğunluğu (varsayılan: codecarbon'un dünya ortalaması, 475 g/kWh) çarpılarak hesaplanır.
+"""
+
+import os
+import glob
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Tuple
+from config.logging_config import setup_logger
+from .emissions_service import EmissionsService
+from .cpu_accounting import read_cpu_seconds
+
+logger = setup_logger('energy_backends')
+
+ENERGY_BACKENDS = ('codecarbon', 'rapl', 'procfs')
+DEFAULT_ENERGY_BACKEND = 'codecarbon'
+
+DEFAULT_CARBON_INTENSITY_G_PER_KWH = 475
+DEFAULT_CPU_TDP_WATTS = 85
+JOULES_PER_KWH = 3.6e6
+
+POWERCAP_PATH = '/sys/class/powercap'
+PROC_STAT_PATH = '/proc/self/stat'
+
+################========== EnergySpan ==========################
+class EnergySpan:
+    def __init__(self, name: str, started_at: float, start_reading: Any, start_cpu_seconds: float):
+        self.name = name
+        self.started_at = started_at
+        self.start_reading = start_reading
+        self.start_cpu_seconds = start_cpu_seconds
+
+################========== CounterEnergyBackend ==========################
+class CounterEnergyBackend:
+    name = ''
+    # Sayaçların ölçtüğü kapsam (bkz. cpu_accounting.py)
+    scope = 'machine'
+
+    def __init__(self, carbon_intensity_g_per_kwh: float = DEFAULT_CARBON_INTENSITY_G_PER_KWH):
+        self.carbon_intensity_g_per_kwh = carbon_intensity_g_per_kwh
+
+    ################ Backend'in bu makinede kullanılabilir olup olmadığını döndürür ################
+    @classmethod
+    def is_available(cls) -> bool:
+        raise NotImplementedError
+
+    ################ Sayaçların güncel değerini okur ################
+    def _read(self) -> Any:
+        raise NotImplementedError
+
+    ################ İki okuma arasındaki enerjiyi kWh olarak döndürür ################
+    def _energy_between(self, start: Any, end: Any) -> float:
+        raise NotImplementedError
+
+    ################ Yeni bir ölçüm aralığı başlatır ################
+    def begin_span(self, name: str = '') -> EnergySpan:
+        return EnergySpan(name, time.perf_counter(), self._read(), read_cpu_seconds(self.scope))
+
+    ################ Ölçüm aralığını bitirir ve aralıktaki farkları döndürür ################
+    def end_span(self, span: EnergySpan) -> Dict[str, Any]:
+        end_reading = self._read()
+        cpu_seconds = read_cpu_seconds(self.scope) - span.start_cpu_seconds
+        duration = time.perf_counter() - span.started_at
+        energy_kwh = max(0.0, self._energy_between(span.start_reading, end_reading))
+        return {
+            'duration': duration,
+            'energy_kwh': energy_kwh,
+            'emissions': energy_kwh * self.carbon_intensity_g_per_kwh / 1000,  # kg CO2
+            'cpu_seconds': max(0.0, cpu_seconds)
+        }
+
+    ################ with bloğu boyunca ölçüm yapar; sonuç sözlüğü blok bitince doldurulur ################
+    @contextmanager
+    def span(self, name: str = '') -> Iterator[Dict[str, Any]]:
+        result: Dict[str, Any] = {}
+        handle = self.begin_span(name)
+        try:
+            yield result
+        finally:
+            result.update(self.end_span(handle))
+
+################========== RaplEnergyBackend ==========################
+class RaplEnergyBackend(CounterEnergyBackend):
+    name = 'rapl'
+
+    def __init__(self, carbon_intensity_g_per_kwh: float = DEFAULT_CARBON_INTENSITY_G_PER_KWH):
+        super().__init__(carbon_intensity_g_per_kwh)
+        self.domains = self._find_domains()
+        self.max_ranges = [self._read_int(os.path.join(d, 'max_energy_range_uj')) for d in self.domains]
+        logger.info(f"RAPL backend using domains: {', '.join(os.path.basename(d) for d in self.domains)}")
+
+    ################ Paket seviyesindeki RAPL alanlarını bulur (alt alanlar paketin içinde sayılır) ################
+    @staticmethod
+    def _find_domains() -> List[str]:
+        domains = []
+        for path in sorted(glob.glob(os.path.join(POWERCAP_PATH, '*-rapl:*'))):
+            if os.path.basename(path).count(':') == 1 and os.access(os.path.join(path, 'energy_uj'), os.R_OK):
+                domains.append(path)
+        return domains
+
+    @staticmethod
+    def _read_int(path: str) -> int:
+        with open(path, 'r') as f:
+            return int(f.read().strip())
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            domains = cls._find_domains()
+            for domain in domains:
+                cls._read_int(os.path.join(domain, 'energy_uj'))
+            return bool(domains)
+        except (OSError, ValueError):
+            return False
+
+    def _read(self) -> List[int]:
+        return [self._read_int(os.path.join(d, 'energy_uj')) for d in self.domains]
+
+    def _energy_between(self, start: List[int], end: List[int]) -> float:
+        total_uj = 0
+        for begin, finish, max_range in zip(start, end, self.max_ranges):
+            # Sayaç taştıysa başa döner
+            total_uj += finish - begin if finish >= begin else finish + max_range - begin
+        return total_uj / 1e6 / JOULES_PER_KWH
+
+################========== ProcfsEnergyBackend ==========################
+class ProcfsEnergyBackend(CounterEnergyBackend):
+    name = 'procfs'
+    scope = 'process'
+
+    def __init__(
+        self,
+        carbon_intensity_g_per_kwh: float = DEFAULT_CARBON_INTENSITY_G_PER_KWH,
+        tdp_watts: float = DEFAULT_CPU_TDP_WATTS
+    ):
+        super().__init__(carbon_intensity_g_per_kwh)
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        # Bir çekirdeğin tam yükte çektiği güç, paketin TDP'sinin çekirdek sayısına bölümüyle tahmin edilir
+        self.watts_per_cpu = tdp_watts / (os.cpu_count() or 1)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return os.path.exists(PROC_STAT_PATH) and hasattr(os, 'sysconf')
+
+    ################ Bu sürecin ve beklenmiş alt süreçlerinin toplam CPU süresini saniye olarak okur ################
+    def _read(self) -> float:
+        with open(PROC_STAT_PATH, 'r') as f:
+            stat = f.read()
+        # Süreç adı boşluk içerebilir; alanlar son ')' karakterinden sonra başlar
+        fields = stat[stat.rindex(')') + 2:].split()
+        utime, stime, cutime, cstime = (int(v) for v in fields[11:15])
+        return (utime + stime + cutime + cstime) / self.clock_ticks
+
+    def _energy_between(self, start: float, end: float) -> float:
+        return (end - start) * self.watts_per_cpu / JOULES_PER_KWH
+
+BACKEND_CLASSES = {
+    'rapl': RaplEnergyBackend,
+    'procfs': ProcfsEnergyBackend
+}
+
+_backends: Dict[str, CounterEnergyBackend] = {}
+_backends_lock = threading.Lock()
+
+################ Sayaç tabanlı backend'i döndürür (süreç başına bir örnek) ################
+def get_counter_backend(name: str) -> CounterEnergyBackend:
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = BACKEND_CLASSES[name]()
+            _backends[name] = backend
+    return backend
+
+################ Bu makinede kullanılabilen backend'leri döndürür ################
+def available_energy_backends() -> List[str]:
+    return ['codecarbon'] + [name for name, cls in BACKEND_CLASSES.items() if cls.is_available()]
+
+################ İstenen backend'i çözer; kullanılamıyorsa codecarbon'a döner ################
+def resolve_energy_backend(name: str, codecarbon_service: EmissionsService) -> Tuple[str, Any]:
+    if name not in ENERGY_BACKENDS:
+        raise ValueError(f"Unsupported energy backend: {name}. Supported: {', '.join(ENERGY_BACKENDS)}")
+
+    if name != 'codecarbon':
+        # Daha önce oluşturulmuş bir örnek varsa backend kullanılabilir demektir
+        if name in _backends or BACKEND_CLASSES[name].is_available():
+            return name, get_counter_backend(name)
+        logger.warning(f"Energy backend {name} is not available on this machine, falling back to codecarbon")
+
+    return 'codecarbon', codecarbon_service
@@ -9,20 +9,46 @@ import { useState, useEffect } from "react";
 import AnimatedItem from "../../AnimatedItem";
 import "./CodeculateHistory.scss";
 
+// Geçmiş listesinde gösterilen kolonlar (backend büyük kolonları varsayılan olarak döndürmez)
+const HISTORY_FIELDS = [
+  "id",
+  "execution_time",
+  "programming_language",
+  "execution_count",
+  "total_carbon_emission",
+  "carbon_per_execution",
+  "execution_duration_seconds",
+  "cpu_model",
+  "cpu_count",
+  "total_ram_gb",
+  "os_name",
+  "is_scaled",
+  "scale_threshold",
+  "code_text",
+].join(",");
+const PAGE_SIZE = 50;
+
 function CodeExecutionHistory() {
   const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchHistory();
   }, []);
 
-  // Backend'den geçmiş kayıtları çeker
-  const fetchHistory = async () => {
+  // Backend'den geçmiş kayıtları sayfa sayfa çeker
+  const fetchHistory = async (cursor = null) => {
     try {
+      const params = new URLSearchParams({ fields: HISTORY_FIELDS, limit: PAGE_SIZE });
+      if (cursor) {
+        params.set("cursor", cursor);
+      }
+
       // Backend'e istek gönder
-      const response = await fetch("http://localhost:5000/codeculate/history");
+      const response = await fetch(`http://localhost:5000/codeculate/history?${params}`);
       
       // HTTP hata kontrolü
       if (!response.ok) {
@@ -31,15 +57,23 @@ function CodeExecutionHistory() {
       
       // Başarılı yanıtı al ve state'e kaydet
       const data = await response.json();
-      setHistory(data);
+      setHistory((previous) => (cursor ? [...previous, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
       setError(null);
     } catch (error) {
       setError(error.message || "Geçmiş yüklenirken bir hata oluştu");
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
+  // Sonraki sayfayı yükler
+  const loadMore = () => {
+    setLoadingMore(true);
+    fetchHistory(nextCursor);
+  };
+
   if (loading) {
     return <div className="loading"></div>;
   }
@@ -140,6 +174,12 @@ function CodeExecutionHistory() {
           </div>
         </div>
       ))}
+      {/* Sonraki sayfa */}
+      {nextCursor && (
+        <button className="load-more" onClick={loadMore} disabled={loadingMore}>
+          {loadingMore ? "Yükleniyor..." : "Daha fazla yükle"}
+        </button>
+      )}
     </AnimatedItem>
   );
 }
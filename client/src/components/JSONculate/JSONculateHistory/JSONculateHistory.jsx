@@ -9,20 +9,49 @@ import { useState, useEffect } from "react";
 import AnimatedItem from "../../AnimatedItem";
 import "./JSONculateHistory.scss";
 
+// Geçmiş listesinde gösterilen kolonlar (backend büyük kolonları varsayılan olarak döndürmez)
+const HISTORY_FIELDS = [
+  "id",
+  "timestamp",
+  "repeat",
+  "json_size",
+  "json_emissions",
+  "json_duration",
+  "orjson_emissions",
+  "orjson_duration",
+  "ujson_emissions",
+  "ujson_duration",
+  "is_scaled",
+  "scale_threshold",
+  "cpu_model",
+  "cpu_count",
+  "total_memory",
+  "os_info",
+  "json_input",
+].join(",");
+const PAGE_SIZE = 50;
+
 function JSONParsingHistory() {
   const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchHistory();
   }, []);
 
-  // Backend'den geçmiş kayıtları çeker
-  const fetchHistory = async () => {
+  // Backend'den geçmiş kayıtları sayfa sayfa çeker
+  const fetchHistory = async (cursor = null) => {
     try {
+      const params = new URLSearchParams({ fields: HISTORY_FIELDS, limit: PAGE_SIZE });
+      if (cursor) {
+        params.set("cursor", cursor);
+      }
+
       // Python backend'e istek gönder
-      const response = await fetch("http://localhost:5000/jsonculate/history");
+      const response = await fetch(`http://localhost:5000/jsonculate/history?${params}`);
 
       // HTTP hata kontrolü
       if (!response.ok) {
@@ -31,15 +60,23 @@ function JSONParsingHistory() {
 
       // Başarılı yanıtı al ve state'e kaydet
       const data = await response.json();
-      setHistory(data);
+      setHistory((previous) => (cursor ? [...previous, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
       setError(null);
     } catch (err) {
       setError(err.message || "Geçmiş yüklenirken bir hata oluştu");
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
+  // Sonraki sayfayı yükler
+  const loadMore = () => {
+    setLoadingMore(true);
+    fetchHistory(nextCursor);
+  };
+
   if (loading) {
     return <div className="loading"></div>;
   }
@@ -169,6 +206,12 @@ function JSONParsingHistory() {
           </div>
         </div>
       ))}
+      {/* Sonraki sayfa */}
+      {nextCursor && (
+        <button className="load-more" onClick={loadMore} disabled={loadingMore}>
+          {loadingMore ? "Yükleniyor..." : "Daha fazla yükle"}
+        </button>
+      )}
     </AnimatedItem>
   );
 }